@@ -9,6 +9,7 @@ class TradingSettingsAdmin(admin.ModelAdmin):
     list_display = (
         "user",
         "symbol",
+        "timeframe",
         "investment_percentage",
         "leverage",
         "take_profit",
@@ -16,7 +17,7 @@ class TradingSettingsAdmin(admin.ModelAdmin):
         "created",
     )
     search_fields = ("user__username", "symbol")
-    list_filter = ("symbol", "leverage")
+    list_filter = ("symbol", "timeframe", "leverage")
     readonly_fields = ("created", "modified")
     fieldsets = (
         ("Usuario", {"fields": ("user",)}),
@@ -39,6 +40,7 @@ class TradingSettingsAdmin(admin.ModelAdmin):
             {
                 "fields": (
                     "symbol",
+                    "timeframe",
                     "investment_percentage",
                     "leverage",
                     "take_profit",
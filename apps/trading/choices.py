@@ -35,3 +35,12 @@ class BotAction(models.TextChoices):
     START = "start", "Start"
     STOP = "stop", "Stop"
     RESTART = "restart", "Restart"
+
+
+class Timeframe(models.TextChoices):
+    ONE_MINUTE = "1m", "1 minute"
+    FIVE_MINUTES = "5m", "5 minutes"
+    FIFTEEN_MINUTES = "15m", "15 minutes"
+    ONE_HOUR = "1h", "1 hour"
+    FOUR_HOURS = "4h", "4 hours"
+    ONE_DAY = "1d", "1 day"
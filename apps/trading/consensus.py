@@ -0,0 +1,185 @@
+import time
+import uuid
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.trading import choices, constants, models
+
+# Señal de la racha: id, estrategia y timestamp (epoch en segundos)
+Entry = namedtuple("Entry", ["id", "strategy", "timestamp"])
+
+# Consenso detectado: dirección e ids de las señales que lo forman
+Event = namedtuple("Event", ["direction", "signal_ids"])
+
+SIDES = (choices.OrderSide.BUY, choices.OrderSide.SELL)
+
+# Contadores de evaluaciones por ticker: realizadas y descartadas por haber
+# ya una pendiente
+COUNTERS = ("evaluated", "skipped")
+
+
+def pending_key(ticker):
+    """Marca de evaluación programada del ticker"""
+    return f"consensus-pending:{ticker}"
+
+
+def count(name, ticker):
+    """Incrementa el contador `name` del ticker"""
+    key = f"consensus-{name}:{ticker}"
+    cache.add(key, 0, timeout=None)
+    return cache.incr(key)
+
+
+def counters(ticker):
+    """Valor de los contadores de evaluaciones del ticker"""
+    keys = {f"consensus-{name}:{ticker}": name for name in COUNTERS}
+    values = cache.get_many(keys)
+    return {name: values.get(key, 0) for key, name in keys.items()}
+
+
+class ConsensusEngine:
+    """
+    Detector incremental de consenso de un ticker: `count` señales
+    consecutivas de la misma dirección dentro de `window`, de al menos
+    `distinct` estrategias diferentes. Las señales hold no cortan la racha.
+
+    El estado es la racha actual: su dirección y sus `count` señales más
+    recientes, que cada señal nueva actualiza en O(1). Se guarda en el
+    cache (Redis) para que lo compartan todos los workers. Si no existe
+    (arranque en frío o expirado) se reconstruye desde las señales
+    procesadas de la ventana en la base de datos: las señales se marcan como
+    procesadas con el estado bloqueado (ver `locked`), así que toda señal
+    procesada ya está aplicada. Tras un consenso la racha vuelve a empezar,
+    así que sus señales no se emiten de nuevo.
+    """
+
+    def __init__(
+        self,
+        ticker,
+        window=timedelta(minutes=constants.CONSENSUS_WINDOW_MINUTES),
+        count=constants.CONSENSUS_COUNT,
+        distinct=constants.CONSENSUS_DISTINCT,
+    ):
+        self.ticker = ticker
+        self.window = window
+        self.count = count
+        self.distinct = distinct
+        self.side = None
+        self.entries = deque(maxlen=count)
+
+    @property
+    def key(self):
+        return f"consensus:{self.ticker}"
+
+    @contextmanager
+    def locked(self):
+        """
+        Bloquea el estado del ticker, lo carga (o reconstruye) y lo guarda al
+        salir. Las señales nuevas deben marcarse como procesadas dentro del
+        bloque, para que ninguna reconstrucción las vea sin aplicar.
+        """
+        with self._lock():
+            if not self.load():
+                self.rebuild()
+            yield self
+            self.save()
+
+    def apply(self, signals):
+        """Aplica señales en orden de creación; devuelve los consensos"""
+        return [
+            event for event in map(self.update, signals) if event is not None
+        ]
+
+    def process(self, signals):
+        """Aplica señales nuevas, aún sin procesar, con el estado bloqueado"""
+        with self.locked():
+            return self.apply(signals)
+
+    def update(self, signal):
+        """Añade una señal a la racha; devuelve el consenso si lo completa"""
+        if signal.signal_type not in SIDES:
+            return None
+        if signal.signal_type != self.side:
+            self.side = signal.signal_type
+            self.entries.clear()
+        self.entries.append(
+            Entry(signal.id, signal.strategy, signal.timestamp.timestamp())
+        )
+
+        if len(self.entries) < self.count:
+            return None
+        oldest, newest = self.entries[0], self.entries[-1]
+        if oldest.timestamp < newest.timestamp - self.window.total_seconds():
+            return None
+        if len({entry.strategy for entry in self.entries}) < self.distinct:
+            return None
+
+        event = Event(self.side, [entry.id for entry in self.entries])
+        self.entries.clear()
+        return event
+
+    def rebuild(self):
+        """Reconstruye la racha con las señales procesadas de la ventana"""
+        self.side = None
+        self.entries.clear()
+        signals = (
+            models.Signal.objects.filter(
+                ticker=self.ticker,
+                processed=True,
+                timestamp__gte=timezone.now() - self.window,
+            )
+            .order_by("created", "id")
+            .only("id", "signal_type", "strategy", "timestamp")
+        )
+        # Los consensos de estas señales ya se emitieron
+        for signal in signals.iterator():
+            self.update(signal)
+
+    def refresh(self):
+        """Descarta el estado guardado y lo reconstruye"""
+        with self._lock():
+            self.rebuild()
+            self.save()
+
+    def load(self):
+        state = cache.get(self.key)
+        if state is None:
+            return False
+        self.side, entries = state
+        self.entries = deque(map(Entry._make, entries), maxlen=self.count)
+        return True
+
+    def save(self):
+        # Sin señales durante la ventana la racha ya no cuenta
+        cache.set(
+            self.key,
+            (self.side, [tuple(entry) for entry in self.entries]),
+            timeout=self.window.total_seconds(),
+        )
+
+    def reset(self):
+        cache.delete(self.key)
+
+    @contextmanager
+    def _lock(self):
+        """
+        Bloqueo del estado entre workers. Guarda un token propio para que,
+        si expira y lo toma otro worker, al salir no se libere el ajeno.
+        """
+        key = f"{self.key}:lock"
+        token = uuid.uuid4().hex
+        timeout = constants.CONSENSUS_LOCK_TIMEOUT
+        deadline = time.monotonic() + timeout
+        while not cache.add(key, token, timeout=timeout):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Consensus of {self.ticker} is locked")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if cache.get(key) == token:
+                cache.delete(key)
@@ -1 +1,53 @@
 BTCUSDT = "BTCUSDT"
+
+# Activos de cotización para convertir "BTCUSDT" al formato ccxt "BTC/USDT"
+QUOTE_ASSETS = ("USDT", "USDC", "FDUSD", "BUSD", "BTC", "ETH", "BNB")
+
+# Tiempo máximo (segundos) que un mercado queda bloqueado mientras se
+# ejecutan sus estrategias
+STRATEGY_LOCK_TIMEOUT = 10 * 60
+
+# Tiempo (segundos) que se conservan en cache los resultados del optimizador
+OPTIMIZER_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+# Tiempo (segundos) tras el que se recargan los mercados del exchange
+EXCHANGE_MARKETS_TTL = 60 * 60
+
+# Peso de peticiones permitido por el exchange en cada periodo (segundos)
+EXCHANGE_WEIGHT_LIMIT = 1200
+EXCHANGE_WEIGHT_PERIOD = 60
+
+# Tiempo máximo (segundos) de cada descarga de velas y reintentos por
+# errores de red
+FETCH_TIMEOUT = 10
+FETCH_RETRIES = 3
+
+# Stream combinado de velas del exchange y espera máxima (segundos) entre
+# reconexiones
+KLINE_STREAM_URL = "wss://stream.binance.us:9443/stream"
+KLINE_STREAM_MAX_BACKOFF = 60
+
+# Velas máximas por petición de velas al exchange
+FETCH_MAX_CANDLES = 1000
+
+# Velas base máximas para derivar un timeframe superior (p. ej. 100 velas
+# de 1h son 6000 velas de 1m); por encima se descarga el timeframe directo
+RESAMPLE_MAX_BASE_CANDLES = 10_000
+
+# Regla de consenso: señales consecutivas de la misma dirección, de
+# estrategias diferentes, dentro de la ventana (minutos)
+CONSENSUS_WINDOW_MINUTES = 60
+CONSENSUS_COUNT = 5
+CONSENSUS_DISTINCT = 5
+
+# Tiempo máximo (segundos) que el estado de consenso de un ticker queda
+# bloqueado mientras se actualiza
+CONSENSUS_LOCK_TIMEOUT = 10
+
+# Espera (segundos) antes de evaluar el consenso de un ticker tras una
+# señal del webhook: las de la misma ráfaga se evalúan juntas
+CONSENSUS_DEBOUNCE_SECONDS = 2
+
+# Tiempo máximo (segundos) que una evaluación programada impide programar
+# otra, por si la tarea se pierde
+CONSENSUS_PENDING_TIMEOUT = 60
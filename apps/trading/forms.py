@@ -24,6 +24,7 @@ class TradingSettingsForm(forms.ModelForm):
             "take_profit",
             "stop_loss",
             "symbol",
+            "timeframe",
         ]
         widgets = {
             "investment_percentage": forms.NumberInput(
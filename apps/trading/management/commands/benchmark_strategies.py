@@ -0,0 +1,130 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.trading.strategies import _benchmark, _registry, _synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks generate_signal() of every strategy on synthetic candles "
+        "and flags regressions against a JSON baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--strategies",
+            nargs="+",
+            choices=list(_registry.STRATEGIES),
+            help="Strategies to benchmark (default: all registered)",
+        )
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=list(_benchmark.SIZES),
+            help="Number of candles of each synthetic frame",
+        )
+        parser.add_argument(
+            "--regimes",
+            nargs="+",
+            choices=_synthetic.REGIMES,
+            default=list(_synthetic.REGIMES),
+            help="Market regimes of the synthetic frames",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=settings.BASE_DIR / "benchmarks" / "strategies.json",
+            help="JSON baseline file",
+        )
+        parser.add_argument(
+            "--save",
+            action="store_true",
+            help="Write the results as the new baseline instead of comparing",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed relative slowdown before flagging a regression",
+        )
+
+    def handle(self, *args, **options):
+        results = []
+        for result in _benchmark.run(
+            strategies=options["strategies"],
+            sizes=options["sizes"],
+            regimes=options["regimes"],
+            repeat=options["repeat"],
+            seed=options["seed"],
+        ):
+            results.append(result)
+            self.report(result)
+
+        baseline_path = options["baseline"]
+        if options["save"]:
+            _benchmark.save_baseline(
+                baseline_path,
+                results,
+                repeat=options["repeat"],
+                seed=options["seed"],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Baseline saved to {baseline_path}")
+            )
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(
+                self.style.WARNING(
+                    f"No baseline found at {baseline_path}, run with --save"
+                )
+            )
+            return
+
+        regressions = _benchmark.compare(
+            results,
+            _benchmark.load_baseline(baseline_path),
+            tolerance=options["tolerance"],
+        )
+        for regression in regressions:
+            change = (
+                ""
+                if regression.change is None
+                else f" ({regression.change:+.0%})"
+            )
+            self.stdout.write(
+                self.style.ERROR(
+                    f"{regression.key} {regression.metric}: "
+                    f"{self.format(regression.metric, regression.baseline)} -> "
+                    f"{self.format(regression.metric, regression.current)}"
+                    f"{change}"
+                )
+            )
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmark regressions")
+
+        self.stdout.write(self.style.SUCCESS("No benchmark regressions"))
+
+    def report(self, result):
+        key = _benchmark.result_key(result.strategy, result.regime, result.bars)
+        if result.error:
+            self.stdout.write(self.style.WARNING(f"{key}: {result.error}"))
+            return
+        self.stdout.write(
+            f"{key}: {self.format('seconds', result.seconds)}, "
+            f"{self.format('peak_memory', result.peak_memory)}"
+        )
+
+    def format(self, metric, value):
+        if value is None:
+            return "-"
+        if metric == "seconds":
+            return f"{value * 1000:.2f} ms"
+        if metric == "peak_memory":
+            return f"{value / 1024:.0f} KiB"
+        return str(value)
@@ -0,0 +1,98 @@
+import asyncio
+from collections import defaultdict
+
+from constance import config
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.trading import tasks
+from apps.trading.strategies import _kline_stream, _live, _registry, _resample
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams klines of the configured markets, stores closed candles "
+        "and runs the strategies as soon as each candle closes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--markets",
+            nargs="+",
+            metavar="SYMBOL:TIMEFRAME",
+            help="Markets to stream (default: those of the trading settings)",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Evaluate the strategies in this process, updating their "
+                "state with each closed candle, instead of scheduling a "
+                "full run per candle"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["markets"]:
+            markets = [self.parse(market) for market in options["markets"]]
+        else:
+            markets = tasks.configured_markets()
+        if not markets:
+            raise CommandError("No markets configured")
+
+        # Los timeframes derivables se obtienen del stream base del símbolo
+        self.base = settings.CANDLE_BASE_TIMEFRAME
+        self.derived = defaultdict(list)
+        streams = set()
+        for symbol, timeframe in markets:
+            if _resample.derivable(timeframe, self.base):
+                self.derived[symbol].append(timeframe)
+                streams.add((symbol, self.base))
+            else:
+                streams.add((symbol, timeframe))
+
+        # Estrategias en memoria de cada mercado en modo incremental
+        self.live = None
+        if options["incremental"]:
+            strategies = _registry.load_enabled(config.DISABLED_STRATEGIES)
+            self.live = {
+                market: _live.LiveMarket(*market, strategies)
+                for market in markets
+            }
+
+        stream = _kline_stream.KlineStream(sorted(streams), self.on_close)
+        self.stdout.write(
+            f"Streaming {len(markets)} markets: "
+            + ", ".join(
+                f"{symbol} {timeframe}" for symbol, timeframe in markets
+            )
+        )
+        try:
+            asyncio.run(stream.run())
+        except KeyboardInterrupt:
+            stream.stop()
+
+    def on_close(self, symbol, timeframe, timestamp):
+        # Se llama desde un hilo del stream: publicar las tareas en el broker
+        # no detiene la lectura del websocket
+        closed = [(timeframe, timestamp)]
+        if timeframe == self.base:
+            closed = _resample.closing(
+                timestamp, self.base, self.derived[symbol]
+            )
+        for timeframe, start in closed:
+            if self.live is None:
+                tasks.run_pair_strategies.delay(symbol, timeframe, until=start)
+                continue
+            results = self.live[symbol, timeframe].on_close(start)
+            signals = tasks.save_strategy_signals(symbol, timeframe, results)
+            self.stdout.write(
+                f"Evaluated {len(results)} live strategies for {symbol} "
+                f"{timeframe}: {len(signals)} signals"
+            )
+
+    def parse(self, market):
+        symbol, _, timeframe = market.partition(":")
+        if not symbol or not timeframe:
+            raise CommandError(f"Invalid market {market}, use SYMBOL:TIMEFRAME")
+        return symbol.upper(), timeframe
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-18 18:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0006_alter_tradingsettings_api_key_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tradingsettings",
+            name="timeframe",
+            field=models.CharField(
+                choices=[
+                    ("1m", "1 minute"),
+                    ("5m", "5 minutes"),
+                    ("15m", "15 minutes"),
+                    ("1h", "1 hour"),
+                    ("4h", "4 hours"),
+                    ("1d", "1 day"),
+                ],
+                default="15m",
+                max_length=10,
+            ),
+        ),
+    ]
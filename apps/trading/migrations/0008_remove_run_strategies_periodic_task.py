@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def remove_periodic_task(apps, schema_editor):
+    # El DatabaseScheduler conserva las entradas retiradas de
+    # CELERY_BEAT_SCHEDULE: las estrategias las dispara ahora stream_klines
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name="run-strategies-every-15-minutes").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0007_tradingsettings_timeframe"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_periodic_task, migrations.RunPython.noop),
+    ]
@@ -24,6 +24,11 @@ class TradingSettings(TimeStampedModel, BinanceModel):
     take_profit = models.IntegerField(default=25)
     stop_loss = models.IntegerField(default=25)
     symbol = models.CharField(max_length=20, default=constants.BTCUSDT)
+    timeframe = models.CharField(
+        max_length=10,
+        choices=choices.Timeframe.choices,
+        default=choices.Timeframe.FIFTEEN_MINUTES,
+    )
 
     def __str__(self):
         return f"Trading Settings for {self.user.email}"
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+
+import ccxt
+import ccxt.async_support
+
+from apps.trading import constants
+from apps.trading.strategies import _exchanges
+from apps.trading.strategies._market_fetcher import to_frame
+
+logger = logging.getLogger(__name__)
+
+# Peso de una petición de velas según `limit` (Binance)
+KLINE_WEIGHTS = ((100, 1), (500, 2), (1001, 5))
+
+
+def kline_weight(limit):
+    for bound, weight in KLINE_WEIGHTS:
+        if limit < bound:
+            return weight
+    return 10
+
+
+class WeightBudget:
+    """
+    Presupuesto de peso de peticiones compartido por todas las descargas:
+    se recupera de forma continua a razón de `capacity` por `period`
+    segundos y cada petición espera hasta que hay peso suficiente. Las
+    esperas se atienden en orden de llegada.
+    """
+
+    def __init__(
+        self,
+        capacity=constants.EXCHANGE_WEIGHT_LIMIT,
+        period=constants.EXCHANGE_WEIGHT_PERIOD,
+    ):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.available = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    async def acquire(self, weight):
+        if weight > self.capacity:
+            raise ValueError("weight must not exceed the budget capacity")
+        async with self._lock:
+            self._refill()
+            while self.available < weight:
+                await asyncio.sleep((weight - self.available) / self.rate)
+                self._refill()
+            self.available -= weight
+
+
+def create_exchange(exchange_id="binanceus"):
+    """
+    Cliente asíncrono con los mercados ya cargados por el cliente síncrono
+    del proceso. El límite de peticiones lo controla `WeightBudget`, así que
+    se desactiva el de ccxt, que las serializaría.
+    """
+    shared = _exchanges.client(exchange_id)
+    exchange = getattr(ccxt.async_support, exchange_id)(
+        {"enableRateLimit": False}
+    )
+    exchange.set_markets(shared.markets, shared.currencies)
+    return exchange
+
+
+async def fetch_many(
+    pairs,
+    limit=100,
+    exchange=None,
+    budget=None,
+    timeout=constants.FETCH_TIMEOUT,
+    retries=constants.FETCH_RETRIES,
+    backoff=0.5,
+):
+    """
+    Descarga a la vez las últimas `limit` velas de cada par (símbolo ccxt,
+    timeframe) dentro del presupuesto de peso `budget`.
+
+    Cada petición tiene un tiempo máximo `timeout` y se reintenta hasta
+    `retries` veces, con espera exponencial, ante errores de red o de
+    límite de peticiones. Devuelve {(símbolo, timeframe): DataFrame} solo
+    con los pares descargados; los fallos se registran en el log.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    budget = budget or WeightBudget()
+    owned = exchange is None
+    if owned:
+        exchange = create_exchange()
+
+    try:
+        frames = await asyncio.gather(
+            *(
+                _fetch(
+                    exchange,
+                    budget,
+                    symbol,
+                    timeframe,
+                    limit,
+                    timeout,
+                    retries,
+                    backoff,
+                )
+                for symbol, timeframe in pairs
+            )
+        )
+    finally:
+        if owned:
+            await exchange.close()
+
+    return {
+        pair: frame for pair, frame in zip(pairs, frames) if frame is not None
+    }
+
+
+def fetch_all(pairs, **kwargs):
+    """Versión síncrona de `fetch_many` para tareas de Celery"""
+    return asyncio.run(fetch_many(pairs, **kwargs))
+
+
+async def _fetch(
+    exchange, budget, symbol, timeframe, limit, timeout, retries, backoff
+):
+    weight = kline_weight(limit)
+    for attempt in range(retries + 1):
+        await budget.acquire(weight)
+        try:
+            ohlcv = await asyncio.wait_for(
+                exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit),
+                timeout,
+            )
+            return to_frame(ohlcv)
+        except (asyncio.TimeoutError, ccxt.NetworkError) as e:
+            error = e
+            if attempt < retries:
+                await asyncio.sleep(backoff * 2**attempt)
+        except ccxt.BaseError as e:
+            logger.error(f"Error fetching {symbol} {timeframe}: {str(e)}")
+            return None
+
+    logger.error(
+        f"Error fetching {symbol} {timeframe} after {retries + 1} attempts: "
+        f"{str(error) or type(error).__name__}"
+    )
+    return None
@@ -0,0 +1,248 @@
+import logging
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from apps.trading import choices
+
+logger = logging.getLogger(__name__)
+
+# Velas de cada ventana al reproducir generate_signal(), igual que la
+# descarga de velas de la ejecución en vivo
+REPLAY_WINDOW = 100
+
+DIRECTIONS = {choices.OrderSide.BUY: 1, choices.OrderSide.SELL: -1}
+
+Trade = namedtuple(
+    "Trade",
+    [
+        "direction",
+        "entry_index",
+        "exit_index",
+        "entry_price",
+        "exit_price",
+        "profit",
+        "reason",
+    ],
+)
+
+
+class BacktestResult(
+    namedtuple(
+        "BacktestResult",
+        ["strategy", "signals", "trades", "errors", "elapsed", "vectorized"],
+        defaults=(True,),
+    )
+):
+    """
+    Resultado del backtest de una estrategia. `vectorized` indica si sus
+    señales salen de `generate_signals()` o de reproducir ventana a ventana.
+    """
+
+    __slots__ = ()
+
+    def summary(self):
+        """Métricas de la simulación (beneficios en % sobre el margen)"""
+        profits = np.array([trade.profit for trade in self.trades])
+        equity = np.cumsum(profits)
+        drawdown = np.maximum.accumulate(np.r_[0.0, equity])[1:] - equity
+        wins = int((profits > 0).sum())
+        return {
+            "strategy": self.strategy,
+            "signals": int(np.count_nonzero(self.signals)),
+            "trades": len(self.trades),
+            "wins": wins,
+            "win_rate": wins / len(self.trades) if self.trades else 0.0,
+            "total_profit": float(profits.sum()),
+            "max_drawdown": float(drawdown.max()) if self.trades else 0.0,
+            "errors": self.errors,
+            "elapsed": self.elapsed,
+            "vectorized": self.vectorized,
+        }
+
+
+def replay(
+    strategy_classes,
+    data,
+    symbol,
+    timeframe,
+    window=REPLAY_WINDOW,
+    params=None,
+):
+    """
+    Señales de `generate_signal()` sobre cada ventana deslizante de `window`
+    velas. Las estrategias comparten cada ventana (y su cache de
+    indicadores), como en la ejecución en vivo.
+    Devuelve {nombre: (señales, errores, segundos)}.
+    """
+    signals = {
+        cls.__name__: np.zeros(len(data), dtype=int) for cls in strategy_classes
+    }
+    errors = dict.fromkeys(signals, 0)
+    elapsed = dict.fromkeys(signals, 0.0)
+
+    for end in range(window, len(data) + 1):
+        frame = data.iloc[end - window : end].reset_index(drop=True)
+        for cls in strategy_classes:
+            name = cls.__name__
+            started = time.perf_counter()
+            try:
+                strategy = cls(frame, symbol, timeframe, params=params)
+                signal = strategy.generate_signal()
+                if signal:
+                    signals[name][end - 1] = DIRECTIONS.get(signal["signal"], 0)
+            except Exception:
+                errors[name] += 1
+            elapsed[name] += time.perf_counter() - started
+
+    return {
+        name: (signals[name], errors[name], elapsed[name]) for name in signals
+    }
+
+
+def _first_exit(high, low, start, direction, take_profit, stop_loss):
+    """
+    Primera vela desde `start` que toca el take profit o el stop loss.
+    Se busca en bloques crecientes, de modo que el coste es proporcional a la
+    duración de la operación y no al histórico restante.
+    """
+    size = 64
+    while start < len(high):
+        stop = min(start + size, len(high))
+        if direction == 1:
+            take = high[start:stop] >= take_profit
+            loss = low[start:stop] <= stop_loss
+        else:
+            take = low[start:stop] <= take_profit
+            loss = high[start:stop] >= stop_loss
+
+        hit = take | loss
+        if hit.any():
+            index = int(np.argmax(hit))
+            # Si la vela toca ambos niveles se asume el stop loss
+            reason = "stop_loss" if loss[index] else "take_profit"
+            return start + index, reason
+        start, size = stop, size * 2
+    return None, "end"
+
+
+def simulate(data, signals, leverage, take_profit, stop_loss, fee=0.0):
+    """
+    Simula operaciones apalancadas con las reglas de `check_positions_status`:
+    se cierra cuando el beneficio (variación % × apalancamiento) alcanza
+    `take_profit` o cae hasta `-stop_loss`.
+
+    Cada señal abre una posición al cierre de su vela si no hay otra abierta;
+    la salida se ejecuta al precio del nivel tocado y, si no se toca ninguno,
+    al último cierre. `fee` es la comisión (%) del nocional por lado.
+    """
+    high = data["high"].to_numpy(dtype=float)
+    low = data["low"].to_numpy(dtype=float)
+    close = data["close"].to_numpy(dtype=float)
+    signals = np.asarray(signals)
+    entries = np.flatnonzero(signals)
+    take_move = take_profit / leverage / 100
+    stop_move = stop_loss / leverage / 100
+
+    trades = []
+    next_bar = 0
+    while True:
+        position = np.searchsorted(entries, next_bar)
+        if position >= len(entries):
+            break
+
+        entry = int(entries[position])
+        direction = int(np.sign(signals[entry]))
+        entry_price = close[entry]
+        take_price = entry_price * (1 + direction * take_move)
+        stop_price = entry_price * (1 - direction * stop_move)
+
+        exit_index, reason = _first_exit(
+            high, low, entry + 1, direction, take_price, stop_price
+        )
+        if exit_index is None:
+            exit_index, exit_price = len(close) - 1, close[-1]
+        else:
+            exit_price = take_price if reason == "take_profit" else stop_price
+
+        change = direction * (exit_price - entry_price) / entry_price * 100
+        trades.append(
+            Trade(
+                direction,
+                entry,
+                exit_index,
+                float(entry_price),
+                float(exit_price),
+                float((change - 2 * fee) * leverage),
+                reason,
+            )
+        )
+        next_bar = exit_index + 1
+
+    return trades
+
+
+def backtest(
+    strategy_classes,
+    data,
+    leverage=25,
+    take_profit=25,
+    stop_loss=25,
+    fee=0.0,
+    symbol="BTC/USDT",
+    timeframe="15m",
+    window=REPLAY_WINDOW,
+    params=None,
+):
+    """
+    Backtest de cada estrategia sobre todo el histórico `data`, con los
+    parámetros `params` (por defecto los de su esquema).
+
+    Solo las estrategias que implementan `generate_signals()` calculan sus
+    señales en una sola pasada, sobre las mismas ventanas de `window` velas
+    que en vivo: un año de velas de 15m en segundos. El resto se reproducen
+    ventana a ventana, con un coste fijo por ventana (de 0,1 a 10 ms por
+    estrategia), es decir, minutos por año de velas; su resultado se marca
+    con `vectorized=False`. En ambos casos se ignoran las primeras
+    `window - 1` velas, que en vivo no forman una ventana completa.
+    """
+    results = {}
+    replayed = []
+    for cls in strategy_classes:
+        started = time.perf_counter()
+        try:
+            strategy = cls(data, symbol, timeframe, params=params)
+            signals = strategy.generate_signals(window)
+        except Exception as e:
+            logger.error(f"Error generating {cls.__name__} signals: {str(e)}")
+            signals = None
+        if signals is None:
+            replayed.append(cls)
+            continue
+        results[cls.__name__] = (
+            np.asarray(signals, dtype=int),
+            0,
+            time.perf_counter() - started,
+        )
+
+    if replayed:
+        logger.info(
+            f"Replaying {len(replayed)} strategies without generate_signals() "
+            f"over {max(len(data) - window + 1, 0)} windows"
+        )
+        results.update(
+            replay(replayed, data, symbol, timeframe, window, params=params)
+        )
+
+    backtests = {}
+    for cls in strategy_classes:
+        signals, errors, elapsed = results[cls.__name__]
+        signals[: window - 1] = 0
+        trades = simulate(
+            data, signals, leverage, take_profit, stop_loss, fee=fee
+        )
+        backtests[cls.__name__] = BacktestResult(
+            cls.__name__, signals, trades, errors, elapsed, cls not in replayed
+        )
+    return backtests
@@ -1,18 +1,102 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
 
+from apps.trading.strategies import _params
+from apps.trading.strategies._cache import IndicatorCache
+from apps.trading.strategies._candles import Candles
+
 
 class TradingStrategy(ABC):
-    def __init__(self, data: pd.DataFrame, symbol: str, timeframe: str):
-        self.df = data
+    # Velas que se conservan en memoria al procesar velas en vivo
+    max_history = 1000
+    # Velas sobre las que se calcula la señal en vivo: las que descarga la
+    # ejecución por par
+    signal_window = 100
+    # Parámetros ajustables: {nombre: _params.Parameter}
+    parameters = {}
+
+    def __init__(self, data, symbol: str, timeframe: str, params=None):
+        # Velas de solo lectura compartidas con el resto de estrategias
+        self.df = Candles.of(data)
+        # Columnas y valores intermedios propios de la estrategia
+        self.scratch = {}
         self.symbol = symbol
         self.timeframe = timeframe
+        # Valores por defecto del esquema con los ajustes validados encima
+        self.params = _params.resolve(self.parameters, params)
+        # Indicadores compartidos con el resto de estrategias de la ejecución
+        self.indicators = IndicatorCache.of(self.df)
+        # Indicadores incrementales, se inicializan en la primera vela
+        self.streams = None
 
     @abstractmethod
     def generate_signal(self):
         pass
 
+    def generate_signals(self, window):
+        """
+        Señales de todas las velas de `self.df` en una sola pasada
+        vectorizada: Serie con 1 (compra), -1 (venta) o 0 (sin señal). La
+        de cada vela con ventana completa es la que da `generate_signal()`
+        sobre las `window` velas que terminan en ella, como en vivo.
+        Devuelve None si la estrategia no la implementa; el backtest
+        reproduce entonces `generate_signal()` sobre ventanas deslizantes.
+        """
+        return None
+
+    def create_streams(self) -> dict:
+        """
+        Indicadores incrementales (ver `_streaming`) que usa la estrategia.
+        Las estrategias sin indicadores incrementales recalculan la señal
+        con `generate_signal()` en cada vela (ver `stream_signal`).
+        """
+        return {}
+
+    def stream_signal(self):
+        """
+        Señal a partir del estado de `self.streams` tras la última vela.
+        Sin indicadores incrementales es la de `generate_signal()` sobre las
+        últimas `signal_window` velas, como en la ejecución por par.
+        """
+        strategy = type(self)(
+            self.df.iloc[-self.signal_window :],
+            self.symbol,
+            self.timeframe,
+            params=self.params,
+        )
+        return strategy.generate_signal()
+
+    def on_candle(self, bar):
+        """
+        Procesa una nueva vela cerrada (mapping con timestamp y OHLCV)
+        actualizando el estado en lugar de volver a descargar y recalcular
+        todo el histórico: O(1) amortizado con indicadores incrementales.
+        Lo usa el stream de velas en modo incremental (ver `_live`).
+        """
+        if self.streams is None:
+            self.streams = {
+                name: indicator.warm_up(self.df.to_frame())
+                for name, indicator in self.create_streams().items()
+            }
+
+        self._append_candle(bar)
+        for indicator in self.streams.values():
+            indicator.update(bar)
+        return self.stream_signal()
+
+    def _append_candle(self, bar):
+        self.df = self.df.append(bar, self.max_history)
+        self.scratch = {}
+        self.indicators = IndicatorCache.of(self.df)
+
+    def _build_signals(self, buy, sell):
+        """Serie de señales a partir de las condiciones de compra y venta"""
+        return pd.Series(
+            np.select([buy, sell], [1, -1], 0), index=self.df.index
+        )
+
     def _build_signal(self, signal):
         return {
             "ticker": self.symbol,
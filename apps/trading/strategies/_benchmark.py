@@ -0,0 +1,146 @@
+import json
+import platform
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from apps.trading.strategies import _registry, _synthetic
+
+SIZES = (100, 1_000, 10_000, 100_000)
+
+BenchmarkResult = namedtuple(
+    "BenchmarkResult",
+    ["strategy", "regime", "bars", "seconds", "peak_memory", "error"],
+)
+Regression = namedtuple(
+    "Regression", ["key", "metric", "baseline", "current", "change"]
+)
+
+
+def result_key(strategy, regime, bars):
+    return f"{strategy}/{regime}/{bars}"
+
+
+def measure(strategy_class, data, repeat=3):
+    """
+    Mejor tiempo de `generate_signal()` en `repeat` ejecuciones y pico de
+    memoria (tracemalloc) de una ejecución adicional.
+    Cada ejecución recibe una copia de las velas, de modo que el cache de
+    indicadores empieza vacío y las estrategias que modifican el DataFrame
+    no afectan a las siguientes.
+    """
+    timings = []
+    for _ in range(repeat):
+        strategy = strategy_class(data.copy(), "BTC/USDT", "15m")
+        start = time.perf_counter()
+        strategy.generate_signal()
+        timings.append(time.perf_counter() - start)
+
+    strategy = strategy_class(data.copy(), "BTC/USDT", "15m")
+    tracemalloc.start()
+    try:
+        strategy.generate_signal()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(timings), peak_memory
+
+
+def run(
+    strategies=None,
+    sizes=SIZES,
+    regimes=_synthetic.REGIMES,
+    repeat=3,
+    seed=0,
+):
+    """
+    Ejecuta el benchmark de cada estrategia (por defecto todas las del
+    registro) sobre velas sintéticas de cada régimen y tamaño.
+    Devuelve un generador de `BenchmarkResult` para informar del progreso.
+    """
+    names = list(_registry.STRATEGIES) if not strategies else strategies
+
+    for regime in regimes:
+        for bars in sizes:
+            data = _synthetic.generate_candles(bars, regime=regime, seed=seed)
+            for name in names:
+                try:
+                    seconds, peak_memory = measure(
+                        _registry.load(name), data, repeat=repeat
+                    )
+                except Exception as e:
+                    yield BenchmarkResult(
+                        name,
+                        regime,
+                        bars,
+                        None,
+                        None,
+                        f"{type(e).__name__}: {str(e)}",
+                    )
+                    continue
+                yield BenchmarkResult(
+                    name, regime, bars, seconds, peak_memory, None
+                )
+
+
+def to_baseline(results, **meta):
+    """Resultados en el formato JSON del fichero de referencia"""
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **meta,
+        "results": {
+            result_key(result.strategy, result.regime, result.bars): {
+                "seconds": result.seconds,
+                "peak_memory": result.peak_memory,
+                "error": result.error,
+            }
+            for result in results
+        },
+    }
+
+
+def save_baseline(path, results, **meta):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(to_baseline(results, **meta), indent=2))
+
+
+def load_baseline(path):
+    return json.loads(path.read_text())["results"]
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.001):
+    """
+    Regresiones respecto a la referencia: tiempo o pico de memoria más de
+    `tolerance` por encima del valor de referencia. Las diferencias de
+    tiempo menores que `min_seconds` se consideran ruido.
+    """
+    regressions = []
+    for result in results:
+        key = result_key(result.strategy, result.regime, result.bars)
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+
+        if result.error and not reference["error"]:
+            regressions.append(
+                Regression(key, "error", None, result.error, None)
+            )
+            continue
+
+        for metric, noise in (("seconds", min_seconds), ("peak_memory", 0)):
+            previous, current = reference[metric], getattr(result, metric)
+            if not previous or current is None:
+                continue
+            if current > previous * (1 + tolerance) and (
+                current - previous > noise
+            ):
+                regressions.append(
+                    Regression(
+                        key, metric, previous, current, current / previous - 1
+                    )
+                )
+    return regressions
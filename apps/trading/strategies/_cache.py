@@ -0,0 +1,247 @@
+from collections import Counter, namedtuple
+
+import pandas as pd
+import ta
+
+from apps.trading.strategies import _money_flow, _vwap
+
+Bands = namedtuple("Bands", ["upper", "middle", "lower"])
+
+
+def _nbytes(value):
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return getattr(value, "nbytes", 0)
+
+
+class IndicatorCache:
+    """
+    Cache de indicadores asociado a un DataFrame de velas.
+    Las claves son (indicador, parámetros, versión de datos), de modo que
+    cada indicador distinto se calcula una sola vez por ejecución aunque
+    lo pidan varias estrategias.
+    """
+
+    ATTRIBUTE = "_indicator_cache"
+
+    def __init__(self, data: pd.DataFrame):
+        self.df = data
+        self._values = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @classmethod
+    def of(cls, data: pd.DataFrame):
+        """Devuelve el cache adjunto al DataFrame, creándolo si no existe"""
+        cache = getattr(data, cls.ATTRIBUTE, None)
+        if cache is None or cache.df is not data:
+            cache = cls(data)
+            # Atributo privado: pandas no lo propaga a DataFrames derivados
+            object.__setattr__(data, cls.ATTRIBUTE, cache)
+        return cache
+
+    @property
+    def version(self):
+        """Identifica el contenido OHLCV actual del DataFrame"""
+        if self.df.empty:
+            return (0,)
+        return (
+            len(self.df),
+            self.df["timestamp"].iat[0],
+            self.df["timestamp"].iat[-1],
+            self.df["close"].iat[-1],
+            self.df["high"].iat[-1],
+            self.df["low"].iat[-1],
+            self.df["volume"].iat[-1],
+        )
+
+    def get(self, name, params, compute):
+        """Obtiene un indicador del cache o lo calcula con `compute`"""
+        key = (name, params, self.version)
+        if key in self._values:
+            self.hits[name] += 1
+            return self._values[key]
+
+        self.misses[name] += 1
+        value = compute()
+        self._values[key] = value
+        return value
+
+    @property
+    def nbytes(self):
+        """Memoria (bytes) de los indicadores guardados"""
+        return sum(_nbytes(value) for value in self._values.values())
+
+    def clear(self):
+        self._values.clear()
+        self.hits.clear()
+        self.misses.clear()
+
+    def report(self):
+        """Resumen de aciertos y fallos del cache por indicador"""
+        return self.summarize(self.hits, self.misses)
+
+    @staticmethod
+    def summarize(hits: Counter, misses: Counter):
+        total_hits = sum(hits.values())
+        total_misses = sum(misses.values())
+        total = total_hits + total_misses
+        return {
+            "hits": total_hits,
+            "misses": total_misses,
+            "hit_ratio": total_hits / total if total else 0.0,
+            "indicators": {
+                name: {"hits": hits[name], "misses": misses[name]}
+                for name in sorted(set(hits) | set(misses))
+            },
+        }
+
+    # --- Indicadores compartidos ---
+
+    def typical_price(self):
+        return self.get(
+            "typical_price",
+            (),
+            lambda: (self.df["high"] + self.df["low"] + self.df["close"]) / 3,
+        )
+
+    def vwap(self):
+        """VWAP acumulado desde la primera vela del DataFrame"""
+
+        def compute():
+            typical_price = self.typical_price()
+            return (typical_price * self.df["volume"]).cumsum() / self.df[
+                "volume"
+            ].cumsum()
+
+        return self.get("vwap", (), compute)
+
+    def session_vwap(self, session="1D"):
+        """VWAP anclado a sesiones UTC (ver `_vwap.session_vwap`)"""
+        return self.get(
+            "session_vwap",
+            (session,),
+            lambda: _vwap.session_vwap(
+                self.df["timestamp"],
+                self.typical_price(),
+                self.df["volume"],
+                session=session,
+            ),
+        )
+
+    def ema(self, span, adjust=True, column="close"):
+        return self.get(
+            "ema",
+            (span, adjust, column),
+            lambda: self.df[column].ewm(span=span, adjust=adjust).mean(),
+        )
+
+    def sma(self, window, column="close"):
+        return self.get(
+            "sma",
+            (window, column),
+            lambda: self.df[column].rolling(window=window).mean(),
+        )
+
+    def rsi(self, window=14):
+        return self.get(
+            "rsi",
+            (window,),
+            lambda: ta.momentum.RSIIndicator(
+                self.df["close"], window=window
+            ).rsi(),
+        )
+
+    def atr(self, window=14):
+        return self.get(
+            "atr",
+            (window,),
+            lambda: ta.volatility.AverageTrueRange(
+                high=self.df["high"],
+                low=self.df["low"],
+                close=self.df["close"],
+                window=window,
+            ).average_true_range(),
+        )
+
+    def obv(self):
+        return self.get(
+            "obv",
+            (),
+            lambda: ta.volume.OnBalanceVolumeIndicator(
+                self.df["close"], self.df["volume"]
+            ).on_balance_volume(),
+        )
+
+    def bollinger(self, window=20, window_dev=2):
+        def compute():
+            bb = ta.volatility.BollingerBands(
+                self.df["close"], window=window, window_dev=window_dev
+            )
+            return Bands(
+                bb.bollinger_hband(),
+                bb.bollinger_mavg(),
+                bb.bollinger_lband(),
+            )
+
+        return self.get("bollinger", (window, window_dev), compute)
+
+    def adx(self, window=14):
+        def compute():
+            adx = ta.trend.ADXIndicator(
+                high=self.df["high"],
+                low=self.df["low"],
+                close=self.df["close"],
+                window=window,
+            )
+            return adx.adx(), adx.adx_pos(), adx.adx_neg()
+
+        return self.get("adx", (window,), compute)
+
+    def mfi(self, window=14):
+        return self.get(
+            "mfi",
+            (window,),
+            lambda: _money_flow.money_flow_index(
+                self.typical_price(), self.df["volume"], window=window
+            ),
+        )
+
+    def pressure(self):
+        """Presión compradora y vendedora estimada por vela"""
+        return self.get(
+            "pressure",
+            (),
+            lambda: _money_flow.pressure(
+                self.df["high"],
+                self.df["low"],
+                self.df["close"],
+                self.df["volume"],
+            ),
+        )
+
+    def cumulative_delta(self, window):
+        def compute():
+            buy, sell = self.pressure()
+            return _money_flow.cumulative_delta(buy, sell, window)
+
+        return self.get("cumulative_delta", (window,), compute)
+
+    def acc_dist(self):
+        return self.get(
+            "acc_dist",
+            (),
+            lambda: _money_flow.accumulation_distribution(
+                self.df["high"],
+                self.df["low"],
+                self.df["close"],
+                self.df["volume"],
+            ),
+        )
+
+    def macd(self):
+        def compute():
+            macd = ta.trend.MACD(self.df["close"])
+            return macd.macd(), macd.macd_signal(), macd.macd_diff()
+
+        return self.get("macd", (), compute)
@@ -0,0 +1,153 @@
+import fcntl
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Registro de cada vela en disco: timestamp (ms) y OHLCV
+RECORD = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+
+
+def to_frame(records) -> pd.DataFrame:
+    """Registros `RECORD` como DataFrame de velas"""
+    data = pd.DataFrame(
+        {column: np.array(records[column]) for column in RECORD.names}
+    )
+    data["timestamp"] = pd.to_datetime(data["timestamp"], unit="ms")
+    return data
+
+
+class CandleStore:
+    """
+    Histórico local de velas de un (exchange, símbolo, timeframe) en un
+    fichero binario de registros de tamaño fijo, ordenados por timestamp.
+
+    Las velas nuevas se añaden al final y la vela con el timestamp de la
+    última guardada (la vela aún abierta en la descarga anterior) se
+    sobrescribe en su sitio. Las que faltan de un hueco anterior se
+    insertan en su posición, reescribiendo solo el fichero desde ella; las
+    ya guardadas no cambian. La lectura usa un mapa de memoria, de modo que
+    leer las últimas velas no carga el fichero.
+    """
+
+    def __init__(self, root, exchange, symbol, timeframe):
+        name = re.sub(r"[^A-Za-z0-9_-]", "", symbol)
+        self.path = Path(root) / exchange / name / f"{timeframe}.bin"
+
+    def __len__(self):
+        if not self.path.exists():
+            return 0
+        return self.path.stat().st_size // RECORD.itemsize
+
+    def records(self, since=None):
+        """Registros guardados (desde el timestamp `since` incluido)"""
+        if not len(self):
+            return np.empty(0, dtype=RECORD)
+        records = np.memmap(
+            self.path, dtype=RECORD, mode="r", shape=(len(self),)
+        )
+        if since is not None:
+            records = records[np.searchsorted(records["timestamp"], since) :]
+        return records
+
+    @contextmanager
+    def lock(self):
+        """
+        Bloqueo exclusivo del almacén, también entre procesos, para leer la
+        última vela, descargar las siguientes y guardarlas sin que otra
+        actualización del mismo fichero se intercale.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def last_timestamp(self):
+        """Timestamp (ms) de la última vela guardada, o None"""
+        records = self.records()
+        return int(records["timestamp"][-1]) if len(records) else None
+
+    def append(self, ohlcv):
+        """
+        Guarda las velas de `ohlcv` (filas [timestamp ms, o, h, l, c, v] como
+        las devuelve ccxt) que no estén guardadas y actualiza la última.
+        Devuelve el número de velas nuevas.
+        """
+        rows = np.asarray(ohlcv, dtype=float).reshape(-1, len(RECORD.names))
+        records = np.empty(len(rows), dtype=RECORD)
+        for i, column in enumerate(RECORD.names):
+            records[column] = rows[:, i]
+        # Orden por timestamp y sin duplicados (se conserva la última copia)
+        records = records[::-1]
+        _, first = np.unique(records["timestamp"], return_index=True)
+        records = records[first]
+
+        last = self.last_timestamp()
+        if last is None or not len(records) or records["timestamp"][0] > last:
+            return self._append(records)
+
+        current = records[records["timestamp"] == last]
+        if len(current):
+            self._overwrite_last(current[-1])
+        stored = self.records()
+        position = np.searchsorted(stored["timestamp"], records["timestamp"])
+        found = np.zeros(len(records), dtype=bool)
+        inside = position < len(stored)
+        found[inside] = (
+            stored["timestamp"][position[inside]]
+            == records["timestamp"][inside]
+        )
+        records = records[~found]
+        if not len(records) or records["timestamp"][0] > last:
+            return self._append(records)
+
+        # Velas de un hueco: se reescribe el fichero desde la primera
+        start = int(
+            np.searchsorted(stored["timestamp"], records["timestamp"][0])
+        )
+        tail = np.concatenate([stored[start:], records])
+        tail = tail[np.argsort(tail["timestamp"], kind="stable")]
+        del stored
+        with open(self.path, "r+b") as file:
+            file.seek(start * RECORD.itemsize)
+            file.write(tail.tobytes())
+        return len(records)
+
+    def _append(self, records):
+        if len(records):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as file:
+                file.write(records.tobytes())
+        return len(records)
+
+    def _overwrite_last(self, record):
+        with open(self.path, "r+b") as file:
+            file.seek((len(self) - 1) * RECORD.itemsize)
+            file.write(record.tobytes())
+
+    def read(self, limit=None, until=None) -> pd.DataFrame:
+        """
+        Últimas `limit` velas (todas por defecto) como DataFrame, hasta la
+        vela que abre en el timestamp `until` (ms) incluida.
+        """
+        records = self.records()
+        if until is not None:
+            end = np.searchsorted(records["timestamp"], until, side="right")
+            records = records[:end]
+        if limit is not None:
+            records = records[-limit:] if limit else records[:0]
+        return to_frame(records)
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+
+FIELDS = ("open", "high", "low", "close", "volume")
+COLUMNS = ("timestamp", *FIELDS)
+
+
+def _read_only(values):
+    values = np.asarray(values)
+    values.flags.writeable = False
+    return values
+
+
+class Candles:
+    """
+    Velas de solo lectura que comparten todas las estrategias de una
+    ejecución.
+
+    Precios y volumen viven en un único bloque float64 (campo × vela) en el
+    que cada campo es contiguo; `candles.close` y el resto de campos son
+    vistas NumPy sin copia. Las columnas se exponen como Series de pandas
+    sobre esas mismas vistas, de modo que pandas y `ta` calculan igual que
+    con un DataFrame, pero cualquier escritura falla: los valores propios
+    de cada estrategia van en su `scratch`.
+    """
+
+    ATTRIBUTE = "_candles"
+
+    def __init__(self, timestamp, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.strides[-1] != prices.itemsize:
+            prices = np.ascontiguousarray(prices)
+        self.prices = _read_only(prices)
+        timestamp = pd.Series(timestamp)
+        if isinstance(timestamp.dtype, np.dtype):
+            timestamp = pd.Series(_read_only(timestamp.to_numpy(copy=True)))
+        else:
+            # Con zona horaria: copia propia, aunque no de solo lectura
+            timestamp = timestamp.reset_index(drop=True).copy()
+        self._columns = {"timestamp": timestamp.rename("timestamp")}
+        # Bloque con margen del que estas velas son una vista (ver `append`)
+        self._block = None
+        self._start = 0
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame):
+        prices = np.empty((len(FIELDS), len(data)))
+        for i, field in enumerate(FIELDS):
+            prices[i] = data[field].to_numpy(dtype=np.float64)
+        return cls(data["timestamp"], prices)
+
+    @classmethod
+    def of(cls, data):
+        """
+        Contenedor de las velas `data`. El de un DataFrame se guarda en él,
+        así que todas las estrategias que lo reciben comparten contenedor
+        (y cache de indicadores) mientras su contenido no cambie.
+        """
+        if isinstance(data, cls):
+            return data
+        candles = getattr(data, cls.ATTRIBUTE, None)
+        if candles is None or not candles._matches(data):
+            candles = cls.from_frame(data)
+            # Atributo privado: pandas no lo propaga a DataFrames derivados
+            object.__setattr__(data, cls.ATTRIBUTE, candles)
+        return candles
+
+    def _matches(self, data):
+        if len(data) != len(self):
+            return False
+        if not len(self):
+            return True
+        return (
+            data["timestamp"].iat[-1] == self["timestamp"].iat[-1]
+            and data["close"].iat[-1] == self.close[-1]
+            and data["volume"].iat[-1] == self.volume[-1]
+        )
+
+    def __getattr__(self, name):
+        if name in FIELDS:
+            return self.prices[FIELDS.index(name)]
+        raise AttributeError(name)
+
+    def __getitem__(self, column):
+        series = self._columns.get(column)
+        if series is None:
+            if column not in FIELDS:
+                raise KeyError(column)
+            series = self._columns[column] = pd.Series(
+                getattr(self, column), name=column, copy=False
+            )
+        return series
+
+    def __setitem__(self, column, value):
+        raise TypeError("Candles are read-only, use the strategy scratch")
+
+    def __contains__(self, column):
+        return column in COLUMNS
+
+    def __len__(self):
+        return self.prices.shape[1]
+
+    @property
+    def index(self):
+        return pd.RangeIndex(len(self))
+
+    @property
+    def columns(self):
+        return pd.Index(COLUMNS)
+
+    @property
+    def empty(self):
+        return not len(self)
+
+    @property
+    def iloc(self):
+        """Tramo de velas por posición (solo slices), sin copiar precios"""
+        return _Slicer(self)
+
+    @property
+    def nbytes(self):
+        return self.prices.nbytes + self["timestamp"].nbytes
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({column: self[column] for column in COLUMNS})
+
+    def append(self, bar, max_history=None):
+        """
+        Nuevo contenedor con la vela `bar` al final (y como mucho
+        `max_history` velas).
+
+        La vela se escribe en el hueco libre de un bloque reservado con
+        margen y el contenedor nuevo es una vista del bloque, así que el
+        coste es O(1) amortizado: solo al llenarse el bloque (o al añadir
+        a un contenedor que ya no es el último del bloque) se copian las
+        velas a uno nuevo del doble de `max_history`.
+        """
+        block, start = self._block, self._start
+        if (
+            block is None
+            or start + len(self) != block.size
+            or block.size == block.capacity
+        ):
+            keep = len(self)
+            if max_history is not None:
+                keep = min(keep, max_history - 1)
+            block = _Block(self, keep, 2 * max(max_history or 0, keep + 1))
+            start = 0
+        block.push(bar)
+        if max_history is not None:
+            start = max(start, block.size - max_history)
+        return block.view(start)
+
+
+class _Block:
+    """
+    Velas reservadas con margen al final para que `Candles.append` añada
+    velas sin copiar las anteriores. Los timestamps con zona horaria se
+    guardan en UTC.
+    """
+
+    def __init__(self, candles, keep, capacity):
+        timestamp = candles["timestamp"].iloc[len(candles) - keep :]
+        self.tz = getattr(timestamp.dtype, "tz", None)
+        if self.tz is not None:
+            timestamp = timestamp.dt.tz_convert(None)
+        self.timestamps = np.empty(capacity, dtype="datetime64[ns]")
+        self.prices = np.empty((len(FIELDS), capacity))
+        self.timestamps[:keep] = timestamp.to_numpy(dtype="datetime64[ns]")
+        self.prices[:, :keep] = candles.prices[:, len(candles) - keep :]
+        self.size = keep
+
+    @property
+    def capacity(self):
+        return len(self.timestamps)
+
+    def push(self, bar):
+        timestamp = pd.Timestamp(bar["timestamp"])
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)
+        self.timestamps[self.size] = timestamp.to_datetime64()
+        self.prices[:, self.size] = [float(bar[field]) for field in FIELDS]
+        self.size += 1
+
+    def view(self, start):
+        """Velas del bloque desde `start` hasta la última, sin copiarlas"""
+        candles = Candles.__new__(Candles)
+        candles.prices = _read_only(self.prices[:, start : self.size])
+        timestamp = _read_only(self.timestamps[start : self.size])
+        if self.tz is None:
+            timestamp = pd.Series(timestamp, name="timestamp", copy=False)
+        else:
+            timestamp = pd.Series(
+                pd.DatetimeIndex(timestamp).tz_localize("UTC"),
+                name="timestamp",
+            ).dt.tz_convert(self.tz)
+        candles._columns = {"timestamp": timestamp}
+        candles._block = self
+        candles._start = start
+        return candles
+
+
+class _Slicer:
+    def __init__(self, candles):
+        self.candles = candles
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("Candles only support slices")
+        return Candles(
+            self.candles["timestamp"].iloc[key], self.candles.prices[:, key]
+        )
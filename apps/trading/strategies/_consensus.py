@@ -0,0 +1,142 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from apps.trading import constants
+from apps.trading.strategies import _backtest
+
+
+class Rule(
+    namedtuple(
+        "Rule", ["window", "count", "distinct"], defaults=("60min", 5, 5)
+    )
+):
+    """
+    Regla de consenso: `count` señales consecutivas de la misma dirección
+    dentro de `window`, de al menos `distinct` estrategias diferentes.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.window}/{self.count}/{self.distinct}"
+
+
+# Regla del detector de consenso en vivo
+LIVE_RULE = Rule(
+    f"{constants.CONSENSUS_WINDOW_MINUTES}min",
+    constants.CONSENSUS_COUNT,
+    constants.CONSENSUS_DISTINCT,
+)
+
+
+class ConsensusSimulator:
+    """
+    Reproduce la regla de consenso de `ConsensusEngine` sobre la matriz
+    velas × estrategias de señales históricas (1 compra, -1 venta, 0 hold).
+
+    Las señales forman un único flujo ordenado por vela y, dentro de cada
+    vela, por el orden de las estrategias (el orden de creación en vivo),
+    con el timestamp de su vela. Como en vivo, los hold no cortan la racha,
+    un cambio de dirección la reinicia y hay consenso cuando sus `count`
+    señales más recientes caben en la ventana (de la más antigua a la más
+    reciente) y vienen de `distinct` estrategias diferentes; tras cada
+    consenso la racha vuelve a empezar.
+
+    Las condiciones de cada grupo de `count` señales consecutivas se
+    calculan con vistas deslizantes; solo el reinicio tras un consenso
+    depende de los anteriores y se resuelve recorriendo los candidatos.
+    """
+
+    def __init__(self, signals: dict, timestamp):
+        self.names = list(signals)
+        matrix = np.column_stack([np.asarray(signals[n]) for n in self.names])
+        self.bars, self.strategies = matrix.shape
+        self.timestamp = np.asarray(
+            pd.to_datetime(pd.Series(timestamp)), dtype="datetime64[ns]"
+        )
+
+        self.bar, self.strategy = np.nonzero(matrix)
+        self.sign = np.sign(matrix[self.bar, self.strategy])
+        self.time = self.timestamp[self.bar]
+        # Primera señal de la racha de cada señal, sin contar reinicios
+        starts = np.r_[True, self.sign[1:] != self.sign[:-1]]
+        self.run_start = np.maximum.accumulate(
+            np.where(starts, np.arange(len(self.sign)), 0)
+        )
+        self._distinct = {}
+
+    def distinct(self, count):
+        """Estrategias diferentes entre las `count` señales que empiezan en p"""
+        if count not in self._distinct:
+            windows = np.sort(sliding_window_view(self.strategy, count), axis=1)
+            self._distinct[count] = 1 + np.count_nonzero(
+                np.diff(windows, axis=1), axis=1
+            )
+        return self._distinct[count]
+
+    def signals(self, rule=LIVE_RULE):
+        """
+        Dirección del consenso en cada vela (1, -1 o 0); si en una vela se
+        completan varios, la del último.
+        """
+        if rule.distinct > rule.count:
+            raise ValueError("distinct must not be greater than count")
+        count = rule.count
+        direction = np.zeros(self.bars, dtype=int)
+        if len(self.sign) < count:
+            return direction
+
+        # Grupos de `count` señales [first, last] de una misma racha, dentro
+        # de la ventana y de suficientes estrategias diferentes
+        last = np.arange(count - 1, len(self.sign))
+        first = last - count + 1
+        window = pd.Timedelta(rule.window).to_timedelta64()
+        ok = (
+            (self.run_start[last] <= first)
+            & (self.time[last] - self.time[first] <= window)
+            & (self.distinct(count) >= rule.distinct)
+        )
+
+        # Tras un consenso sus señales ya no cuentan para el siguiente
+        fired, available = [], 0
+        for end in last[ok].tolist():
+            if end - count + 1 >= available:
+                fired.append(end)
+                available = end + 1
+        if not fired:
+            return direction
+
+        fired = np.asarray(fired)
+        bars = self.bar[fired]
+        newest = np.r_[bars[1:] != bars[:-1], True]
+        direction[bars[newest]] = self.sign[fired[newest]]
+        return direction
+
+    def simulate(
+        self,
+        data,
+        rules=(LIVE_RULE,),
+        leverage=25,
+        take_profit=25,
+        stop_loss=25,
+        fee=0.0,
+    ):
+        """
+        Operaciones de cada variante de la regla con las reglas de take
+        profit y stop loss del backtest. Devuelve {regla: BacktestResult}.
+        """
+        results = {}
+        for rule in rules:
+            started = time.perf_counter()
+            signals = self.signals(rule)
+            trades = _backtest.simulate(
+                data, signals, leverage, take_profit, stop_loss, fee=fee
+            )
+            results[rule] = _backtest.BacktestResult(
+                str(rule), signals, trades, 0, time.perf_counter() - started
+            )
+        return results
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+
+import ccxt
+
+from apps.trading import constants
+
+# Mercados compartidos por todos los hilos del proceso, por exchange
+_markets = {}
+_lock = threading.Lock()
+# Clientes de cada hilo, por exchange
+_local = threading.local()
+
+
+def _reset():
+    """Los procesos hijos no heredan sesiones HTTP ni mercados del padre"""
+    global _local
+    _local = threading.local()
+    _markets.clear()
+
+
+os.register_at_fork(after_in_child=_reset)
+
+
+def client(exchange_id="binanceus"):
+    """
+    Cliente ccxt reutilizable del hilo actual.
+
+    Cada hilo conserva su cliente (y su sesión HTTP con keep-alive) entre
+    ejecuciones, de modo que no se repite el handshake TLS. Los mercados se
+    cargan una sola vez por proceso, se comparten entre los clientes de
+    todos los hilos y se recargan cuando superan `EXCHANGE_MARKETS_TTL`.
+    """
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = {}
+        _local.versions = {}
+
+    exchange = clients.get(exchange_id)
+    if exchange is None:
+        exchange = clients[exchange_id] = getattr(ccxt, exchange_id)(
+            {"enableRateLimit": True}
+        )
+
+    shared = _load_markets(exchange)
+    if _local.versions.get(exchange_id) != shared["loaded"]:
+        if exchange.markets is not shared["markets"]:
+            exchange.set_markets(shared["markets"], shared["currencies"])
+        _local.versions[exchange_id] = shared["loaded"]
+    return exchange
+
+
+def _load_markets(exchange):
+    shared = _markets.get(exchange.id)
+    if shared is not None and not _expired(shared):
+        return shared
+
+    with _lock:
+        shared = _markets.get(exchange.id)
+        if shared is None or _expired(shared):
+            exchange.load_markets(reload=True)
+            shared = _markets[exchange.id] = {
+                "markets": exchange.markets,
+                "currencies": exchange.currencies,
+                "loaded": time.monotonic(),
+            }
+    return shared
+
+
+def _expired(shared):
+    age = time.monotonic() - shared["loaded"]
+    return age > constants.EXCHANGE_MARKETS_TTL
@@ -0,0 +1,207 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+Supertrend = namedtuple("Supertrend", ["upper", "lower", "line", "direction"])
+LinearRegression = namedtuple("LinearRegression", ["slope", "intercept"])
+
+
+def supertrend(high, low, close, atr, multiplier, anchor="bands"):
+    """
+    Supertrend en una sola pasada.
+
+    Las bandas básicas se calculan vectorizadas con NumPy; el ajuste de las
+    bandas es recursivo y se resuelve en un único bucle de Python sobre
+    listas de floats nativos (`.tolist()`), sin lecturas ni escrituras
+    escalares sobre Series de pandas.
+
+    anchor="bands": cada banda final se ajusta contra su propio valor
+    anterior (definición clásica) y la dirección es 1 si la línea queda por
+    debajo del cierre, -1 en caso contrario (0 en la primera vela).
+    anchor="line": ambas bandas se ajustan contra la línea de Supertrend
+    anterior y la dirección cambia cuando el cierre cruza una banda.
+    """
+    hl2 = (np.asarray(high, dtype=float) + np.asarray(low, dtype=float)) / 2
+    offset = multiplier * np.asarray(atr, dtype=float)
+    basic_upper = (hl2 + offset).tolist()
+    basic_lower = (hl2 - offset).tolist()
+    close = np.asarray(close, dtype=float).tolist()
+
+    if anchor == "bands":
+        upper, lower, line, direction = _anchor_bands(
+            basic_upper, basic_lower, close
+        )
+    elif anchor == "line":
+        upper, lower, line, direction = _anchor_line(
+            basic_upper, basic_lower, close
+        )
+    else:
+        raise ValueError(f"Unknown supertrend anchor: {anchor}")
+
+    return Supertrend(
+        np.array(upper),
+        np.array(lower),
+        np.array(line),
+        np.array(direction, dtype=int),
+    )
+
+
+def rolling_linreg(values, window):
+    """
+    Regresión lineal móvil sobre x = 0..window-1 para la ventana que termina
+    en cada vela; el intercepto es el valor ajustado en la primera vela de
+    la ventana.
+
+    Se resuelve en forma cerrada con sumas móviles de y y de x·y, en O(n)
+    en lugar de un ajuste por ventana. Las ventanas incompletas o con NaN
+    quedan en NaN.
+    """
+    y = pd.Series(np.asarray(values, dtype=float))
+    position = np.arange(len(y), dtype=float)
+    sum_x = window * (window - 1) / 2
+    sum_x2 = (window - 1) * window * (2 * window - 1) / 6
+
+    sum_y = y.rolling(window).sum()
+    # Σ k·y con k relativo a la ventana: Σ j·y_j - (primera vela)·Σ y
+    first = position - (window - 1)
+    sum_xy = (y * position).rolling(window).sum() - first * sum_y
+
+    slope = (window * sum_xy - sum_x * sum_y) / (window * sum_x2 - sum_x**2)
+    intercept = (sum_y - slope * sum_x) / window
+    return LinearRegression(slope.to_numpy(), intercept.to_numpy())
+
+
+def percentile_rank(values, window):
+    """
+    Porcentaje de valores de la ventana que termina en cada vela que son
+    estrictamente menores que el valor de esa vela.
+    Se calcula sobre vistas deslizantes de NumPy; las ventanas incompletas o
+    con NaN quedan en NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    rank = np.full(len(values), np.nan)
+    if len(values) < window:
+        return rank
+
+    windows = sliding_window_view(values, window)
+    below = (windows < windows[:, -1:]).sum(axis=1) / window * 100
+    below[np.isnan(windows).any(axis=1)] = np.nan
+    rank[window - 1 :] = below
+    return rank
+
+
+def windowed_ema(values, span, window, lag=0):
+    """
+    EMA ajustada (como `ewm(span=span).mean()`) que en cada vela solo ve las
+    `window` velas que terminan en ella, igual que la ventana de velas de la
+    ejecución en vivo, evaluada `lag` velas antes del final de la ventana
+    (lag=1: el valor anterior dentro de la misma ventana).
+
+    Cada valor es una media ponderada de la ventana, así que se calcula con
+    vistas deslizantes en lugar de una EMA por ventana. Las ventanas
+    incompletas quedan en NaN.
+    """
+    decay = 1 - 2 / (span + 1)
+    weights = decay ** np.arange(window - lag)[::-1]
+    return _weighted_windows(values, weights / weights.sum(), window, lag)
+
+
+def windowed_rsi(close, period, window):
+    """
+    RSI de `ta` (medias de Wilder sin ajustar) calculado en cada vela sobre
+    las `window` velas que terminan en ella. La primera variación de cada
+    ventana no existe y vale 0, así que solo pesan las `window - 1`
+    restantes. Las ventanas incompletas quedan en NaN.
+    """
+    alpha = 1 / period
+    diff = np.diff(np.asarray(close, dtype=float), prepend=np.nan)
+    weights = alpha * (1 - alpha) ** np.arange(window - 1)[::-1]
+    up = _weighted_windows(np.where(diff > 0, diff, 0.0), weights, window)
+    down = _weighted_windows(np.where(diff < 0, -diff, 0.0), weights, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(down == 0, 100.0, 100 - 100 / (1 + up / down))
+    rsi[np.isnan(down)] = np.nan
+    return rsi
+
+
+def _weighted_windows(values, weights, window, lag=0):
+    """
+    Suma ponderada por `weights` (de la vela más antigua a la más reciente)
+    de las velas que terminan `lag` velas antes del final de la ventana de
+    `window` velas de cada vela.
+    """
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan)
+    if len(values) < window:
+        return result
+
+    sums = sliding_window_view(values, len(weights)) @ weights
+    start = window - lag - len(weights)
+    result[window - 1 :] = sums[start : start + len(values) - window + 1]
+    return result
+
+
+def _anchor_bands(basic_upper, basic_lower, close):
+    size = len(close)
+    upper = [0.0] * size
+    lower = [0.0] * size
+    line = [0.0] * size
+    direction = [0] * size
+
+    for i in range(1, size):
+        prev_close, prev_line = close[i - 1], line[i - 1]
+        prev_upper, prev_lower = upper[i - 1], lower[i - 1]
+
+        if basic_upper[i] < prev_upper or prev_close > prev_upper:
+            upper[i] = basic_upper[i]
+        else:
+            upper[i] = prev_upper
+
+        if basic_lower[i] > prev_lower or prev_close < prev_lower:
+            lower[i] = basic_lower[i]
+        else:
+            lower[i] = prev_lower
+
+        if prev_line == prev_upper:
+            if close[i] <= upper[i]:
+                line[i] = upper[i]
+            elif close[i] > upper[i]:
+                line[i] = lower[i]
+        elif prev_line == prev_lower:
+            if close[i] >= lower[i]:
+                line[i] = lower[i]
+            elif close[i] < lower[i]:
+                line[i] = upper[i]
+
+        direction[i] = 1 if line[i] <= close[i] else -1
+
+    return upper, lower, line, direction
+
+
+def _anchor_line(basic_upper, basic_lower, close):
+    size = len(close)
+    upper = list(basic_upper)
+    lower = list(basic_lower)
+    line = [0.0] * size
+    direction = [1] * size
+
+    for i in range(1, size):
+        prev_close, prev_line = close[i - 1], line[i - 1]
+
+        if not (lower[i] > prev_line or prev_close <= prev_line):
+            lower[i] = prev_line
+        if not (upper[i] < prev_line or prev_close >= prev_line):
+            upper[i] = prev_line
+
+        if close[i] <= upper[i]:
+            direction[i] = -1
+        elif close[i] >= lower[i]:
+            direction[i] = 1
+        else:
+            direction[i] = direction[i - 1]
+
+        line[i] = lower[i] if direction[i] == 1 else upper[i]
+
+    return upper, lower, line, direction
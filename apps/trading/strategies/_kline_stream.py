@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+
+import ccxt
+import websockets
+from django.conf import settings
+
+from apps.trading import constants, utils
+from apps.trading.strategies import _exchanges
+from apps.trading.strategies._candle_store import CandleStore
+
+logger = logging.getLogger(__name__)
+
+
+def stream_url(pairs, base=constants.KLINE_STREAM_URL):
+    """URL del stream combinado de velas de los pares (símbolo, timeframe)"""
+    streams = "/".join(
+        f"{symbol.lower()}@kline_{timeframe}" for symbol, timeframe in pairs
+    )
+    return f"{base}?streams={streams}"
+
+
+def parse_kline(message):
+    """
+    Vela de un mensaje del stream combinado como (símbolo, timeframe,
+    [timestamp ms, o, h, l, c, v], cerrada).
+    """
+    kline = json.loads(message)["data"]["k"]
+    row = [
+        int(kline["t"]),
+        float(kline["o"]),
+        float(kline["h"]),
+        float(kline["l"]),
+        float(kline["c"]),
+        float(kline["v"]),
+    ]
+    return kline["s"], kline["i"], row, bool(kline["x"])
+
+
+class KlineStream:
+    """
+    Ingesta de velas por websocket: cada vela cerrada se guarda en el
+    almacén local de velas y se notifica a `on_close(símbolo, timeframe,
+    timestamp)` en cuanto el exchange la da por cerrada.
+
+    Las actualizaciones de la vela abierta se ignoran. Si la conexión se
+    pierde se reconecta con espera exponencial; las velas cerradas durante
+    el corte se descargan por REST del cliente `exchange` antes de guardar
+    la primera vela tras la reconexión. Si esa descarga falla la vela no se
+    guarda, de modo que el fetcher completa el hueco desde la última vela
+    guardada. `connect` recibe la URL y devuelve el websocket como gestor
+    de contexto asíncrono (por defecto `websockets.connect`).
+
+    Cada vela cerrada se encola y se procesa en un hilo, en orden dentro de
+    su mercado: el bloqueo del almacén, la descarga del hueco y `on_close`
+    no detienen la lectura del websocket.
+    """
+
+    def __init__(
+        self,
+        pairs,
+        on_close,
+        connect=websockets.connect,
+        exchange_id="binanceus",
+        store_dir=None,
+        reconnect_delay=1.0,
+        exchange=None,
+    ):
+        self.url = stream_url(pairs)
+        self.on_close = on_close
+        self.connect = connect
+        self.reconnect_delay = reconnect_delay
+        self.exchange_id = exchange_id
+        self.exchange = exchange
+        store_dir = store_dir or settings.CANDLE_STORE_DIR
+        # Sin directorio configurado solo se notifican las velas cerradas
+        self.stores = {}
+        if store_dir:
+            self.stores = {
+                (symbol.upper(), timeframe): CandleStore(
+                    store_dir, exchange_id, symbol.upper(), timeframe
+                )
+                for symbol, timeframe in pairs
+            }
+        self._stopped = False
+        # Cola de velas cerradas de cada mercado y workers que las procesan
+        self._queues = {}
+        self._workers = []
+
+    def stop(self):
+        self._stopped = True
+
+    async def run(self):
+        delay = self.reconnect_delay
+        while not self._stopped:
+            try:
+                async with self.connect(self.url) as websocket:
+                    logger.info(f"Connected to kline stream {self.url}")
+                    delay = self.reconnect_delay
+                    async for message in websocket:
+                        self.handle(message)
+                        if self._stopped:
+                            break
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                websockets.WebSocketException,
+            ) as e:
+                logger.error(f"Kline stream connection error: {str(e)}")
+
+            if not self._stopped:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, constants.KLINE_STREAM_MAX_BACKOFF)
+        await self._drain()
+
+    def handle(self, message):
+        """
+        Procesa un mensaje; devuelve True si cerraba una vela, que queda
+        encolada para `close_candle`. Se llama desde el bucle de eventos.
+        """
+        try:
+            symbol, timeframe, row, closed = parse_kline(message)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Invalid kline message: {str(e)}")
+            return False
+        if not closed:
+            return False
+
+        key = (symbol, timeframe)
+        if key not in self._queues:
+            self._queues[key] = asyncio.Queue()
+            self._workers.append(
+                asyncio.create_task(self._work(key, self._queues[key]))
+            )
+        self._queues[key].put_nowait(row)
+        return True
+
+    async def _work(self, key, queue):
+        """Procesa en un hilo, una tras otra, las velas cerradas de `key`"""
+        while True:
+            row = await queue.get()
+            try:
+                await asyncio.to_thread(self.close_candle, *key, row)
+            except Exception as e:
+                logger.error(
+                    f"Error storing closed candle {key[0]} {key[1]}: {str(e)}"
+                )
+            finally:
+                queue.task_done()
+
+    async def _drain(self):
+        """Espera a que se procesen las velas encoladas y para los workers"""
+        for queue in self._queues.values():
+            await queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queues, self._workers = {}, []
+
+    def close_candle(self, symbol, timeframe, row):
+        """
+        Guarda la vela cerrada `row` (tras descargar el hueco anterior) y la
+        notifica a `on_close`. Bloquea: se ejecuta fuera del bucle de eventos.
+        """
+        store = self.stores.get((symbol, timeframe))
+        if store is not None:
+            try:
+                with store.lock():
+                    self.backfill(store, symbol, timeframe, row[0])
+                    store.append([row])
+            except ccxt.BaseError as e:
+                logger.error(
+                    f"Error backfilling {symbol} {timeframe}: {str(e)}"
+                )
+        try:
+            self.on_close(symbol, timeframe, row[0])
+        except Exception as e:
+            logger.error(
+                f"Error handling closed candle {symbol} {timeframe}: {str(e)}"
+            )
+
+    def backfill(self, store, symbol, timeframe, timestamp):
+        """
+        Descarga por REST las velas entre la última guardada y la que abre
+        en `timestamp` (ms), que el stream no entregó. Devuelve cuántas
+        guarda.
+        """
+        last = store.last_timestamp()
+        period = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        if last is None or timestamp <= last + period:
+            return 0
+
+        if self.exchange is None:
+            self.exchange = _exchanges.client(self.exchange_id)
+        since, count = last + period, (timestamp - last) // period - 1
+        ohlcv = []
+        while count > 0:
+            batch = self.exchange.fetch_ohlcv(
+                utils.to_market_symbol(symbol),
+                timeframe=timeframe,
+                since=since,
+                limit=min(count, constants.FETCH_MAX_CANDLES),
+            )
+            batch = [candle for candle in batch if candle[0] < timestamp]
+            if not batch:
+                break
+            ohlcv.extend(batch)
+            count -= len(batch)
+            since = batch[-1][0] + period
+        logger.info(
+            f"Backfilled {len(ohlcv)} {symbol} {timeframe} candles missed "
+            f"by the stream"
+        )
+        return store.append(ohlcv)
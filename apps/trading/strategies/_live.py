@@ -0,0 +1,95 @@
+import logging
+import time
+from collections import Counter
+
+import pandas as pd
+
+from apps.trading import utils
+from apps.trading.strategies import _resample
+from apps.trading.strategies._base import TradingStrategy
+from apps.trading.strategies._market_fetcher import MarketDataFetcher
+from apps.trading.strategies._parallel import StrategyResult
+
+logger = logging.getLogger(__name__)
+
+
+def _milliseconds(timestamp):
+    return pd.Timestamp(timestamp).value // 1_000_000
+
+
+class LiveMarket:
+    """
+    Estrategias de un mercado (símbolo, timeframe) que se mantienen en
+    memoria y se actualizan con `on_candle` en cada vela cerrada, en lugar
+    de descargar y recalcular el histórico en cada cierre.
+
+    Se inicializan con las últimas `max_history` velas guardadas y se
+    vuelven a inicializar si llega una vela que no sigue a la anterior
+    (p. ej. tras un corte del stream).
+    """
+
+    def __init__(self, symbol, timeframe, strategy_classes):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.strategy_classes = strategy_classes
+        self.period = _resample.timeframe_ms(timeframe)
+        market = utils.to_market_symbol(symbol)
+        self.history = MarketDataFetcher(
+            market, timeframe, limit=TradingStrategy.max_history
+        )
+        self.latest = MarketDataFetcher(market, timeframe, limit=1)
+        self.strategies = None
+        self.last = None
+
+    def on_close(self, timestamp):
+        """
+        Evalúa las estrategias con la vela que abre en `timestamp` (ms) y
+        devuelve sus `StrategyResult`, en el orden de `strategy_classes`.
+        """
+        warm_up = (
+            self.strategies is None or timestamp != self.last + self.period
+        )
+        data = (self.history if warm_up else self.latest).fetch(timestamp)
+        closed = data["timestamp"].iloc[-1] if len(data) else None
+        if closed is None or _milliseconds(closed) != timestamp:
+            logger.error(
+                f"Candle {timestamp} of {self.symbol} {self.timeframe} "
+                f"not available, skipping"
+            )
+            self.strategies = None
+            return []
+
+        if warm_up:
+            # Velas anteriores compartidas por todas las estrategias
+            history = data.iloc[:-1].reset_index(drop=True)
+            self.strategies = [
+                cls(history, self.symbol, self.timeframe)
+                for cls in self.strategy_classes
+            ]
+            logger.info(
+                f"Warmed up {len(self.strategies)} live strategies for "
+                f"{self.symbol} {self.timeframe} with {len(history)} candles"
+            )
+        self.last = timestamp
+        bar = data.iloc[-1].to_dict()
+
+        results = []
+        for strategy in self.strategies:
+            started = time.perf_counter()
+            signal_data, error = None, None
+            try:
+                signal_data = strategy.on_candle(bar)
+            except Exception as e:
+                error = str(e)
+            results.append(
+                StrategyResult(
+                    strategy.__class__.__name__,
+                    signal_data,
+                    error,
+                    time.perf_counter() - started,
+                    Counter(),
+                    Counter(),
+                    0,
+                )
+            )
+        return results
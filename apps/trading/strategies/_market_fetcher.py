@@ -1,5 +1,33 @@
-import ccxt
+import numpy as np
 import pandas as pd
+from django.conf import settings
+
+from apps.trading import constants
+from apps.trading.strategies import _exchanges, _resample
+from apps.trading.strategies._candle_store import CandleStore
+
+COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def to_frame(ohlcv) -> pd.DataFrame:
+    """Velas de ccxt ([timestamp ms, o, h, l, c, v]) como DataFrame"""
+    df = pd.DataFrame(ohlcv, columns=COLUMNS)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def to_ohlcv(data):
+    """Velas de un DataFrame como filas de ccxt, inverso de `to_frame`"""
+    timestamps = data["timestamp"].to_numpy(dtype="datetime64[ms]")
+    prices = np.column_stack(
+        [data[column].to_numpy(dtype=float) for column in COLUMNS[1:]]
+    )
+    return [
+        [timestamp, *row]
+        for timestamp, row in zip(
+            timestamps.astype("int64").tolist(), prices.tolist()
+        )
+    ]
 
 
 class MarketDataFetcher:
@@ -7,15 +35,110 @@ class MarketDataFetcher:
         self.symbol = symbol
         self.timeframe = timeframe
         self.limit = limit
-        self.exchange = ccxt.binanceus()
+        # Cliente compartido: conserva la sesión HTTP y los mercados
+        self.exchange = _exchanges.client("binanceus")
+        # Sin directorio configurado se descargan siempre todas las velas
+        self.store = None
+        self.feed = None
+        # Timeframe de las velas que se descargan y guardan: el base si
+        # `timeframe` se deriva de él
+        self.source_timeframe = timeframe
+        self.source_limit = limit
+        if settings.CANDLE_STORE_DIR:
+            base = settings.CANDLE_BASE_TIMEFRAME
+            if _resample.derivable(timeframe, base, limit):
+                self.source_timeframe = base
+                self.source_limit = limit * self._ratio()
+            self.store = CandleStore(
+                settings.CANDLE_STORE_DIR,
+                self.exchange.id,
+                symbol,
+                self.source_timeframe,
+            )
+            if self.source_timeframe != timeframe:
+                self.feed = _resample.feed(self.store, self.source_timeframe)
 
-    def fetch(self) -> pd.DataFrame:
+    def _ratio(self):
+        """Velas base de cada vela de `timeframe`"""
+        period = _resample.timeframe_ms(self.timeframe)
+        return period // _resample.timeframe_ms(self.source_timeframe)
+
+    def fetch(self, until=None) -> pd.DataFrame:
+        """
+        Últimas `limit` velas. Con `until` (timestamp en ms de la apertura
+        de la última vela cerrada) se descartan las posteriores, y si el
+        almacén ya la tiene no se consulta el exchange.
+        """
+        if self.store is not None:
+            # Todos los timeframes derivados comparten el almacén base
+            with self.store.lock():
+                last = self.store.last_timestamp()
+                if (
+                    until is None
+                    or last is None
+                    or last < self._last_source(until)
+                ):
+                    self.store.append(self._fetch_delta())
+            if self.feed is not None:
+                return self.feed.read(self.timeframe, self.limit, until)
+            return self.store.read(self.limit, until=until)
+
+        if until is None:
+            ohlcv = self.exchange.fetch_ohlcv(
+                self.symbol, timeframe=self.timeframe, limit=self.limit
+            )
+            return to_frame(ohlcv)
+
+        # Una vela más por si la siguiente ya está abierta
         ohlcv = self.exchange.fetch_ohlcv(
-            self.symbol, timeframe=self.timeframe, limit=self.limit
-        )
-        df = pd.DataFrame(
-            ohlcv,
-            columns=["timestamp", "open", "high", "low", "close", "volume"],
+            self.symbol, timeframe=self.timeframe, limit=self.limit + 1
         )
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        return df
+        ohlcv = [candle for candle in ohlcv if candle[0] <= until]
+        return to_frame(ohlcv[-self.limit :])
+
+    def _last_source(self, until):
+        """Apertura de la última vela guardada de la vela que abre en `until`"""
+        if self.feed is None:
+            return until
+        period = _resample.timeframe_ms(self.source_timeframe)
+        return until + (self._ratio() - 1) * period
+
+    def _fetch_delta(self):
+        """
+        Descarga solo las velas desde la última guardada (incluida, ya que
+        pudo guardarse aún abierta). Si el hueco supera las velas necesarias
+        se descargan las últimas, como sin almacén.
+        """
+        period = self.exchange.parse_timeframe(self.source_timeframe) * 1000
+        now = self.exchange.milliseconds()
+        last = self.store.last_timestamp()
+        if last is not None:
+            missing = (now - last) // period + 1
+            if missing <= self.source_limit:
+                return self._fetch_since(last, int(missing), period)
+        if self.source_limit <= constants.FETCH_MAX_CANDLES:
+            return self.exchange.fetch_ohlcv(
+                self.symbol,
+                timeframe=self.source_timeframe,
+                limit=self.source_limit,
+            )
+        # Relleno inicial de velas base en varias peticiones
+        since = now - now % period - (self.source_limit - 1) * period
+        return self._fetch_since(since, self.source_limit, period)
+
+    def _fetch_since(self, since, count, period):
+        """`count` velas desde `since` en peticiones de `FETCH_MAX_CANDLES`"""
+        ohlcv = []
+        while count > 0:
+            batch = self.exchange.fetch_ohlcv(
+                self.symbol,
+                timeframe=self.source_timeframe,
+                since=since,
+                limit=min(count, constants.FETCH_MAX_CANDLES),
+            )
+            if not batch:
+                break
+            ohlcv.extend(batch)
+            count -= len(batch)
+            since = batch[-1][0] + period
+        return ohlcv
@@ -0,0 +1,47 @@
+from collections import namedtuple
+
+Pressure = namedtuple("Pressure", ["buy", "sell"])
+
+# Evita la división por cero en velas sin rango (high == low)
+RANGE_EPSILON = 0.000001
+
+
+def money_flow_index(typical_price, volume, window=14):
+    """
+    Money Flow Index vectorizado.
+    El flujo es positivo cuando el precio típico sube respecto a la vela
+    anterior y negativo cuando baja; la primera vela no aporta flujo.
+    """
+    raw_money_flow = typical_price * volume
+    previous = typical_price.shift(1)
+    positive_flow = raw_money_flow.where(typical_price > previous, 0)
+    negative_flow = raw_money_flow.where(typical_price < previous, 0)
+
+    positive_mf = positive_flow.rolling(window=window).sum()
+    negative_mf = negative_flow.rolling(window=window).sum()
+    return 100 - (100 / (1 + positive_mf / negative_mf))
+
+
+def pressure(high, low, close, volume):
+    """Estimación de volumen comprador/vendedor según la posición del cierre"""
+    candle_range = high - low + RANGE_EPSILON
+    return Pressure(
+        ((close - low) / candle_range) * volume,
+        ((high - close) / candle_range) * volume,
+    )
+
+
+def cumulative_delta(buy_pressure, sell_pressure, window):
+    """Suma móvil de la diferencia entre presión compradora y vendedora"""
+    return (buy_pressure - sell_pressure).rolling(window=window).sum()
+
+
+def accumulation_distribution(high, low, close, volume):
+    """
+    Línea de Acumulación/Distribución, equivalente a
+    `ta.volume.AccDistIndexIndicator(...).acc_dist_index()`.
+    """
+    clv = ((close - low) - (high - close)) / (high - low)
+    # Velas sin rango (0 / 0)
+    clv = clv.fillna(0.0)
+    return (clv * volume).cumsum()
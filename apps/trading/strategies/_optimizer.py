@@ -0,0 +1,202 @@
+import hashlib
+import json
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from django.core.cache import cache
+
+from apps.trading import constants
+from apps.trading.strategies import _backtest, _parallel, _params, _registry
+
+Evaluation = namedtuple("Evaluation", ["params", "summary", "cached"])
+Fold = namedtuple(
+    "Fold", ["train", "test", "params", "train_summary", "test_summary"]
+)
+
+# Tramos de velas reconstruidos en cada proceso hijo: los parámetros
+# evaluados sobre el mismo tramo comparten su cache de indicadores
+_worker_segments = {}
+
+
+def fingerprint(data: pd.DataFrame):
+    """Huella del contenido OHLCV de las velas"""
+    hashed = pd.util.hash_pandas_object(
+        data[["timestamp", *_parallel.PRICE_COLUMNS]], index=False
+    )
+    return hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()
+
+
+def cache_key(strategy, params, data_key, settings):
+    payload = json.dumps(
+        [strategy, params, data_key, settings], sort_keys=True, default=str
+    )
+    return f"optimizer:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+
+def evaluate(strategy, params, data, settings):
+    """Resumen del backtest de la estrategia `strategy` con `params`"""
+    result = _backtest.backtest(
+        [_registry.load(strategy)], data, params=params, **settings
+    )
+    return result[strategy].summary()
+
+
+def _evaluate_shared(descriptor, strategy, params, start, stop, settings):
+    name = descriptor[0]
+    if any(segment[0] != name for segment in _worker_segments):
+        _worker_segments.clear()
+    key = (name, start, stop)
+    if key not in _worker_segments:
+        frame = _parallel.shared_frame(descriptor)
+        _worker_segments[key] = frame.iloc[start:stop].reset_index(drop=True)
+    return evaluate(strategy, params, _worker_segments[key], settings)
+
+
+class Optimizer:
+    """
+    Búsqueda de parámetros de una estrategia por backtest sobre velas
+    históricas: rejilla, búsqueda aleatoria y validación walk-forward.
+
+    Las evaluaciones se reparten en un pool de procesos que lee las velas
+    de memoria compartida, y sus resúmenes se guardan en el cache de Django
+    por (estrategia, parámetros, huella de las velas, ajustes), de modo que
+    al repetir una búsqueda solo se evalúan las combinaciones nuevas.
+    """
+
+    def __init__(
+        self,
+        strategy,
+        data,
+        settings=None,
+        workers=None,
+        objective="total_profit",
+    ):
+        self.strategy = strategy
+        self.schema = _registry.load(strategy).parameters
+        self.data = data
+        # Ajustes del backtest: leverage, take_profit, stop_loss, fee, window
+        self.settings = settings or {}
+        self.workers = workers or _parallel.default_workers()
+        self.objective = objective
+        self._candles = None
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._candles is not None:
+            self._candles.close()
+            self._candles = None
+
+    def sweep(self, candidates, start=0, stop=None):
+        """
+        Evalúa las combinaciones `candidates` sobre las velas [start, stop)
+        y las devuelve ordenadas de mejor a peor según el objetivo.
+        """
+        candidates = [
+            _params.resolve(self.schema, params) for params in candidates
+        ]
+        data_key = fingerprint(self.data.iloc[start:stop])
+        keys = [
+            cache_key(self.strategy, params, data_key, self.settings)
+            for params in candidates
+        ]
+        summaries = cache.get_many(keys)
+        cached = set(summaries)
+
+        pending = {
+            key: params
+            for key, params in zip(keys, candidates)
+            if key not in summaries
+        }
+        if pending:
+            computed = dict(
+                zip(pending, self._evaluate(pending.values(), start, stop))
+            )
+            cache.set_many(computed, timeout=constants.OPTIMIZER_CACHE_TIMEOUT)
+            summaries.update(computed)
+
+        evaluations = [
+            Evaluation(params, summaries[key], key in cached)
+            for key, params in zip(keys, candidates)
+        ]
+        return sorted(
+            evaluations,
+            key=lambda evaluation: evaluation.summary[self.objective],
+            reverse=True,
+        )
+
+    def grid_search(self, start=0, stop=None):
+        return self.sweep(_params.grid(self.schema), start, stop)
+
+    def random_search(self, count, seed=0, start=0, stop=None):
+        return self.sweep(_params.sample(self.schema, count, seed), start, stop)
+
+    def walk_forward(self, train_size, test_size, candidates=None):
+        """
+        Validación walk-forward: en cada tramo se eligen los mejores
+        parámetros sobre `train_size` velas y se evalúan sobre las
+        `test_size` velas siguientes, que no intervinieron en la elección.
+        """
+        window = self.settings.get("window", _backtest.REPLAY_WINDOW)
+        if train_size < window:
+            raise ValueError(f"train_size must be at least {window}")
+        candidates = list(
+            _params.grid(self.schema) if candidates is None else candidates
+        )
+
+        folds = []
+        last_start = len(self.data) - train_size - test_size
+        for train_start in range(0, last_start + 1, test_size):
+            train_stop = train_start + train_size
+            test_stop = train_stop + test_size
+            best = self.sweep(candidates, train_start, train_stop)[0]
+            # El tramo de prueba incluye las velas previas de su primera
+            # ventana, que el backtest no opera
+            test = self.sweep(
+                [best.params], train_stop - (window - 1), test_stop
+            )[0]
+            folds.append(
+                Fold(
+                    (train_start, train_stop),
+                    (train_stop, test_stop),
+                    best.params,
+                    best.summary,
+                    test.summary,
+                )
+            )
+        return folds
+
+    def _evaluate(self, candidates, start, stop):
+        candidates = list(candidates)
+        if self.workers <= 1 or len(candidates) <= 1:
+            segment = self.data.iloc[start:stop].reset_index(drop=True)
+            return [
+                evaluate(self.strategy, params, segment, self.settings)
+                for params in candidates
+            ]
+
+        if self._executor is None:
+            self._candles = _parallel.SharedCandles(self.data)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [
+            self._executor.submit(
+                _evaluate_shared,
+                self._candles.descriptor,
+                self.strategy,
+                params,
+                start,
+                stop,
+                self.settings,
+            )
+            for params in candidates
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,202 @@
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import billiard
+import numpy as np
+import pandas as pd
+
+from apps.trading.strategies._cache import IndicatorCache
+from apps.trading.strategies._candles import FIELDS, Candles
+
+PRICE_COLUMNS = list(FIELDS)
+
+StrategyResult = namedtuple(
+    "StrategyResult",
+    ["strategy", "signal", "error", "elapsed", "hits", "misses", "memory"],
+)
+
+# DataFrame reconstruido en cada proceso hijo, por bloque de memoria
+_worker_frames = {}
+
+
+class SharedCandles:
+    """
+    Publica las velas OHLCV en un bloque de memoria compartida para que
+    los procesos hijos las lean sin serializar el DataFrame por estrategia.
+    Solo viaja el descriptor (nombre del bloque y longitud).
+    """
+
+    def __init__(self, data):
+        candles = Candles.of(data)
+        self.length = len(candles)
+        self.tz = getattr(candles["timestamp"].dtype, "tz", None)
+        size = max(self.length * (len(PRICE_COLUMNS) + 1) * 8, 1)
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+
+        timestamp = candles["timestamp"]
+        if self.tz is not None:
+            timestamp = timestamp.dt.tz_convert(None)
+        timestamps, prices = self._views(self.memory.buf, self.length)
+        timestamps[:] = timestamp.to_numpy(dtype="datetime64[ns]").view("int64")
+        prices[:] = candles.prices
+
+    @property
+    def descriptor(self):
+        return self.memory.name, self.length, self.tz
+
+    @staticmethod
+    def _views(buffer, length):
+        timestamps = np.ndarray((length,), dtype="int64", buffer=buffer)
+        prices = np.ndarray(
+            (len(PRICE_COLUMNS), length),
+            dtype="float64",
+            buffer=buffer,
+            offset=length * 8,
+        )
+        return timestamps, prices
+
+    @classmethod
+    def load(cls, descriptor) -> pd.DataFrame:
+        """Reconstruye el DataFrame de velas desde la memoria compartida"""
+        name, length, tz = descriptor
+        memory = shared_memory.SharedMemory(name=name)
+        try:
+            timestamps, prices = cls._views(memory.buf, length)
+            data = pd.DataFrame(
+                {
+                    "timestamp": pd.to_datetime(timestamps.copy(), unit="ns"),
+                    **{
+                        column: prices[i].copy()
+                        for i, column in enumerate(PRICE_COLUMNS)
+                    },
+                }
+            )
+            del timestamps, prices
+        finally:
+            memory.close()
+        if tz is not None:
+            data["timestamp"] = data["timestamp"].dt.tz_localize("UTC")
+            data["timestamp"] = data["timestamp"].dt.tz_convert(tz)
+        return data
+
+    def close(self):
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def evaluate_strategy(strategy_class, data, symbol, timeframe):
+    """
+    Ejecuta una estrategia y devuelve su `StrategyResult`, incluido el uso
+    del cache de indicadores y la memoria que deja retenida (los
+    indicadores nuevos; su `scratch` se libera con ella). Los errores se
+    devuelven en lugar de propagarse para que una estrategia defectuosa no
+    cancele al resto.
+    """
+    indicators = IndicatorCache.of(Candles.of(data))
+    hits, misses = indicators.hits.copy(), indicators.misses.copy()
+    retained = indicators.nbytes
+    started = time.perf_counter()
+    signal_data, error = None, None
+    try:
+        strategy = strategy_class(data, symbol, timeframe)
+        signal_data = strategy.generate_signal()
+    except Exception as e:
+        error = str(e)
+    return StrategyResult(
+        strategy_class.__name__,
+        signal_data,
+        error,
+        time.perf_counter() - started,
+        indicators.hits - hits,
+        indicators.misses - misses,
+        indicators.nbytes - retained,
+    )
+
+
+def shared_frame(descriptor) -> pd.DataFrame:
+    """
+    DataFrame de las velas compartidas en el proceso hijo; se reconstruye una
+    sola vez por bloque de memoria, de modo que las tareas del mismo proceso
+    comparten DataFrame e indicadores.
+    """
+    name = descriptor[0]
+    if name not in _worker_frames:
+        _worker_frames.clear()
+        _worker_frames[name] = SharedCandles.load(descriptor)
+    return _worker_frames[name]
+
+
+def _evaluate_shared(descriptor, strategy_class, symbol, timeframe):
+    return evaluate_strategy(
+        strategy_class, shared_frame(descriptor), symbol, timeframe
+    )
+
+
+def can_fork():
+    """
+    Si el proceso actual puede crear procesos hijos. Los hijos del pool
+    prefork de Celery (billiard) son daemon y no pueden.
+    """
+    return not (
+        multiprocessing.current_process().daemon
+        or billiard.current_process().daemon
+    )
+
+
+def default_workers():
+    if not can_fork():
+        return 1
+    return os.cpu_count() or 1
+
+
+def split(items, parts):
+    """Reparte `items` en hasta `parts` bloques consecutivos y equilibrados"""
+    parts = max(min(parts, len(items)), 1)
+    size, extra = divmod(len(items), parts)
+    chunks, start = [], 0
+    for part in range(parts):
+        end = start + size + (part < extra)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+def run_parallel(strategies, data, symbol, timeframe, workers=None):
+    """
+    Evalúa las estrategias repartidas en un pool de procesos y reúne todos
+    los resultados en un único paso, en el orden de `strategies`.
+    Con un solo worker, o dentro de un worker de Celery (que no puede crear
+    procesos hijos; ahí se reparten en tareas, ver
+    `tasks.run_pair_strategies`), se ejecutan secuencialmente en el proceso
+    actual.
+    """
+    workers = min(workers or default_workers(), len(strategies))
+    if workers <= 1 or not can_fork():
+        return [
+            evaluate_strategy(strategy_class, data, symbol, timeframe)
+            for strategy_class in strategies
+        ]
+
+    with SharedCandles(data) as candles:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _evaluate_shared,
+                    candles.descriptor,
+                    strategy_class,
+                    symbol,
+                    timeframe,
+                )
+                for strategy_class in strategies
+            ]
+            return [future.result() for future in futures]
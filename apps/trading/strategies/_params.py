@@ -0,0 +1,84 @@
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+
+class Parameter(
+    namedtuple(
+        "Parameter",
+        ["default", "low", "high", "step", "choices"],
+        defaults=(None, None, None, None),
+    )
+):
+    """
+    Parámetro ajustable de una estrategia: rango numérico [low, high] con
+    paso `step` para las búsquedas en rejilla, o lista de `choices`.
+    El tipo es el del valor por defecto.
+    """
+
+    __slots__ = ()
+
+    @property
+    def type(self):
+        return type(self.default)
+
+    def values(self):
+        """Valores de la rejilla"""
+        if self.choices is not None:
+            return list(self.choices)
+        if self.step is None:
+            return [self.default]
+        count = int(round((self.high - self.low) / self.step)) + 1
+        return [self.type(self.low + i * self.step) for i in range(count)]
+
+    def sample(self, rng):
+        """Valor aleatorio del rango (o de las opciones)"""
+        if self.choices is not None:
+            return self.choices[rng.integers(len(self.choices))]
+        if self.type is int:
+            return int(rng.integers(self.low, self.high + 1))
+        return float(rng.uniform(self.low, self.high))
+
+    def validate(self, name, value):
+        if self.choices is not None:
+            if value not in self.choices:
+                raise ValueError(f"{name} must be one of {self.choices}")
+            return value
+        value = self.type(value)
+        if not self.low <= value <= self.high:
+            raise ValueError(
+                f"{name} must be between {self.low} and {self.high}"
+            )
+        return value
+
+
+def defaults(schema):
+    return {name: parameter.default for name, parameter in schema.items()}
+
+
+def resolve(schema, overrides=None):
+    """Valores por defecto del esquema con `overrides` validados encima"""
+    params = defaults(schema)
+    unknown = set(overrides or ()) - set(schema)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    for name, value in (overrides or {}).items():
+        params[name] = schema[name].validate(name, value)
+    return params
+
+
+def grid(schema):
+    """Todas las combinaciones de la rejilla del esquema"""
+    names = list(schema)
+    for values in itertools.product(*(schema[name].values() for name in names)):
+        yield dict(zip(names, values))
+
+
+def sample(schema, count, seed=0):
+    """`count` combinaciones aleatorias reproducibles"""
+    rng = np.random.default_rng(seed)
+    return [
+        {name: parameter.sample(rng) for name, parameter in schema.items()}
+        for _ in range(count)
+    ]
@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+import numpy as np
+
+ValueArea = namedtuple("ValueArea", ["poc", "low", "high"])
+
+
+def _price_bins(edges, price):
+    """Índice del bin de cada precio con la semántica de `np.digitize`"""
+    return np.digitize(price, edges) - 1
+
+
+def _range_bins(edges, low, high):
+    """
+    Primer y último bin que toca cada rango [low, high]: el bin j se toca
+    si low <= edges[j + 1] y high >= edges[j].
+    """
+    first = np.searchsorted(edges, low, side="left") - 1
+    last = np.searchsorted(edges, high, side="right") - 1
+    bins = len(edges) - 1
+    return np.maximum(first, 0), np.minimum(last, bins - 1)
+
+
+def volume_profile(price, volume, edges):
+    """
+    Perfil de volumen: volumen acumulado en el bin de cada precio.
+    Los precios fuera de [edges[0], edges[-1]) no se cuentan, como con
+    `np.digitize`.
+    """
+    edges = np.asarray(edges, dtype=float)
+    index = _price_bins(edges, np.asarray(price, dtype=float))
+    valid = (index >= 0) & (index < len(edges) - 1)
+    return np.bincount(
+        index[valid],
+        weights=np.asarray(volume, dtype=float)[valid],
+        minlength=len(edges) - 1,
+    )
+
+
+def tpo_profile(low, high, edges, weights=None):
+    """
+    Perfil TPO: número de velas (o peso) cuyo rango toca cada bin.
+    Cada vela suma en un array de diferencias [primer bin, último bin] y el
+    perfil es su suma acumulada, en O(n log bins + bins).
+    """
+    edges = np.asarray(edges, dtype=float)
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+    bins = len(edges) - 1
+    weights = (
+        np.ones(len(low)) if weights is None else np.asarray(weights, float)
+    )
+
+    first, last = _range_bins(edges, low, high)
+    valid = ~np.isnan(low) & ~np.isnan(high) & (first <= last)
+    difference = np.bincount(
+        first[valid], weights=weights[valid], minlength=bins + 1
+    ) - np.bincount(last[valid] + 1, weights=weights[valid], minlength=bins + 1)
+    return np.cumsum(difference[:bins])
+
+
+def value_area(profile, fraction=0.7):
+    """
+    POC y Value Area (bins inferior y superior) de un perfil.
+
+    Equivale a expandir desde el POC añadiendo el vecino con más actividad
+    (el izquierdo en caso de empate) hasta cubrir `fraction` del total.
+    Esa expansión es la mezcla de ambos lados ordenados por su mínimo
+    prefijo, que se resuelve con un ordenamiento estable en lugar de un
+    bucle.
+    """
+    profile = np.asarray(profile, dtype=float)
+    poc = int(np.argmax(profile))
+    target = profile.sum() * fraction
+
+    left = profile[:poc][::-1]
+    right = profile[poc + 1 :]
+    keys = np.concatenate(
+        [np.minimum.accumulate(left), np.minimum.accumulate(right)]
+    )
+    order = np.argsort(-keys, kind="stable")
+    is_left = order < len(left)
+    covered = profile[poc] + np.cumsum(np.concatenate([left, right])[order])
+
+    # Niveles añadidos hasta alcanzar el objetivo (incluido el que lo cruza)
+    taken = 0
+    if profile[poc] < target:
+        reached = int(np.searchsorted(covered >= target, True))
+        taken = min(reached + 1, len(order))
+    left_taken = int(is_left[:taken].sum())
+    return ValueArea(poc, poc - left_taken, poc + taken - left_taken)
+
+
+class Profile:
+    """
+    Perfil sobre una rejilla de precios fija que admite actualizaciones
+    incrementales al añadir o descartar velas de la ventana.
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1)
+
+    def add(self, low, high=None, weight=1.0):
+        """Suma una vela: en el bin de `low` o en todo el rango [low, high]"""
+        if high is None:
+            index = int(_price_bins(self.edges, low))
+            if 0 <= index < len(self.counts):
+                self.counts[index] += weight
+            return
+        if np.isnan(low) or np.isnan(high):
+            return
+        first, last = _range_bins(self.edges, low, high)
+        self.counts[first : last + 1] += weight
+
+    def drop(self, low, high=None, weight=1.0):
+        """Descarta una vela añadida previamente con los mismos valores"""
+        self.add(low, high, weight=-weight)
+
+    def value_area(self, fraction=0.7):
+        return value_area(self.counts, fraction)
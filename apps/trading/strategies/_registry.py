@@ -0,0 +1,61 @@
+import logging
+
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Estrategias disponibles (nombre -> ruta de la clase), en orden de ejecución.
+# Los módulos solo se importan al ejecutarse, de modo que importar las tareas
+# no carga pandas, numpy, ta ni ccxt.
+STRATEGIES = {
+    name: f"apps.trading.strategies.{module}.{name}"
+    for module, name in [
+        ("rsi_ma_crossover", "RSIMACrossoverStrategy"),
+        ("adxt_trending", "ADXTrendStrategy"),
+        ("bollinger_reversal", "BollingerReversalStrategy"),
+        ("ema9_21", "EMA921Strategy"),
+        ("triple_ema", "TripleEMAStrategy"),
+        ("fibonacci_retracement", "FibonacciRetracementStrategy"),
+        ("ichimoku", "IchimokuStrategy"),
+        ("macd_divergence", "MACDDivergenceStrategy"),
+        ("pivot_points", "PivotPointsStrategy"),
+        ("volume_profile", "VolumeProfileStrategy"),
+        ("dca_vwap_scalping", "DCAVWAPScalpingStrategy"),
+        ("mean_reversion_grid", "MeanReversionGridStrategy"),
+        ("obv_divergence", "OBVDivergenceStrategy"),
+        ("squeeze_momentum", "SqueezeMomentumStrategy"),
+        ("super_trend", "SupertrendStrategy"),
+        ("crypto_seasonality_momentum", "CryptoSeasonalityMomentumStrategy"),
+        ("market_profile_value_area", "MarketProfileVAStrategy"),
+        ("order_block", "OrderBlockStrategy"),
+        ("smart_money_concept", "SmartMoneyConceptStrategy"),
+        ("wyckoff_accumulation", "WyckoffAccumulationStrategy"),
+        ("momentum_scalping", "MomentumScalpingStrategy"),
+        ("volume_breakout", "VolumeBreakoutStrategy"),
+        ("price_action_pattern", "PriceActionPatternStrategy"),
+        ("aggregated_order_flow", "AggregatedOrderFlowStrategy"),
+        ("liquidity_hunter", "LiquidityHunterStrategy"),
+        ("short_term_trend_catcher", "ShortTermTrendCatcherStrategy"),
+        ("volatility_breakout", "VolatilityBreakoutStrategy"),
+        ("support_resistance_zone", "SupportResistanceZoneStrategy"),
+        ("vwap_scalping", "VWAPScalpingStrategy"),
+    ]
+}
+
+
+def enabled(disabled=()):
+    """Nombres de las estrategias habilitadas, en orden de ejecución"""
+    unknown = set(disabled) - set(STRATEGIES)
+    if unknown:
+        logger.warning(f"Unknown disabled strategies: {sorted(unknown)}")
+    return [name for name in STRATEGIES if name not in disabled]
+
+
+def load(name):
+    """Importa y devuelve la clase de la estrategia `name`"""
+    return import_string(STRATEGIES[name])
+
+
+def load_enabled(disabled=()):
+    """Clases de las estrategias habilitadas, en orden de ejecución"""
+    return [load(name) for name in enabled(disabled)]
@@ -0,0 +1,141 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from apps.trading import constants
+from apps.trading.strategies._candle_store import RECORD, to_frame
+
+# Duración (ms) de cada unidad de timeframe. Las velas se alinean a UTC
+# como en el exchange, así que no se admiten semanas ni meses
+UNITS = {"m": 60_000, "h": 60 * 60_000, "d": 24 * 60 * 60_000}
+
+# Agregadores de cada almacén base del proceso, por ruta del fichero
+_feeds = {}
+_lock = threading.Lock()
+
+
+def timeframe_ms(timeframe):
+    """Duración (ms) de un timeframe ("1m", "15m", "4h", "1d"...)"""
+    try:
+        return int(timeframe[:-1]) * UNITS[timeframe[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe {timeframe}")
+
+
+def derivable(timeframe, base_timeframe, limit=100):
+    """
+    Si `limit` velas de `timeframe` se obtienen del timeframe base: debe
+    ser múltiplo suyo y no requerir más de `RESAMPLE_MAX_BASE_CANDLES`.
+    """
+    if not base_timeframe:
+        return False
+    try:
+        period, base = timeframe_ms(timeframe), timeframe_ms(base_timeframe)
+    except ValueError:
+        return False
+    return (
+        period % base == 0
+        and limit * period // base <= constants.RESAMPLE_MAX_BASE_CANDLES
+    )
+
+
+def closing(timestamp, base_timeframe, timeframes):
+    """
+    Velas de `timeframes` que cierra la vela base que abre en `timestamp`
+    (ms), como pares (timeframe, timestamp de apertura).
+    """
+    end = timestamp + timeframe_ms(base_timeframe)
+    closed = []
+    for timeframe in timeframes:
+        period = timeframe_ms(timeframe)
+        if end % period == 0:
+            closed.append((timeframe, end - period))
+    return closed
+
+
+def aggregate(records, period):
+    """Agrega registros `RECORD` ordenados en velas de `period` ms"""
+    if not len(records):
+        return np.empty(0, dtype=RECORD)
+    timestamp = records["timestamp"]
+    buckets = timestamp - timestamp % period
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(records)] - 1
+
+    bars = np.empty(len(starts), dtype=RECORD)
+    bars["timestamp"] = buckets[starts]
+    bars["open"] = records["open"][starts]
+    bars["high"] = np.maximum.reduceat(records["high"], starts)
+    bars["low"] = np.minimum.reduceat(records["low"], starts)
+    bars["close"] = records["close"][ends]
+    bars["volume"] = np.add.reduceat(records["volume"], starts)
+    return bars
+
+
+class ResampledFeed:
+    """
+    Velas de cualquier timeframe múltiplo del base, derivadas del almacén
+    de velas base de un símbolo, de modo que todos los timeframes son
+    coherentes entre sí.
+
+    Las velas completas de cada timeframe se conservan en memoria y en cada
+    lectura solo se agregan las velas base posteriores. La vela del último
+    registro base se considera abierta y se recalcula en cada lectura a
+    partir de sus velas base, hasta que llega la primera de la siguiente.
+    Si el almacén inserta velas base anteriores (el relleno de un hueco) se
+    agrega todo de nuevo.
+    """
+
+    def __init__(self, store, base_timeframe):
+        self.store = store
+        self.base = timeframe_ms(base_timeframe)
+        # Por periodo: (velas completas, posición en el almacén y timestamp
+        # de la primera vela base de la vela abierta)
+        self._bars = {}
+        self._lock = threading.Lock()
+
+    def bars(self, period):
+        if period % self.base:
+            raise ValueError("timeframe must be a multiple of the base")
+        empty = (np.empty(0, dtype=RECORD), 0, None)
+        with self._lock:
+            complete, offset, first = self._bars.get(period, empty)
+            records = self.store.records()
+            if first is not None and (
+                offset >= len(records) or records["timestamp"][offset] != first
+            ):
+                complete, offset, first = empty
+            records = records[offset:]
+            pending = aggregate(records, period)
+            if not len(pending):
+                return complete
+            complete = np.concatenate([complete, pending[:-1]])
+            start = np.searchsorted(
+                records["timestamp"], pending["timestamp"][-1]
+            )
+            offset += int(start)
+            first = int(records["timestamp"][start])
+            self._bars[period] = (complete, offset, first)
+            return np.concatenate([complete, pending[-1:]])
+
+    def read(self, timeframe, limit=None, until=None) -> pd.DataFrame:
+        """
+        Últimas `limit` velas de `timeframe`, hasta la que abre en `until`
+        (ms) incluida, como `CandleStore.read`.
+        """
+        bars = self.bars(timeframe_ms(timeframe))
+        if until is not None:
+            bars = bars[: np.searchsorted(bars["timestamp"], until, "right")]
+        if limit is not None:
+            bars = bars[-limit:] if limit else bars[:0]
+        return to_frame(bars)
+
+
+def feed(store, base_timeframe):
+    """Agregador compartido del almacén base `store` en el proceso"""
+    with _lock:
+        key = (store.path, base_timeframe)
+        if key not in _feeds:
+            _feeds[key] = ResampledFeed(store, base_timeframe)
+        return _feeds[key]
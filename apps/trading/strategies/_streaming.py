@@ -0,0 +1,218 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class StreamingIndicator(ABC):
+    """
+    Indicador incremental: cada vela cerrada actualiza el estado en O(1)
+    en lugar de recalcular toda la serie histórica.
+    Replica los cálculos por lotes de pandas/ta usados por las estrategias.
+    """
+
+    def __init__(self):
+        self.value = math.nan
+        self.previous = math.nan
+        self.count = 0
+
+    def update(self, bar):
+        """Incorpora una vela cerrada (mapping OHLCV) y devuelve el valor"""
+        self.previous = self.value
+        self.value = self._update(bar)
+        self.count += 1
+        return self.value
+
+    def warm_up(self, data):
+        """Inicializa el estado recorriendo un DataFrame de velas histórico"""
+        for bar in data.to_dict("records"):
+            self.update(bar)
+        return self
+
+    @abstractmethod
+    def _update(self, bar):
+        """Nuevo valor del indicador tras la vela `bar`"""
+
+
+class EMA(StreamingIndicator):
+    """Equivalente a `serie.ewm(span=span, adjust=adjust).mean()`"""
+
+    def __init__(self, span, adjust=True, column="close"):
+        super().__init__()
+        self.alpha = 2 / (span + 1)
+        self.adjust = adjust
+        self.column = column
+        self._numerator = 0.0
+        self._denominator = 0.0
+
+    def _update(self, bar):
+        price = bar[self.column]
+        if self.count == 0:
+            self._numerator = price
+            self._denominator = 1.0
+            return price
+        if not self.adjust:
+            return self.value + self.alpha * (price - self.value)
+        decay = 1 - self.alpha
+        self._numerator = price + decay * self._numerator
+        self._denominator = 1 + decay * self._denominator
+        return self._numerator / self._denominator
+
+
+class RSI(StreamingIndicator):
+    """RSI de Wilder, equivalente a `ta.momentum.RSIIndicator(...).rsi()`"""
+
+    def __init__(self, window=14, column="close"):
+        super().__init__()
+        self.window = window
+        self.column = column
+        self._prev_price = None
+        self._avg_up = 0.0
+        self._avg_down = 0.0
+
+    def _update(self, bar):
+        price = bar[self.column]
+        if self._prev_price is None:
+            # ta trata la primera diferencia (NaN) como una subida/bajada de 0
+            up = down = 0.0
+        else:
+            diff = price - self._prev_price
+            up = max(diff, 0.0)
+            down = max(-diff, 0.0)
+        self._prev_price = price
+
+        if self.count == 0:
+            self._avg_up, self._avg_down = up, down
+        else:
+            alpha = 1 / self.window
+            self._avg_up += alpha * (up - self._avg_up)
+            self._avg_down += alpha * (down - self._avg_down)
+
+        if self.count + 1 < self.window:
+            return math.nan
+        if self._avg_down == 0:
+            return 100.0
+        return 100 - 100 / (1 + self._avg_up / self._avg_down)
+
+
+class ATR(StreamingIndicator):
+    """ATR de Wilder, equivalente a `ta.volatility.AverageTrueRange`"""
+
+    def __init__(self, window=14):
+        super().__init__()
+        self.window = window
+        self._prev_close = None
+        self._seed = 0.0
+
+    def _update(self, bar):
+        true_range = bar["high"] - bar["low"]
+        if self._prev_close is not None:
+            true_range = max(
+                true_range,
+                abs(bar["high"] - self._prev_close),
+                abs(bar["low"] - self._prev_close),
+            )
+        self._prev_close = bar["close"]
+
+        position = self.count + 1
+        if position < self.window:
+            # ta devuelve 0 hasta completar la primera ventana
+            self._seed += true_range
+            return 0.0
+        if position == self.window:
+            return (self._seed + true_range) / self.window
+        return (self.value * (self.window - 1) + true_range) / self.window
+
+
+class OBV(StreamingIndicator):
+    """On-Balance Volume, equivalente a `ta.volume.OnBalanceVolumeIndicator`"""
+
+    def __init__(self):
+        super().__init__()
+        self._prev_close = None
+
+    def _update(self, bar):
+        volume = bar["volume"]
+        if self._prev_close is not None and bar["close"] < self._prev_close:
+            volume = -volume
+        self._prev_close = bar["close"]
+        return volume if self.count == 0 else self.value + volume
+
+
+class VWAP(StreamingIndicator):
+    """VWAP acumulado sobre el precio típico"""
+
+    def __init__(self):
+        super().__init__()
+        self._price_volume = 0.0
+        self._volume = 0.0
+
+    def _update(self, bar):
+        typical_price = (bar["high"] + bar["low"] + bar["close"]) / 3
+        self._price_volume += typical_price * bar["volume"]
+        self._volume += bar["volume"]
+        return self._price_volume / self._volume
+
+
+class RollingSum(StreamingIndicator):
+    """Suma móvil, equivalente a `serie.rolling(window).sum()`"""
+
+    def __init__(self, window, column="close"):
+        super().__init__()
+        self.window = window
+        self.column = column
+        self._values = deque()
+        self._sum = 0.0
+
+    def _update(self, bar):
+        price = bar[self.column]
+        self._values.append(price)
+        self._sum += price
+        if len(self._values) > self.window:
+            self._sum -= self._values.popleft()
+        if len(self._values) < self.window:
+            return math.nan
+        return self._sum
+
+
+class RollingMean(RollingSum):
+    """Media móvil, equivalente a `serie.rolling(window).mean()`"""
+
+    def _update(self, bar):
+        return super()._update(bar) / self.window
+
+
+class RollingMax(StreamingIndicator):
+    """Máximo móvil mediante una deque monótona (O(1) amortizado)"""
+
+    def __init__(self, window, column="high"):
+        super().__init__()
+        self.window = window
+        self.column = column
+        self._candidates = deque()
+
+    def _dominates(self, new, old):
+        return new >= old
+
+    def _update(self, bar):
+        price = bar[self.column]
+        position = self.count
+        while self._candidates and self._dominates(
+            price, self._candidates[-1][1]
+        ):
+            self._candidates.pop()
+        self._candidates.append((position, price))
+        if self._candidates[0][0] <= position - self.window:
+            self._candidates.popleft()
+        if position + 1 < self.window:
+            return math.nan
+        return self._candidates[0][1]
+
+
+class RollingMin(RollingMax):
+    """Mínimo móvil mediante una deque monótona (O(1) amortizado)"""
+
+    def __init__(self, window, column="low"):
+        super().__init__(window, column=column)
+
+    def _dominates(self, new, old):
+        return new <= old
@@ -0,0 +1,46 @@
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+Swings = namedtuple("Swings", ["mask", "index", "price", "volume"])
+
+
+def swing_mask(values, left, right=None, tail=None, kind="high"):
+    """
+    Marca los puntos de giro: velas cuyo valor es el máximo (kind="high") o
+    el mínimo (kind="low") de la ventana [i - left, i + right].
+
+    Solo se evalúan las velas con `left` velas anteriores y `tail` velas
+    posteriores (por defecto `tail = right = left`). Los NaN de la ventana se
+    ignoran, igual que en `Series.max()`.
+    Se calcula sobre vistas deslizantes de NumPy, sin bucles de Python.
+    """
+    right = left if right is None else right
+    tail = right if tail is None else tail
+    if tail < right:
+        raise ValueError("tail must be greater than or equal to right")
+    values = np.asarray(values, dtype=float)
+    mask = np.zeros(len(values), dtype=bool)
+
+    start, stop = left, len(values) - tail
+    if stop <= start:
+        return mask
+
+    windows = sliding_window_view(values, left + right + 1)
+    reduce = np.fmax if kind == "high" else np.fmin
+    extremes = reduce.reduce(windows[start - left : stop - left], axis=1)
+    mask[start:stop] = values[start:stop] == extremes
+    return mask
+
+
+def swings(values, left, right=None, tail=None, kind="high", volume=None):
+    """Puntos de giro como máscara y arrays de índice, precio y volumen"""
+    mask = swing_mask(values, left, right=right, tail=tail, kind=kind)
+    index = np.flatnonzero(mask)
+    return Swings(
+        mask,
+        index,
+        np.asarray(values, dtype=float)[index],
+        None if volume is None else np.asarray(volume, dtype=float)[index],
+    )
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+REGIMES = ("random_walk", "trending", "ranging")
+
+# Deriva por vela del régimen tendencial, en desviaciones de la volatilidad
+TREND_DRIFT = 0.1
+# Velocidad de reversión a la media del régimen lateral
+RANGE_REVERSION = 0.05
+
+
+def _log_prices(noise, regime, volatility):
+    if regime == "random_walk":
+        return np.cumsum(noise)
+    if regime == "trending":
+        return np.cumsum(noise + TREND_DRIFT * volatility)
+    if regime == "ranging":
+        # Proceso AR(1) alrededor del precio inicial
+        log_price = [0.0] * len(noise)
+        previous = 0.0
+        for i, shock in enumerate(noise.tolist()):
+            previous = previous * (1 - RANGE_REVERSION) + shock
+            log_price[i] = previous
+        return np.array(log_price)
+    raise ValueError(f"Unknown regime: {regime}")
+
+
+def generate_candles(
+    size,
+    regime="random_walk",
+    seed=0,
+    start="2024-01-01",
+    freq="15min",
+    price=30000.0,
+    volatility=0.01,
+):
+    """
+    Velas OHLCV sintéticas y reproducibles (misma semilla, mismas velas)
+    para pruebas y benchmarks sin acceso al exchange.
+
+    Regímenes: "random_walk" (paseo aleatorio), "trending" (paseo con
+    deriva alcista) y "ranging" (reversión a la media del precio inicial).
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(0, volatility, size)
+    close = price * np.exp(_log_prices(noise, regime, volatility))
+    open_ = np.r_[price, close[:-1]]
+    wicks = np.abs(rng.normal(0, volatility / 2, (2, size)))
+
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(start, periods=size, freq=freq),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + wicks[0]),
+            "low": np.minimum(open_, close) * (1 - wicks[1]),
+            "close": close,
+            "volume": rng.lognormal(3, 0.6, size),
+        }
+    )
@@ -0,0 +1,48 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+class SessionVWAP(namedtuple("SessionVWAP", ["vwap", "std", "session"])):
+    __slots__ = ()
+
+    def bands(self, deviations):
+        """Bandas (superior, inferior) a `deviations` desviaciones estándar"""
+        return (
+            self.vwap + deviations * self.std,
+            self.vwap - deviations * self.std,
+        )
+
+
+def session_start(timestamp: pd.Series, session="1D") -> pd.Series:
+    """Inicio de la sesión UTC de cada vela (p. ej. "1D", "8h")"""
+    if timestamp.dt.tz is not None:
+        timestamp = timestamp.dt.tz_convert("UTC").dt.tz_localize(None)
+    return timestamp.dt.floor(session)
+
+
+def session_vwap(timestamp, typical_price, volume, session="1D"):
+    """
+    VWAP anclado al inicio de cada sesión UTC según la columna `timestamp`,
+    con su desviación estándar ponderada por volumen.
+    Se calcula con una única suma acumulada agrupada por sesión, por lo que
+    los límites de sesión no dependen de la ventana de velas descargada.
+    """
+    start = session_start(timestamp, session)
+    sums = pd.DataFrame(
+        {
+            "price_volume": typical_price * volume,
+            "square_volume": typical_price**2 * volume,
+            "volume": volume,
+        }
+    )
+    cumulative = sums.groupby(start.to_numpy()).cumsum()
+
+    session_volume = cumulative["volume"].where(cumulative["volume"] > 0)
+    vwap = cumulative["price_volume"] / session_volume
+    variance = cumulative["square_volume"] / session_volume - vwap**2
+    std = np.sqrt(variance.clip(lower=0))
+
+    # Sesiones que aún no tienen volumen conservan el último valor
+    return SessionVWAP(vwap.ffill(), std.ffill(), start)
@@ -1,19 +1,15 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
 
 class ADXTrendStrategy(TradingStrategy):
     def generate_signal(self):
-        adx = ta.trend.ADXIndicator(
-            self.df["high"], self.df["low"], self.df["close"], window=14
-        )
-        self.df["adx"] = adx.adx()
-        ema_short = self.df["close"].ewm(span=9).mean()
-        ema_long = self.df["close"].ewm(span=21).mean()
+        adx, _, _ = self.indicators.adx(14)
+        self.scratch["adx"] = adx
+        ema_short = self.indicators.ema(9)
+        ema_long = self.indicators.ema(21)
 
-        if self.df["adx"].iloc[-1] > 25:
+        if self.scratch["adx"].iloc[-1] > 25:
             if (
                 ema_short.iloc[-2] < ema_long.iloc[-2]
                 and ema_short.iloc[-1] > ema_long.iloc[-1]
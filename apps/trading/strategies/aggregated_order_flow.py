@@ -1,5 +1,3 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -18,66 +16,36 @@ class AggregatedOrderFlowStrategy(TradingStrategy):
         # --- Indicadores de order flow ---
 
         # 1. Money Flow Index (MFI) - versión mejorada de RSI con volumen
-        high = self.df["high"]
-        low = self.df["low"]
         close = self.df["close"]
         volume = self.df["volume"]
 
-        typical_price = (high + low + close) / 3
-        raw_money_flow = typical_price * volume
-
-        # Separar flujos positivos y negativos
-        positive_flow = raw_money_flow.copy()
-        negative_flow = raw_money_flow.copy()
-
-        # Asignar valores según dirección
-        for i in range(1, len(typical_price)):
-            if typical_price.iloc[i] > typical_price.iloc[i - 1]:
-                negative_flow.iloc[i] = 0
-            elif typical_price.iloc[i] < typical_price.iloc[i - 1]:
-                positive_flow.iloc[i] = 0
-            else:
-                positive_flow.iloc[i] = 0
-                negative_flow.iloc[i] = 0
-
-        # Calcular MFI
-        positive_mf = positive_flow.rolling(window=14).sum()
-        negative_mf = negative_flow.rolling(window=14).sum()
-
-        mfi = 100 - (100 / (1 + positive_mf / negative_mf))
+        mfi = self.indicators.mfi(14)
 
         # 2. Accumulation/Distribution Line
-        ad_line = ta.volume.AccumulationDistributionIndex(
-            high=high, low=low, close=close, volume=volume
-        ).acc_dist_index()
+        ad_line = self.indicators.acc_dist()
 
         # Suavizar AD Line para reducir ruido
         ad_ema = ad_line.ewm(span=5).mean()
 
         # 3. On-Balance Volume con análisis de divergencia
-        obv = ta.volume.OnBalanceVolumeIndicator(
-            close, volume
-        ).on_balance_volume()
+        obv = self.indicators.obv()
         obv_ema = obv.ewm(span=8).mean()
 
         # 4. Volumen Delta (estimación de presión compradora vs vendedora)
         # En ausencia de datos tick, estimamos con high-low-close
-        buy_pressure = ((close - low) / (high - low + 0.000001)) * volume
-        sell_pressure = ((high - close) / (high - low + 0.000001)) * volume
-
-        delta_volume = buy_pressure - sell_pressure
-        cumulative_delta = delta_volume.rolling(window=lookback).sum()
+        cumulative_delta = self.indicators.cumulative_delta(lookback)
 
         # 5. Volume Weighted Average Price (VWAP) como referencia
-        vwap = (typical_price * volume).cumsum() / volume.cumsum()
+        vwap = self.indicators.vwap()
 
         # 6. Volume Weighted MACD para filtrar señales falsas
-        ema12 = close.ewm(span=12, adjust=False).mean()
-        ema26 = close.ewm(span=26, adjust=False).mean()
+        ema12 = self.indicators.ema(12, adjust=False)
+        ema26 = self.indicators.ema(26, adjust=False)
         macd_line = ema12 - ema26
 
         # Ponderamos MACD por volumen
-        vol_macd = macd_line * (volume / volume.rolling(window=20).mean())
+        avg_volume = self.indicators.sma(20, column="volume")
+        vol_macd = macd_line * (volume / avg_volume)
         vol_macd_signal = vol_macd.ewm(span=9, adjust=False).mean()
 
         # --- Análisis de Order Flow ---
@@ -132,7 +100,6 @@ class AggregatedOrderFlowStrategy(TradingStrategy):
         )
 
         # Análisis de expansión de volumen (importante para 15 min)
-        avg_volume = volume.rolling(window=20).mean()
         volume_expanding = volume.iloc[-3:].mean() > avg_volume.iloc[-1] * 1.2
 
         # --- Generación de señales basadas en Order Flow ---
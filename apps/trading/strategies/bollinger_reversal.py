@@ -1,20 +1,36 @@
-import ta
-
 from apps.trading import choices
+from apps.trading.strategies import _params
 from apps.trading.strategies._base import TradingStrategy
 
 
 class BollingerReversalStrategy(TradingStrategy):
+    parameters = {
+        "window": _params.Parameter(20, 10, 50, 5),
+        "deviations": _params.Parameter(2.0, 1.0, 3.0, 0.25),
+    }
+
     def generate_signal(self):
-        bb = ta.volatility.BollingerBands(
-            self.df["close"], window=20, window_dev=2
+        bb = self.indicators.bollinger(
+            window=self.params["window"], window_dev=self.params["deviations"]
         )
-        self.df["bb_upper"] = bb.bollinger_hband()
-        self.df["bb_lower"] = bb.bollinger_lband()
+        self.scratch["bb_upper"] = bb.upper
+        self.scratch["bb_lower"] = bb.lower
         last_price = self.df["close"].iloc[-1]
 
-        if last_price < self.df["bb_lower"].iloc[-1]:
+        if last_price < self.scratch["bb_lower"].iloc[-1]:
             return self._build_signal(choices.OrderSide.BUY)
-        elif last_price > self.df["bb_upper"].iloc[-1]:
+        elif last_price > self.scratch["bb_upper"].iloc[-1]:
             return self._build_signal(choices.OrderSide.SELL)
         return self._build_signal(choices.OrderSide.HOLD)
+
+    def generate_signals(self, window):
+        bb = self.indicators.bollinger(
+            window=self.params["window"], window_dev=self.params["deviations"]
+        )
+        close = self.df["close"]
+        # Las bandas solo usan sus últimas velas: son las de la ventana en
+        # vivo si caben en ella, y si no en vivo quedan en NaN
+        fits = self.params["window"] <= window
+        return self._build_signals(
+            fits & (close < bb.lower), fits & (close > bb.upper)
+        )
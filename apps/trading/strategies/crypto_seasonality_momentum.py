@@ -1,5 +1,3 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -13,47 +11,27 @@ class CryptoSeasonalityMomentumStrategy(TradingStrategy):
 
     def generate_signal(self):
         # Indicadores de momentum
-        rsi = ta.momentum.RSIIndicator(self.df["close"], window=14).rsi()
+        rsi = self.indicators.rsi(14)
 
         # MACD para momentum
-        macd = ta.trend.MACD(self.df["close"])
-        macd_line = macd.macd()
-        signal_line = macd.macd_signal()
+        macd_line, signal_line, _ = self.indicators.macd()
 
         # Money Flow Index (MFI) - RSI con volumen
-        high = self.df["high"]
-        low = self.df["low"]
         close = self.df["close"]
-        volume = self.df["volume"]
-        typical_price = (high + low + close) / 3
-        raw_money_flow = typical_price * volume
-
-        positive_flow = raw_money_flow.where(
-            typical_price > typical_price.shift(1), 0
-        )
-        negative_flow = raw_money_flow.where(
-            typical_price < typical_price.shift(1), 0
-        )
-
-        positive_mf = positive_flow.rolling(14).sum()
-        negative_mf = negative_flow.rolling(14).sum()
-
-        mfi = 100 - (100 / (1 + positive_mf / negative_mf))
+        mfi = self.indicators.mfi(14)
 
         # Análisis de dominancia (útil para alt season)
         # Simulamos con volumen relativo y cambio de precio
         btc_correlation = self.df["close"].rolling(30).corr(self.df["volume"])
 
         # Detectar acumulación (antes de rallies estacionales)
-        obv = ta.volume.OnBalanceVolumeIndicator(
-            close, volume
-        ).on_balance_volume()
+        obv = self.indicators.obv()
         obv_ema = obv.ewm(span=21).mean()
         accumulation = obv > obv_ema
 
         # Análisis de volatilidad (típicamente baja antes de grandes movimientos)
-        bb = ta.volatility.BollingerBands(close, window=20, window_dev=2)
-        bb_width = bb.bollinger_hband() - bb.bollinger_lband()
+        bb = self.indicators.bollinger(window=20, window_dev=2)
+        bb_width = bb.upper - bb.lower
         bb_squeeze = bb_width < bb_width.rolling(50).mean() * 0.7
 
         # Condiciones actuales
@@ -1,5 +1,3 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -13,15 +11,10 @@ class DCAVWAPScalpingStrategy(TradingStrategy):
 
     def generate_signal(self):
         # Calcular VWAP (Volume Weighted Average Price)
-        typical_price = (
-            self.df["high"] + self.df["low"] + self.df["close"]
-        ) / 3
-        cumulative_tpv = (typical_price * self.df["volume"]).cumsum()
-        cumulative_volume = self.df["volume"].cumsum()
-        vwap = cumulative_tpv / cumulative_volume
+        vwap = self.indicators.session_vwap("1D").vwap
 
         # RSI para confirmar momentum
-        rsi = ta.momentum.RSIIndicator(self.df["close"], window=7).rsi()
+        rsi = self.indicators.rsi(7)
 
         # Calcular desviación del precio respecto a VWAP
         current_price = self.df["close"].iloc[-1]
@@ -35,7 +28,7 @@ class DCAVWAPScalpingStrategy(TradingStrategy):
             vwap_slope = 0
 
         # Calcular volumen relativo
-        avg_volume = self.df["volume"].rolling(window=20).mean()
+        avg_volume = self.indicators.sma(20, column="volume")
         relative_volume = self.df["volume"].iloc[-1] / avg_volume.iloc[-1]
 
         # Estrategia de scalping con múltiples condiciones
@@ -1,14 +1,49 @@
 from apps.trading import choices
+from apps.trading.strategies import _indicators, _params, _streaming
 from apps.trading.strategies._base import TradingStrategy
 
 
 class EMA921Strategy(TradingStrategy):
+    parameters = {
+        "fast": _params.Parameter(9, 3, 20, 1),
+        "slow": _params.Parameter(21, 10, 60, 1),
+    }
+
+    def create_streams(self) -> dict:
+        return {
+            "ema9": _streaming.EMA(self.params["fast"]),
+            "ema21": _streaming.EMA(self.params["slow"]),
+        }
+
     def generate_signal(self) -> str:
-        ema9 = self.df["close"].ewm(span=9).mean()
-        ema21 = self.df["close"].ewm(span=21).mean()
+        ema9 = self.indicators.ema(self.params["fast"])
+        ema21 = self.indicators.ema(self.params["slow"])
+        return self._signal(
+            (ema9.iloc[-2], ema21.iloc[-2]), (ema9.iloc[-1], ema21.iloc[-1])
+        )
+
+    def generate_signals(self, window):
+        close = self.df["close"]
+        fast, slow = self.params["fast"], self.params["slow"]
+        ema9 = _indicators.windowed_ema(close, fast, window)
+        ema21 = _indicators.windowed_ema(close, slow, window)
+        prev_ema9 = _indicators.windowed_ema(close, fast, window, lag=1)
+        prev_ema21 = _indicators.windowed_ema(close, slow, window, lag=1)
+        return self._build_signals(
+            (prev_ema9 < prev_ema21) & (ema9 > ema21),
+            (prev_ema9 > prev_ema21) & (ema9 < ema21),
+        )
+
+    def stream_signal(self) -> str:
+        ema9, ema21 = self.streams["ema9"], self.streams["ema21"]
+        return self._signal(
+            (ema9.previous, ema21.previous), (ema9.value, ema21.value)
+        )
 
-        if ema9.iloc[-2] < ema21.iloc[-2] and ema9.iloc[-1] > ema21.iloc[-1]:
-            self._build_signal(choices.OrderSide.BUY)
-        elif ema9.iloc[-2] > ema21.iloc[-2] and ema9.iloc[-1] < ema21.iloc[-1]:
+    def _signal(self, previous, current) -> str:
+        (prev_ema9, prev_ema21), (ema9, ema21) = previous, current
+        if prev_ema9 < prev_ema21 and ema9 > ema21:
+            return self._build_signal(choices.OrderSide.BUY)
+        elif prev_ema9 > prev_ema21 and ema9 < ema21:
             return self._build_signal(choices.OrderSide.SELL)
         return self._build_signal(choices.OrderSide.HOLD)
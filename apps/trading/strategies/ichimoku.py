@@ -15,23 +15,24 @@ class IchimokuStrategy(TradingStrategy):
             window3=52,  # Chikou-span (línea de retraso)
         )
 
-        self.df["tenkan_sen"] = ichimoku.ichimoku_conversion_line()
-        self.df["kijun_sen"] = ichimoku.ichimoku_base_line()
-        self.df["senkou_span_a"] = ichimoku.ichimoku_a()
-        self.df["senkou_span_b"] = ichimoku.ichimoku_b()
+        self.scratch["tenkan_sen"] = ichimoku.ichimoku_conversion_line()
+        self.scratch["kijun_sen"] = ichimoku.ichimoku_base_line()
+        self.scratch["senkou_span_a"] = ichimoku.ichimoku_a()
+        self.scratch["senkou_span_b"] = ichimoku.ichimoku_b()
 
         price = self.df["close"].iloc[-1]
-        tenkan = self.df["tenkan_sen"].iloc[-1]
-        kijun = self.df["kijun_sen"].iloc[-1]
-        span_a = self.df["senkou_span_a"].iloc[-1]
-        span_b = self.df["senkou_span_b"].iloc[-1]
+        tenkan = self.scratch["tenkan_sen"].iloc[-1]
+        kijun = self.scratch["kijun_sen"].iloc[-1]
+        span_a = self.scratch["senkou_span_a"].iloc[-1]
+        span_b = self.scratch["senkou_span_b"].iloc[-1]
 
         # Condiciones de compra
         if (
             tenkan > kijun
             and price > span_a
             and price > span_b
-            and self.df["tenkan_sen"].iloc[-2] <= self.df["kijun_sen"].iloc[-2]
+            and self.scratch["tenkan_sen"].iloc[-2]
+            <= self.scratch["kijun_sen"].iloc[-2]
         ):
             return self._build_signal(choices.OrderSide.BUY)
 
@@ -40,7 +41,8 @@ class IchimokuStrategy(TradingStrategy):
             tenkan < kijun
             and price < span_a
             and price < span_b
-            and self.df["tenkan_sen"].iloc[-2] >= self.df["kijun_sen"].iloc[-2]
+            and self.scratch["tenkan_sen"].iloc[-2]
+            >= self.scratch["kijun_sen"].iloc[-2]
         ):
             return self._build_signal(choices.OrderSide.SELL)
 
@@ -1,6 +1,5 @@
-import ta
-
 from apps.trading import choices
+from apps.trading.strategies import _swings
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -26,38 +25,24 @@ class LiquidityHunterStrategy(TradingStrategy):
         # --- Identificación de niveles de liquidez ---
 
         # 1. Detectar swings (puntos de giro)
-        # Usando una ventana móvil para identificar picos y valles locales
-        swing_highs = []
-        swing_lows = []
-
-        for i in range(3, len(self.df) - 3):
-            # Swing high: cuando una vela tiene máximo mayor que las 3 velas antes y después
-            if high_prices.iloc[i] == high_prices.iloc[i - 3 : i + 4].max():
-                swing_highs.append(
-                    {
-                        "index": i,
-                        "price": high_prices.iloc[i],
-                        "volume": volumes.iloc[i],
-                    }
-                )
+        # Máximo/mínimo de las 3 velas antes y después
+        swing_highs = _swings.swings(
+            high_prices, 3, kind="high", volume=volumes
+        )
+        swing_lows = _swings.swings(low_prices, 3, kind="low", volume=volumes)
 
-            # Swing low: cuando una vela tiene mínimo menor que las 3 velas antes y después
-            if low_prices.iloc[i] == low_prices.iloc[i - 3 : i + 4].min():
-                swing_lows.append(
-                    {
-                        "index": i,
-                        "price": low_prices.iloc[i],
-                        "volume": volumes.iloc[i],
-                    }
+        # Filtrar solo los swings recientes (últimas window velas)
+        def recent_swings(swings):
+            return [
+                {"index": index, "price": price, "volume": volume}
+                for index, price, volume in zip(
+                    swings.index, swings.price, swings.volume
                 )
+                if index >= len(self.df) - window
+            ]
 
-        # Filtrar solo los swings recientes (últimas window velas)
-        recent_highs = [
-            h for h in swing_highs if h["index"] >= len(self.df) - window
-        ]
-        recent_lows = [
-            l for l in swing_lows if l["index"] >= len(self.df) - window
-        ]
+        recent_highs = recent_swings(swing_highs)
+        recent_lows = recent_swings(swing_lows)
 
         # 2. Identificar zonas de liquidez (clusters de swing points)
         def group_levels(levels, threshold=0.003):
@@ -128,9 +113,7 @@ class LiquidityHunterStrategy(TradingStrategy):
         )
 
         # 3. ATR y volatilidad para determinar penetración de niveles
-        atr = ta.volatility.AverageTrueRange(
-            high=high_prices, low=low_prices, close=close_prices, window=14
-        ).average_true_range()
+        atr = self.indicators.atr(14)
 
         current_atr = atr.iloc[-1]
 
@@ -216,20 +199,11 @@ class LiquidityHunterStrategy(TradingStrategy):
         )
 
         # 2. VWAP como referencia institucional
-        typical_price = (high_prices + low_prices + close_prices) / 3
-        vwap = (typical_price * volumes).cumsum() / volumes.cumsum()
+        vwap = self.indicators.session_vwap("1D").vwap
 
         # 3. Order Flow - Indicador de fuerza
-        buy_pressure = (
-            (close_prices - low_prices) / (high_prices - low_prices + 0.000001)
-        ) * volumes
-        sell_pressure = (
-            (high_prices - close_prices) / (high_prices - low_prices + 0.000001)
-        ) * volumes
-
-        # Cumulative Delta
-        delta = buy_pressure - sell_pressure
-        cumulative_delta = delta.rolling(10).sum()
+        # Cumulative Delta (presión compradora - vendedora)
+        cumulative_delta = self.indicators.cumulative_delta(10)
 
         # --- Generación de señales ---
 
@@ -1,5 +1,3 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -7,10 +5,10 @@ from apps.trading.strategies._base import TradingStrategy
 class MACDDivergenceStrategy(TradingStrategy):
     def generate_signal(self):
         # Calcular MACD
-        macd = ta.trend.MACD(self.df["close"])
-        self.df["macd"] = macd.macd()
-        self.df["macd_signal"] = macd.macd_signal()
-        self.df["macd_diff"] = macd.macd_diff()
+        macd, macd_signal, macd_diff = self.indicators.macd()
+        self.scratch["macd"] = macd
+        self.scratch["macd_signal"] = macd_signal
+        self.scratch["macd_diff"] = macd_diff
 
         # Buscar divergencias (últimas 14 velas)
         look_back = 14
@@ -20,7 +18,8 @@ class MACDDivergenceStrategy(TradingStrategy):
             self.df["close"].iloc[-1] < self.df["close"].iloc[-look_back:].min()
         )
         macd_higher_low = (
-            self.df["macd"].iloc[-1] > self.df["macd"].iloc[-look_back:].min()
+            self.scratch["macd"].iloc[-1]
+            > self.scratch["macd"].iloc[-look_back:].min()
         )
 
         # Divergencia bajista: precio hace máximos más altos pero MACD hace máximos más bajos
@@ -28,7 +27,8 @@ class MACDDivergenceStrategy(TradingStrategy):
             self.df["close"].iloc[-1] > self.df["close"].iloc[-look_back:].max()
         )
         macd_lower_high = (
-            self.df["macd"].iloc[-1] < self.df["macd"].iloc[-look_back:].max()
+            self.scratch["macd"].iloc[-1]
+            < self.scratch["macd"].iloc[-look_back:].max()
         )
 
         # Señales basadas en divergencias
@@ -1,6 +1,7 @@
 import numpy as np
 
 from apps.trading import choices
+from apps.trading.strategies import _profile
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -23,57 +24,24 @@ class MarketProfileVAStrategy(TradingStrategy):
         num_levels = 30
         price_levels = np.linspace(price_min, price_max, num_levels)
 
-        # Calcular tiempo en cada nivel (TPO)
-        tpo_profile = np.zeros(num_levels - 1)
+        # Calcular tiempo en cada nivel (TPO): velas que tocan cada nivel
+        tpo_profile = _profile.tpo_profile(
+            self.df["low"].iloc[-window:],
+            self.df["high"].iloc[-window:],
+            price_levels,
+        )
 
-        for i in range(len(self.df) - window, len(self.df)):
-            high = self.df["high"].iloc[i]
-            low = self.df["low"].iloc[i]
-
-            # Encontrar qué niveles toca esta vela
-            for j in range(num_levels - 1):
-                if low <= price_levels[j + 1] and high >= price_levels[j]:
-                    tpo_profile[j] += 1
-
-        # Calcular Value Area (70% del volumen)
-        total_tpo = np.sum(tpo_profile)
-        target_tpo = total_tpo * 0.7
-
-        # Encontrar POC (Point of Control)
-        poc_index = np.argmax(tpo_profile)
+        # POC (Point of Control) y Value Area (70% del TPO)
+        value_area = _profile.value_area(tpo_profile, 0.7)
+        poc_index = value_area.poc
         poc_price = (price_levels[poc_index] + price_levels[poc_index + 1]) / 2
 
-        # Expandir desde POC para encontrar Value Area
-        va_indices = [poc_index]
-        current_tpo = tpo_profile[poc_index]
-
-        while current_tpo < target_tpo:
-            # Buscar siguiente nivel con más TPO
-            left_idx = va_indices[0] - 1 if va_indices[0] > 0 else -1
-            right_idx = (
-                va_indices[-1] + 1
-                if va_indices[-1] < len(tpo_profile) - 1
-                else -1
-            )
-
-            left_tpo = tpo_profile[left_idx] if left_idx >= 0 else 0
-            right_tpo = tpo_profile[right_idx] if right_idx >= 0 else 0
-
-            if left_tpo >= right_tpo and left_idx >= 0:
-                va_indices.insert(0, left_idx)
-                current_tpo += left_tpo
-            elif right_idx >= 0:
-                va_indices.append(right_idx)
-                current_tpo += right_tpo
-            else:
-                break
-
         # Definir Value Area High (VAH) y Value Area Low (VAL)
         val_price = (
-            price_levels[va_indices[0]] + price_levels[va_indices[0] + 1]
+            price_levels[value_area.low] + price_levels[value_area.low + 1]
         ) / 2
         vah_price = (
-            price_levels[va_indices[-1]] + price_levels[va_indices[-1] + 1]
+            price_levels[value_area.high] + price_levels[value_area.high + 1]
         ) / 2
 
         # Precio actual y dirección
@@ -81,9 +49,7 @@ class MarketProfileVAStrategy(TradingStrategy):
         prev_price = self.df["close"].iloc[-2]
 
         # VWAP para confirmar dirección
-        typical_price = (
-            self.df["high"] + self.df["low"] + self.df["close"]
-        ) / 3
+        typical_price = self.indicators.typical_price()
         vwap = (typical_price * self.df["volume"]).sum() / self.df[
             "volume"
         ].sum()
@@ -109,7 +75,7 @@ class MarketProfileVAStrategy(TradingStrategy):
             return self._build_signal(choices.OrderSide.SELL)
 
         # 3. Breakout del Value Area con volumen
-        avg_volume = self.df["volume"].rolling(window=20).mean()
+        avg_volume = self.indicators.sma(20, column="volume")
         high_volume = self.df["volume"].iloc[-1] > avg_volume.iloc[-1] * 1.5
 
         if prev_price < vah_price and current_price > vah_price and high_volume:
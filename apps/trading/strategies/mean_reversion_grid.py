@@ -11,7 +11,7 @@ class MeanReversionGridStrategy(TradingStrategy):
 
     def generate_signal(self):
         # Calcular media móvil simple de 50 períodos
-        sma50 = self.df["close"].rolling(window=50).mean()
+        sma50 = self.indicators.sma(50)
 
         # Calcular desviación estándar para determinar la volatilidad
         std_dev = self.df["close"].rolling(window=20).std()
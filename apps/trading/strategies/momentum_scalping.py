@@ -1,5 +1,3 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -17,19 +15,17 @@ class MomentumScalpingStrategy(TradingStrategy):
         volume_lookback = 12  # 3 horas de datos
 
         # Calcular RSI
-        rsi = ta.momentum.RSIIndicator(
-            self.df["close"], window=rsi_period
-        ).rsi()
+        rsi = self.indicators.rsi(rsi_period)
 
         # Calcular cambio de precio (aceleración)
-        self.df["price_change"] = self.df["close"].pct_change(periods=3)
+        self.scratch["price_change"] = self.df["close"].pct_change(periods=3)
 
         # Calcular media móvil exponencial corta para la tendencia inmediata
-        ema5 = self.df["close"].ewm(span=5).mean()
-        ema13 = self.df["close"].ewm(span=13).mean()
+        ema5 = self.indicators.ema(5)
+        ema13 = self.indicators.ema(13)
 
         # Análisis de volumen
-        avg_volume = self.df["volume"].rolling(window=volume_lookback).mean()
+        avg_volume = self.indicators.sma(volume_lookback, column="volume")
         volume_surge = self.df["volume"] > (
             avg_volume * 1.4
         )  # 40% sobre promedio
@@ -56,7 +52,7 @@ class MomentumScalpingStrategy(TradingStrategy):
         # Señales potentes de compra con momentum adicional
         strong_buy_conditions = (
             (
-                self.df["price_change"].iloc[-1] > 0.005
+                self.scratch["price_change"].iloc[-1] > 0.005
             )  # Movimiento alcista > 0.5%
             & (current_rsi > 45)  # Momento positivo
             & (current_rsi < 65)  # No extremadamente sobrecomprado
@@ -78,7 +74,7 @@ class MomentumScalpingStrategy(TradingStrategy):
         # Señales potentes de venta con momentum adicional
         strong_sell_conditions = (
             (
-                self.df["price_change"].iloc[-1] < -0.005
+                self.scratch["price_change"].iloc[-1] < -0.005
             )  # Movimiento bajista > 0.5%
             & (current_rsi < 55)  # Momento negativo
             & (current_rsi > 35)  # No extremadamente sobrevendido
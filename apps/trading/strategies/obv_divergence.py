@@ -1,5 +1,3 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -13,16 +11,13 @@ class OBVDivergenceStrategy(TradingStrategy):
 
     def generate_signal(self):
         # Calcular OBV
-        obv_indicator = ta.volume.OnBalanceVolumeIndicator(
-            self.df["close"], self.df["volume"]
-        )
-        obv = obv_indicator.on_balance_volume()
+        obv = self.indicators.obv()
 
         # Suavizar OBV con EMA
         obv_ema = obv.ewm(span=10).mean()
 
         # Calcular EMA del precio para tendencia
-        price_ema = self.df["close"].ewm(span=20).mean()
+        price_ema = self.indicators.ema(20)
 
         # Buscar divergencias en ventana de 20 períodos
         window = 20
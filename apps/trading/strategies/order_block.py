@@ -1,3 +1,5 @@
+import numpy as np
+
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -21,7 +23,7 @@ class OrderBlockStrategy(TradingStrategy):
         impulse_threshold = 0.02  # 2% de movimiento
         volume_threshold = 1.5  # 50% más volumen que el promedio
 
-        avg_volume = self.df["volume"].rolling(window=20).mean()
+        avg_volume = self.indicators.sma(20, column="volume")
 
         # Marcar velas impulsivas
         bullish_impulse = (price_change > impulse_threshold) & (
@@ -33,62 +35,11 @@ class OrderBlockStrategy(TradingStrategy):
         )
 
         # Identificar Order Blocks (última vela antes del impulso)
-        order_blocks = []
-        for i in range(1, len(self.df)):
-            if bullish_impulse.iloc[i] and i > 0:
-                # OB alcista: última vela bajista antes del impulso
-                if self.df["close"].iloc[i - 1] < self.df["open"].iloc[i - 1]:
-                    order_blocks.append(
-                        {
-                            "type": "bullish",
-                            "high": self.df["high"].iloc[i - 1],
-                            "low": self.df["low"].iloc[i - 1],
-                            "index": i - 1,
-                            "strength": price_change.iloc[i],
-                        }
-                    )
-
-            elif bearish_impulse.iloc[i] and i > 0:
-                # OB bajista: última vela alcista antes del impulso
-                if self.df["close"].iloc[i - 1] > self.df["open"].iloc[i - 1]:
-                    order_blocks.append(
-                        {
-                            "type": "bearish",
-                            "high": self.df["high"].iloc[i - 1],
-                            "low": self.df["low"].iloc[i - 1],
-                            "index": i - 1,
-                            "strength": abs(price_change.iloc[i]),
-                        }
-                    )
-
-        # Filtrar Order Blocks válidos (no tocados)
+        # y filtrar los válidos (no atravesados por un cierre posterior)
         current_price = self.df["close"].iloc[-1]
-        valid_bullish_ob = []
-        valid_bearish_ob = []
-
-        for ob in order_blocks:
-            # Verificar si el OB ha sido respetado (no completamente atravesado)
-            if ob["type"] == "bullish":
-                # Verificar si el precio no ha cerrado por debajo del OB
-                violated = False
-                for j in range(ob["index"] + 1, len(self.df)):
-                    if self.df["close"].iloc[j] < ob["low"]:
-                        violated = True
-                        break
-
-                if not violated and current_price > ob["low"]:
-                    valid_bullish_ob.append(ob)
-
-            else:  # bearish
-                # Verificar si el precio no ha cerrado por encima del OB
-                violated = False
-                for j in range(ob["index"] + 1, len(self.df)):
-                    if self.df["close"].iloc[j] > ob["high"]:
-                        violated = True
-                        break
-
-                if not violated and current_price < ob["high"]:
-                    valid_bearish_ob.append(ob)
+        valid_bullish_ob, valid_bearish_ob = self._valid_order_blocks(
+            price_change, bullish_impulse, bearish_impulse, current_price
+        )
 
         # Generar señales basadas en interacción con Order Blocks
         for ob in valid_bullish_ob[-3:]:  # Últimos 3 OB alcistas
@@ -137,3 +88,56 @@ class OrderBlockStrategy(TradingStrategy):
                 return self._build_signal(choices.OrderSide.SELL)
 
         return self._build_signal(choices.OrderSide.HOLD)
+
+    def _valid_order_blocks(
+        self, price_change, bullish_impulse, bearish_impulse, current_price
+    ):
+        """
+        Detecta los Order Blocks y descarta los atravesados en O(n).
+        Un OB alcista es válido si ningún cierre posterior queda por debajo
+        de su mínimo, es decir, si el mínimo de los cierres siguientes
+        (sufijo) no lo rompe; análogo con el máximo para los bajistas.
+        """
+        open_ = self.df["open"].to_numpy(dtype=float)
+        high = self.df["high"].to_numpy(dtype=float)
+        low = self.df["low"].to_numpy(dtype=float)
+        close = self.df["close"].to_numpy(dtype=float)
+        change = price_change.to_numpy(dtype=float)
+
+        # Mínimo/máximo de los cierres desde cada vela hasta el final
+        # (fmin/fmax ignoran los NaN, como las comparaciones escalares)
+        suffix_min = np.fmin.accumulate(close[::-1])[::-1]
+        suffix_max = np.fmax.accumulate(close[::-1])[::-1]
+
+        # El OB es la vela anterior al impulso (i - 1)
+        impulse = np.arange(1, len(close))
+        block = impulse - 1
+        bullish = (
+            bullish_impulse.to_numpy(dtype=bool)[impulse]
+            & (close[block] < open_[block])
+            & ~(suffix_min[impulse] < low[block])
+            & (current_price > low[block])
+        )
+        bearish = (
+            bearish_impulse.to_numpy(dtype=bool)[impulse]
+            & (close[block] > open_[block])
+            & ~(suffix_max[impulse] > high[block])
+            & (current_price < high[block])
+        )
+
+        def blocks(kind, mask, strength):
+            return [
+                {
+                    "type": kind,
+                    "high": high[i - 1],
+                    "low": low[i - 1],
+                    "index": i - 1,
+                    "strength": strength[i],
+                }
+                for i in impulse[mask]
+            ]
+
+        return (
+            blocks("bullish", bullish, change),
+            blocks("bearish", bearish, np.abs(change)),
+        )
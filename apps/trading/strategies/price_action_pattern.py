@@ -1,5 +1,4 @@
 import numpy as np
-import ta
 
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
@@ -31,13 +30,11 @@ class PriceActionPatternStrategy(TradingStrategy):
         lower_wicks = np.minimum(close_prices, open_prices) - low_prices
 
         # ATR para normalizar los patrones
-        atr = ta.volatility.AverageTrueRange(
-            high_prices, low_prices, close_prices, window=14
-        ).average_true_range()
+        atr = self.indicators.atr(14)
 
         # Tendencia reciente (útil para contextualizar patrones)
-        ema8 = close_prices.ewm(span=8).mean()
-        ema21 = close_prices.ewm(span=21).mean()
+        ema8 = self.indicators.ema(8)
+        ema21 = self.indicators.ema(21)
         uptrend = ema8 > ema21
 
         # Función para identificar velas alcistas/bajistas
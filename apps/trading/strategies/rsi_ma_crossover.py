@@ -1,27 +1,51 @@
-import ta
-
 from apps.trading import choices
+from apps.trading.strategies import _indicators, _streaming
 from apps.trading.strategies._base import TradingStrategy
 
 
 class RSIMACrossoverStrategy(TradingStrategy):
+    def create_streams(self) -> dict:
+        return {
+            "rsi": _streaming.RSI(14),
+            "ema_short": _streaming.EMA(9),
+            "ema_long": _streaming.EMA(21),
+        }
+
     def generate_signal(self) -> str:
-        self.df["rsi"] = ta.momentum.RSIIndicator(
-            self.df["close"], window=14
-        ).rsi()
-        ema_short = self.df["close"].ewm(span=9).mean()
-        ema_long = self.df["close"].ewm(span=21).mean()
+        self.scratch["rsi"] = self.indicators.rsi(14)
+        ema_short = self.indicators.ema(9)
+        ema_long = self.indicators.ema(21)
+        return self._signal(
+            self.scratch["rsi"].iloc[-1],
+            (ema_short.iloc[-2], ema_long.iloc[-2]),
+            (ema_short.iloc[-1], ema_long.iloc[-1]),
+        )
+
+    def generate_signals(self, window):
+        close = self.df["close"]
+        rsi = _indicators.windowed_rsi(close, 14, window)
+        ema_short = _indicators.windowed_ema(close, 9, window)
+        ema_long = _indicators.windowed_ema(close, 21, window)
+        prev_short = _indicators.windowed_ema(close, 9, window, lag=1)
+        prev_long = _indicators.windowed_ema(close, 21, window, lag=1)
+        return self._build_signals(
+            (rsi < 30) & (prev_short < prev_long) & (ema_short > ema_long),
+            (rsi > 70) & (prev_short > prev_long) & (ema_short < ema_long),
+        )
+
+    def stream_signal(self) -> str:
+        ema_short = self.streams["ema_short"]
+        ema_long = self.streams["ema_long"]
+        return self._signal(
+            self.streams["rsi"].value,
+            (ema_short.previous, ema_long.previous),
+            (ema_short.value, ema_long.value),
+        )
 
-        if (
-            self.df["rsi"].iloc[-1] < 30
-            and ema_short.iloc[-2] < ema_long.iloc[-2]
-            and ema_short.iloc[-1] > ema_long.iloc[-1]
-        ):
+    def _signal(self, rsi, previous, current) -> str:
+        (prev_short, prev_long), (ema_short, ema_long) = previous, current
+        if rsi < 30 and prev_short < prev_long and ema_short > ema_long:
             return self._build_signal(choices.OrderSide.BUY)
-        elif (
-            self.df["rsi"].iloc[-1] > 70
-            and ema_short.iloc[-2] > ema_long.iloc[-2]
-            and ema_short.iloc[-1] < ema_long.iloc[-1]
-        ):
+        elif rsi > 70 and prev_short > prev_long and ema_short < ema_long:
             return self._build_signal(choices.OrderSide.SELL)
         return self._build_signal(choices.OrderSide.HOLD)
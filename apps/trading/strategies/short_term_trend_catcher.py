@@ -1,7 +1,5 @@
-import numpy as np
-import ta
-
 from apps.trading import choices
+from apps.trading.strategies import _indicators
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -28,11 +26,11 @@ class ShortTermTrendCatcherStrategy(TradingStrategy):
         # --- Indicadores para detección de tendencias ---
 
         # 1. EMAs múltiples para confirmar tendencia
-        ema5 = close_prices.ewm(span=5).mean()
-        ema8 = close_prices.ewm(span=8).mean()
-        ema13 = close_prices.ewm(span=13).mean()
-        ema21 = close_prices.ewm(span=21).mean()
-        ema34 = close_prices.ewm(span=34).mean()
+        ema5 = self.indicators.ema(5)
+        ema8 = self.indicators.ema(8)
+        ema13 = self.indicators.ema(13)
+        ema21 = self.indicators.ema(21)
+        ema34 = self.indicators.ema(34)
 
         # 2. Hull Moving Average para identificar cambios de tendencia antes
         # Versión simplificada de HMA
@@ -64,9 +62,7 @@ class ShortTermTrendCatcherStrategy(TradingStrategy):
         tsi = 100 * (double_ema_momentum / double_ema_abs_momentum)
 
         # 4. Filtro de ATR para volatilidad
-        atr = ta.volatility.AverageTrueRange(
-            high=high_prices, low=low_prices, close=close_prices, window=14
-        ).average_true_range()
+        atr = self.indicators.atr(14)
 
         # Ratio de ATR actual vs promedio para detectar expansión de volatilidad
         atr_ratio = atr / atr.rolling(window=30).mean()
@@ -77,70 +73,12 @@ class ShortTermTrendCatcherStrategy(TradingStrategy):
         atr_period = 10
 
         # Calcular ATR para Supertrend
-        st_atr = ta.volatility.AverageTrueRange(
-            high=high_prices,
-            low=low_prices,
-            close=close_prices,
-            window=atr_period,
-        ).average_true_range()
-
-        # Calcular bandas
-        basic_upperband = ((high_prices + low_prices) / 2) + (factor * st_atr)
-        basic_lowerband = ((high_prices + low_prices) / 2) - (factor * st_atr)
-
-        # Inicializar arrays para Supertrend
-        final_upperband = np.zeros(len(close_prices))
-        final_lowerband = np.zeros(len(close_prices))
-        supertrend = np.zeros(len(close_prices))
-        trend = np.zeros(len(close_prices))
-
-        # Calcular Supertrend
-        for i in range(1, len(close_prices)):
-            # Upperband
-            if (
-                basic_upperband.iloc[i] < final_upperband[i - 1]
-                or close_prices.iloc[i - 1] > final_upperband[i - 1]
-            ):
-                final_upperband[i] = basic_upperband.iloc[i]
-            else:
-                final_upperband[i] = final_upperband[i - 1]
-
-            # Lowerband
-            if (
-                basic_lowerband.iloc[i] > final_lowerband[i - 1]
-                or close_prices.iloc[i - 1] < final_lowerband[i - 1]
-            ):
-                final_lowerband[i] = basic_lowerband.iloc[i]
-            else:
-                final_lowerband[i] = final_lowerband[i - 1]
-
-            # Supertrend
-            if (
-                supertrend[i - 1] == final_upperband[i - 1]
-                and close_prices.iloc[i] <= final_upperband[i]
-            ):
-                supertrend[i] = final_upperband[i]
-            elif (
-                supertrend[i - 1] == final_upperband[i - 1]
-                and close_prices.iloc[i] > final_upperband[i]
-            ):
-                supertrend[i] = final_lowerband[i]
-            elif (
-                supertrend[i - 1] == final_lowerband[i - 1]
-                and close_prices.iloc[i] >= final_lowerband[i]
-            ):
-                supertrend[i] = final_lowerband[i]
-            elif (
-                supertrend[i - 1] == final_lowerband[i - 1]
-                and close_prices.iloc[i] < final_lowerband[i]
-            ):
-                supertrend[i] = final_upperband[i]
-
-            # Tendencia (1 para bullish, -1 para bearish)
-            if supertrend[i] <= close_prices.iloc[i]:
-                trend[i] = 1
-            else:
-                trend[i] = -1
+        st_atr = self.indicators.atr(atr_period)
+
+        # Calcular Supertrend (1 para bullish, -1 para bearish)
+        trend = _indicators.supertrend(
+            high_prices, low_prices, close_prices, st_atr, factor
+        ).direction
 
         # --- Análisis del contexto de mercado ---
 
@@ -1,4 +1,5 @@
 from apps.trading import choices
+from apps.trading.strategies import _swings
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -17,34 +18,22 @@ class SmartMoneyConceptStrategy(TradingStrategy):
         highs = self.df["high"].rolling(window=5).max()
         lows = self.df["low"].rolling(window=5).min()
 
-        # Identificar swing points
-        swing_highs = []
-        swing_lows = []
-
-        for i in range(5, len(self.df) - 5):
-            # Swing high: máximo local
-            if (
-                self.df["high"].iloc[i]
-                == self.df["high"].iloc[i - 5 : i + 5].max()
-            ):
-                swing_highs.append(
-                    {"index": i, "price": self.df["high"].iloc[i]}
-                )
-
-            # Swing low: mínimo local
-            if (
-                self.df["low"].iloc[i]
-                == self.df["low"].iloc[i - 5 : i + 5].min()
-            ):
-                swing_lows.append({"index": i, "price": self.df["low"].iloc[i]})
+        # Identificar swing points (precios de máximos y mínimos locales
+        # en la ventana de 5 velas antes y 4 después)
+        swing_highs = _swings.swings(
+            self.df["high"], 5, right=4, tail=5, kind="high"
+        ).price.tolist()
+        swing_lows = _swings.swings(
+            self.df["low"], 5, right=4, tail=5, kind="low"
+        ).price.tolist()
 
         # Determinar tendencia basada en estructura
         trend = "neutral"
         if len(swing_highs) >= 2 and len(swing_lows) >= 2:
-            last_high = swing_highs[-1]["price"]
-            prev_high = swing_highs[-2]["price"]
-            last_low = swing_lows[-1]["price"]
-            prev_low = swing_lows[-2]["price"]
+            last_high = swing_highs[-1]
+            prev_high = swing_highs[-2]
+            last_low = swing_lows[-1]
+            prev_low = swing_lows[-2]
 
             if last_high > prev_high and last_low > prev_low:
                 trend = "bullish"
@@ -61,20 +50,18 @@ class SmartMoneyConceptStrategy(TradingStrategy):
 
         if swing_highs and swing_lows:
             # BOS alcista: rompe último swing high en tendencia alcista
-            if trend == "bullish" and current_price > swing_highs[-1]["price"]:
+            if trend == "bullish" and current_price > swing_highs[-1]:
                 bos_bullish = True
 
             # BOS bajista: rompe último swing low en tendencia bajista
-            if trend == "bearish" and current_price < swing_lows[-1]["price"]:
+            if trend == "bearish" and current_price < swing_lows[-1]:
                 bos_bearish = True
 
             # ChoCH: cambio de carácter (de alcista a bajista o viceversa)
-            if trend == "bullish" and current_price < swing_lows[-1]["price"]:
+            if trend == "bullish" and current_price < swing_lows[-1]:
                 choch = True
                 trend = "bearish"
-            elif (
-                trend == "bearish" and current_price > swing_highs[-1]["price"]
-            ):
+            elif trend == "bearish" and current_price > swing_highs[-1]:
                 choch = True
                 trend = "bullish"
 
@@ -144,16 +131,16 @@ class SmartMoneyConceptStrategy(TradingStrategy):
         # 2. BOS con retracción a zona de demanda/oferta
         if bos_bullish:
             # Buscar retracción a zona de demanda (último swing low)
-            if swing_lows and current_price <= swing_lows[-1]["price"] * 1.01:
+            if swing_lows and current_price <= swing_lows[-1] * 1.01:
                 return self._build_signal(choices.OrderSide.BUY)
 
         if bos_bearish:
             # Buscar retracción a zona de oferta (último swing high)
-            if swing_highs and current_price >= swing_highs[-1]["price"] * 0.99:
+            if swing_highs and current_price >= swing_highs[-1] * 0.99:
                 return self._build_signal(choices.OrderSide.SELL)
 
         # 3. ChoCH con confirmación de volumen
-        avg_volume = self.df["volume"].rolling(window=20).mean()
+        avg_volume = self.indicators.sma(20, column="volume")
         if choch and self.df["volume"].iloc[-1] > avg_volume.iloc[-1] * 1.5:
             if trend == "bullish":
                 return self._build_signal(choices.OrderSide.BUY)
@@ -1,6 +1,7 @@
-import ta
+import numpy as np
 
 from apps.trading import choices
+from apps.trading.strategies import _indicators
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -13,18 +14,14 @@ class SqueezeMomentumStrategy(TradingStrategy):
 
     def generate_signal(self):
         # Calcular Bollinger Bands
-        bb = ta.volatility.BollingerBands(
-            self.df["close"], window=20, window_dev=2
-        )
-        bb_upper = bb.bollinger_hband()
-        bb_lower = bb.bollinger_lband()
+        bb = self.indicators.bollinger(window=20, window_dev=2)
+        bb_upper = bb.upper
+        bb_lower = bb.lower
         bb_width = bb_upper - bb_lower
 
         # Calcular Keltner Channels
-        atr = ta.volatility.AverageTrueRange(
-            self.df["high"], self.df["low"], self.df["close"], window=20
-        ).average_true_range()
-        ema20 = self.df["close"].ewm(span=20).mean()
+        atr = self.indicators.atr(20)
+        ema20 = self.indicators.ema(20)
         kc_upper = ema20 + (1.5 * atr)
         kc_lower = ema20 - (1.5 * atr)
 
@@ -32,26 +29,11 @@ class SqueezeMomentumStrategy(TradingStrategy):
         squeeze_on = (bb_upper < kc_upper) & (bb_lower > kc_lower)
 
         # Momentum usando Linear Regression
+        # (pendiente de las `window` velas anteriores a cada vela)
         window = 20
-        momentum = []
-
-        for i in range(window, len(self.df)):
-            # Calcular regresión lineal en ventana móvil
-            x = list(range(window))
-            y = self.df["close"].iloc[i - window : i].values
-
-            # Cálculo manual de pendiente
-            n = len(x)
-            sum_x = sum(x)
-            sum_y = sum(y)
-            sum_xy = sum(x[j] * y[j] for j in range(n))
-            sum_x2 = sum(x[j] ** 2 for j in range(n))
-
-            slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x**2)
-            momentum.append(slope)
-
-        # Agregar valores iniciales para mantener longitud
-        momentum = [0] * window + momentum
+        slope = _indicators.rolling_linreg(self.df["close"], window).slope
+        momentum = np.zeros(len(self.df))
+        momentum[window:] = slope[window - 1 : -1]
 
         # Condiciones de trading
         if len(squeeze_on) >= 3:
@@ -1,8 +1,8 @@
 import numpy as np
 import pandas as pd
-import ta
 
 from apps.trading import choices
+from apps.trading.strategies import _params, _swings
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -13,6 +13,12 @@ class SupportResistanceZoneStrategy(TradingStrategy):
     Efectiva para operaciones swing en crypto y trading intradía.
     """
 
+    # Velas a cada lado de un fractal (corto y medio plazo)
+    parameters = {
+        "fractal_short": _params.Parameter(2, 1, 5, 1),
+        "fractal_mid": _params.Parameter(4, 2, 8, 1),
+    }
+
     def generate_signal(self):
         # Datos de precio
         open_prices = self.df["open"]
@@ -34,25 +40,21 @@ class SupportResistanceZoneStrategy(TradingStrategy):
             Encuentra fractals (swing highs y swing lows) en los datos de precio.
             Para n=2, examina 2 velas antes y después del punto.
             """
-            bearish_fractals = np.zeros(len(high))
-            bullish_fractals = np.zeros(len(low))
-
-            for i in range(n, len(high) - n):
-                # Bearish fractal (swing high)
-                if high.iloc[i] == high.iloc[i - n : i + n + 1].max():
-                    bearish_fractals[i] = 1
+            # Bearish fractal (swing high) y bullish fractal (swing low)
+            bearish_fractals = _swings.swing_mask(high, n, kind="high")
+            bullish_fractals = _swings.swing_mask(low, n, kind="low")
 
-                # Bullish fractal (swing low)
-                if low.iloc[i] == low.iloc[i - n : i + n + 1].min():
-                    bullish_fractals[i] = 1
-
-            return pd.Series(bearish_fractals, index=high.index), pd.Series(
-                bullish_fractals, index=low.index
-            )
+            return pd.Series(
+                bearish_fractals.astype(float), index=high.index
+            ), pd.Series(bullish_fractals.astype(float), index=low.index)
 
         # Detectar fractals con diferentes configuraciones para multi-timeframe
-        bf_short, bl_short = find_fractals(high_prices, low_prices, n=2)
-        bf_mid, bl_mid = find_fractals(high_prices, low_prices, n=4)
+        bf_short, bl_short = find_fractals(
+            high_prices, low_prices, n=self.params["fractal_short"]
+        )
+        bf_mid, bl_mid = find_fractals(
+            high_prices, low_prices, n=self.params["fractal_mid"]
+        )
 
         # 2. Identificar zonas de precio con fractals agrupados
         def identify_zones(fractals, prices, window=0.005):
@@ -244,20 +246,14 @@ class SupportResistanceZoneStrategy(TradingStrategy):
         # --- Confirmación con indicadores adicionales ---
 
         # 1. RSI para sobrecompra/sobreventa
-        rsi = ta.momentum.RSIIndicator(close=close_prices, window=7).rsi()
+        rsi = self.indicators.rsi(7)
         current_rsi = rsi.iloc[-1]
 
         oversold = current_rsi < 30
         overbought = current_rsi > 70
 
         # 2. Tendencia direccional con ADX
-        adx = ta.trend.ADXIndicator(
-            high=high_prices, low=low_prices, close=close_prices, window=14
-        )
-
-        di_pos = adx.adx_pos()
-        di_neg = adx.adx_neg()
-        adx_value = adx.adx()
+        adx_value, di_pos, di_neg = self.indicators.adx(14)
 
         strong_trend = adx_value.iloc[-1] > 25
         bullish_trend = di_pos.iloc[-1] > di_neg.iloc[-1]
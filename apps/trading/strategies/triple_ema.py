@@ -1,21 +1,51 @@
 from apps.trading import choices
+from apps.trading.strategies import _indicators, _streaming
 from apps.trading.strategies._base import TradingStrategy
 
 
 class TripleEMAStrategy(TradingStrategy):
+    SPANS = (10, 20, 50)
+
+    def create_streams(self) -> dict:
+        return {span: _streaming.EMA(span) for span in self.SPANS}
+
     def generate_signal(self) -> str:
-        ema10 = self.df["close"].ewm(span=10).mean()
-        ema20 = self.df["close"].ewm(span=20).mean()
-        ema50 = self.df["close"].ewm(span=50).mean()
+        emas = [self.indicators.ema(span) for span in self.SPANS]
+        return self._signal(
+            [ema.iloc[-2] for ema in emas], [ema.iloc[-1] for ema in emas]
+        )
+
+    def generate_signals(self, window):
+        close = self.df["close"]
+        ema10, ema20, ema50 = [
+            _indicators.windowed_ema(close, span, window) for span in self.SPANS
+        ]
+        prev_ema10, prev_ema20, prev_ema50 = [
+            _indicators.windowed_ema(close, span, window, lag=1)
+            for span in self.SPANS
+        ]
+        return self._build_signals(
+            (prev_ema10 < prev_ema20)
+            & (prev_ema20 < prev_ema50)
+            & (ema10 > ema20)
+            & (ema20 > ema50),
+            (prev_ema10 > prev_ema20)
+            & (prev_ema20 > prev_ema50)
+            & (ema10 < ema20)
+            & (ema20 < ema50),
+        )
+
+    def stream_signal(self) -> str:
+        emas = [self.streams[span] for span in self.SPANS]
+        return self._signal(
+            [ema.previous for ema in emas], [ema.value for ema in emas]
+        )
 
-        if (
-            ema10.iloc[-2] < ema20.iloc[-2] < ema50.iloc[-2]
-            and ema10.iloc[-1] > ema20.iloc[-1] > ema50.iloc[-1]
-        ):
+    def _signal(self, previous, current) -> str:
+        prev_ema10, prev_ema20, prev_ema50 = previous
+        ema10, ema20, ema50 = current
+        if prev_ema10 < prev_ema20 < prev_ema50 and ema10 > ema20 > ema50:
             return self._build_signal(choices.OrderSide.BUY)
-        elif (
-            ema10.iloc[-2] > ema20.iloc[-2] > ema50.iloc[-2]
-            and ema10.iloc[-1] < ema20.iloc[-1] < ema50.iloc[-1]
-        ):
+        elif prev_ema10 > prev_ema20 > prev_ema50 and ema10 < ema20 < ema50:
             return self._build_signal(choices.OrderSide.SELL)
         return self._build_signal(choices.OrderSide.HOLD)
@@ -1,7 +1,8 @@
 import numpy as np
-import ta
+import pandas as pd
 
 from apps.trading import choices
+from apps.trading.strategies import _indicators
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -27,19 +28,15 @@ class VolatilityBreakoutStrategy(TradingStrategy):
         # --- Análisis de volatilidad ---
 
         # 1. Bollinger Bands para medir constricción
-        bb = ta.volatility.BollingerBands(
-            close=close_prices, window=20, window_dev=2
-        )
+        bb = self.indicators.bollinger(window=20, window_dev=2)
 
-        bb_width = (bb.bollinger_hband() - bb.bollinger_lband()) / close_prices
+        bb_width = (bb.upper - bb.lower) / close_prices
         bb_avg_width = bb_width.rolling(window=squeeze_window).mean()
 
         # 2. Keltner Channels para complementar BBs
-        typical_price = (high_prices + low_prices + close_prices) / 3
+        typical_price = self.indicators.typical_price()
 
-        atr = ta.volatility.AverageTrueRange(
-            high=high_prices, low=low_prices, close=close_prices, window=14
-        ).average_true_range()
+        atr = self.indicators.atr(14)
 
         keltner_middle = typical_price.ewm(span=20).mean()
         keltner_upper = keltner_middle + (1.5 * atr)
@@ -49,43 +46,24 @@ class VolatilityBreakoutStrategy(TradingStrategy):
         kc_width = (keltner_upper - keltner_lower) / close_prices
 
         # 3. Detectar "squeeze" (BB dentro de KC)
-        squeeze = (bb.bollinger_hband() < keltner_upper) & (
-            bb.bollinger_lband() > keltner_lower
-        )
+        squeeze = (bb.upper < keltner_upper) & (bb.lower > keltner_lower)
 
         # 4. Detección de constricción de volatilidad
         # TTM Squeeze personalizado para 15 minutos
-        bb_width_percentile = bb_width.rolling(window=squeeze_window).apply(
-            lambda x: sum(1 for i in x if i < x.iloc[-1]) / len(x) * 100
+        bb_width_percentile = pd.Series(
+            _indicators.percentile_rank(bb_width, squeeze_window),
+            index=bb_width.index,
         )
 
         volatility_contraction = bb_width < bb_avg_width * 0.85
 
         # 5. Momentum durante y después del squeeze
         # Usar linreg slope como indicador de momentum
+        # (pendiente de las `momentum_window` velas anteriores a cada vela)
         momentum_window = 8
-
-        # Función para calcular pendiente de regresión lineal
-        def lin_reg_slope(y):
-            if len(y) < 2:
-                return 0
-            x = np.array(range(len(y)))
-            y = np.array(y)
-            A = np.vstack([x, np.ones(len(x))]).T
-            try:
-                slope, _ = np.linalg.lstsq(A, y, rcond=None)[0]
-                return slope
-            except:
-                return 0
-
-        # Calcular pendiente sobre precio y volumen
-        price_slopes = []
-        for i in range(momentum_window, len(close_prices)):
-            window_prices = close_prices.iloc[i - momentum_window : i].values
-            price_slopes.append(lin_reg_slope(window_prices))
-
-        # Añadir valores iniciales para mantener longitud
-        price_slopes = [0] * momentum_window + price_slopes
+        slope = _indicators.rolling_linreg(close_prices, momentum_window).slope
+        price_slopes = np.zeros(len(close_prices))
+        price_slopes[momentum_window:] = slope[momentum_window - 1 : -1]
 
         # Convertir a pandas Series
         momentum_oscillator = pd.Series(price_slopes, index=close_prices.index)
@@ -103,7 +81,7 @@ class VolatilityBreakoutStrategy(TradingStrategy):
         low_lookback = low_prices.rolling(window=breakout_window).min().shift(1)
 
         # 2. Calcular volumen relativo
-        rel_volume = volumes / volumes.rolling(window=20).mean()
+        rel_volume = volumes / self.indicators.sma(20, column="volume")
 
         # Datos actuales para comparación
         current_close = close_prices.iloc[-1]
@@ -1,5 +1,3 @@
-import ta
-
 from apps.trading import choices
 from apps.trading.strategies._base import TradingStrategy
 
@@ -20,17 +18,15 @@ class VolumeBreakoutStrategy(TradingStrategy):
         recent_low = self.df["low"].rolling(window=lookback).min()
 
         # Calcular ATR para la volatilidad (más ajustado para 15 min)
-        atr = ta.volatility.AverageTrueRange(
-            self.df["high"], self.df["low"], self.df["close"], window=14
-        ).average_true_range()
+        atr = self.indicators.atr(14)
 
         # Análisis de volumen
-        volume_ma = self.df["volume"].rolling(window=20).mean()
+        volume_ma = self.indicators.sma(20, column="volume")
         rel_volume = self.df["volume"] / volume_ma
         high_volume = rel_volume > 1.5  # 50% más volumen del promedio
 
         # Análisis de momentum para confirmar dirección
-        rsi = ta.momentum.RSIIndicator(self.df["close"], window=9).rsi()
+        rsi = self.indicators.rsi(9)
 
         # Soporte/Resistencia dinámicos basados en Fibonacci y precio reciente
         price_range = recent_high - recent_low
@@ -1,6 +1,7 @@
 import numpy as np
 
 from apps.trading import choices
+from apps.trading.strategies import _profile
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -14,16 +15,10 @@ class VolumeProfileStrategy(TradingStrategy):
         price_max = self.df["high"].max()
         price_bins = np.linspace(price_min, price_max, num_bins + 1)
 
-        # Construir perfil de volumen
-        volume_profile = np.zeros(num_bins)
-        for i in range(len(self.df)):
-            price = self.df["close"].iloc[i]
-            volume = self.df["volume"].iloc[i]
-
-            # Determinar en qué división cae el precio
-            bin_index = int(np.digitize(price, price_bins) - 1)
-            if 0 <= bin_index < num_bins:
-                volume_profile[bin_index] += volume
+        # Construir perfil de volumen según la división de cada cierre
+        volume_profile = _profile.volume_profile(
+            self.df["close"], self.df["volume"], price_bins
+        )
 
         # Encontrar POC (Point of Control) - nivel con mayor volumen
         poc_index = np.argmax(volume_profile)
@@ -1,7 +1,5 @@
-import pandas as pd
-import ta
-
 from apps.trading import choices
+from apps.trading.strategies import _params
 from apps.trading.strategies._base import TradingStrategy
 
 
@@ -12,6 +10,10 @@ class VWAPScalpingStrategy(TradingStrategy):
     Ideal para mercados de alta liquidez y volatilidad moderada.
     """
 
+    parameters = {
+        "session": _params.Parameter("8h", choices=("4h", "8h", "12h", "1D")),
+    }
+
     def generate_signal(self):
         # Datos de entrada
         open_prices = self.df["open"]
@@ -22,37 +24,12 @@ class VWAPScalpingStrategy(TradingStrategy):
 
         # --- Cálculo de VWAP y bandas ---
 
-        # 1. VWAP estándar (Volume Weighted Average Price)
-        typical_price = (high_prices + low_prices + close_prices) / 3
-        vwap_raw = (typical_price * volumes).cumsum() / volumes.cumsum()
-
-        # Para mejor adaptación a 15 minutos, calcular VWAP por sesiones
-        # Simulamos sesión de 8 horas (32 velas de 15 min)
-        session_size = 32
-
-        # Inicializar VWAP por sesiones
-        vwap = pd.Series(index=close_prices.index)
-
-        for i in range(0, len(close_prices), session_size):
-            end_idx = min(i + session_size, len(close_prices))
-            session_slice = slice(i, end_idx)
-
-            session_tp = typical_price.iloc[session_slice]
-            session_vol = volumes.iloc[session_slice]
-
-            session_vwap = (
-                session_tp * session_vol
-            ).cumsum() / session_vol.cumsum()
-            vwap.iloc[session_slice] = session_vwap.values
-
-        # Rellenar NaN con valores forward-fill
-        vwap = vwap.fillna(method="ffill")
+        # 1. VWAP por sesiones UTC (por defecto 8 horas: 00:00, 08:00 y 16:00)
+        vwap = self.indicators.session_vwap(self.params["session"]).vwap
 
         # 2. Bandas de desviación alrededor del VWAP
         # Usar ATR para bandas adaptativas
-        atr = ta.volatility.AverageTrueRange(
-            high=high_prices, low=low_prices, close=close_prices, window=14
-        ).average_true_range()
+        atr = self.indicators.atr(14)
 
         # Crear bandas a diferentes desviaciones
         vwap_upper1 = vwap + 1.0 * atr
@@ -78,11 +55,11 @@ class VWAPScalpingStrategy(TradingStrategy):
         vwap_oscillator = (close_prices - vwap) / atr
 
         # 2. Volumen relativo
-        avg_volume = volumes.rolling(window=20).mean()
+        avg_volume = self.indicators.sma(20, column="volume")
         rel_volume = volumes / avg_volume
 
         # 3. Stochastic RSI para timing
-        rsi = ta.momentum.RSIIndicator(close_prices, window=14).rsi()
+        rsi = self.indicators.rsi(14)
         stoch_k = (
             100
             * (rsi - rsi.rolling(window=14).min())
@@ -93,8 +70,8 @@ class VWAPScalpingStrategy(TradingStrategy):
         # --- Análisis técnico para filtros ---
 
         # 1. EMAs cortas para tendencia inmediata
-        ema8 = close_prices.ewm(span=8).mean()
-        ema21 = close_prices.ewm(span=21).mean()
+        ema8 = self.indicators.ema(8)
+        ema21 = self.indicators.ema(21)
 
         # Tendencia de corto plazo
         uptrend_short = ema8 > ema21
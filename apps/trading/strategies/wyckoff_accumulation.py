@@ -21,16 +21,11 @@ class WyckoffAccumulationStrategy(TradingStrategy):
         ).volume_price_trend()
 
         # Average Volume
-        avg_volume = self.df["volume"].rolling(window=20).mean()
+        avg_volume = self.indicators.sma(20, column="volume")
 
         # SMA y VWAP para identificar soporte/resistencia
-        sma50 = self.df["close"].rolling(window=50).mean()
-        typical_price = (
-            self.df["high"] + self.df["low"] + self.df["close"]
-        ) / 3
-        cumulative_tpv = (typical_price * self.df["volume"]).cumsum()
-        cumulative_volume = self.df["volume"].cumsum()
-        vwap = cumulative_tpv / cumulative_volume
+        sma50 = self.indicators.sma(50)
+        vwap = self.indicators.session_vwap("1D").vwap
 
         # Detección de rango
         high_range = self.df["high"].rolling(window=window).max()
@@ -1,48 +1,20 @@
 import logging
-from datetime import timedelta
+import os
+import time
+from collections import Counter
 from decimal import Decimal
 
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
-from celery import shared_task
+from celery import chord, shared_task
 from constance import config
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 
-from apps.trading import choices, models
-from apps.trading.strategies import (
-    _market_fetcher,
-    adxt_trending,
-    aggregated_order_flow,
-    bollinger_reversal,
-    crypto_seasonality_momentum,
-    dca_vwap_scalping,
-    ema9_21,
-    fibonacci_retracement,
-    ichimoku,
-    liquidity_hunter,
-    macd_divergence,
-    market_profile_value_area,
-    mean_reversion_grid,
-    # New strategies
-    momentum_scalping,
-    obv_divergence,
-    order_block,
-    pivot_points,
-    price_action_pattern,
-    rsi_ma_crossover,
-    short_term_trend_catcher,
-    smart_money_concept,
-    squeeze_momentum,
-    super_trend,
-    support_resistance_zone,
-    triple_ema,
-    volatility_breakout,
-    volume_breakout,
-    volume_profile,
-    vwap_scalping,
-    wyckoff_accumulation,
-)
+from apps.trading import choices, consensus, constants, models, utils
+from apps.trading.strategies import _registry
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -61,15 +33,11 @@ def process_signal(signal_id):
 
         logger.info(f"Processing signal: {signal}")
 
-        # Marcar como procesada
-        signal.processed = True
-        signal.save()
-
-        # Verificar si hay 5 señales consecutivas del mismo tipo
-        # con diferentes estrategias
-        check_consecutive_signals.delay(signal.ticker)
-
-        return f"Signal {signal_id} processed successfully"
+        # La evaluación de consenso del ticker procesa todas las señales
+        # pendientes de la ráfaga, no solo esta
+        if schedule_consensus(signal.ticker):
+            return f"Signal {signal_id} queued, consensus evaluation scheduled"
+        return f"Signal {signal_id} queued, consensus evaluation pending"
 
     except models.Signal.DoesNotExist:
         logger.error(f"Signal {signal_id} not found")
@@ -79,75 +47,162 @@ def process_signal(signal_id):
         return f"Error processing signal {signal_id}: {str(e)}"
 
 
+def schedule_consensus(ticker):
+    """
+    Programa la evaluación de consenso del ticker tras
+    `CONSENSUS_DEBOUNCE_SECONDS`, salvo que ya haya una pendiente, que
+    procesará también las señales nuevas. Devuelve si la programó.
+    """
+    if not cache.add(
+        consensus.pending_key(ticker),
+        True,
+        timeout=constants.CONSENSUS_PENDING_TIMEOUT,
+    ):
+        consensus.count("skipped", ticker)
+        return False
+
+    evaluate_consensus.apply_async(
+        (ticker,), countdown=constants.CONSENSUS_DEBOUNCE_SECONDS
+    )
+    return True
+
+
+@shared_task
+def evaluate_consensus(ticker):
+    """Procesa de una vez las señales pendientes de un ticker"""
+    consensus.count("evaluated", ticker)
+    try:
+        with consensus.ConsensusEngine(ticker).locked() as engine:
+            signals = _claim_signals(ticker)
+            # Las señales que lleguen a partir de aquí programan otra
+            # evaluación. Las que llegaron tras reclamar y antes de borrar la
+            # marca no la programaron: se reclaman también
+            cache.delete(consensus.pending_key(ticker))
+            signals += _claim_signals(ticker)
+            events = engine.apply(signals)
+        if not signals:
+            return f"No pending signals for {ticker}"
+
+        groups = _create_signal_groups(ticker, events)
+        return (
+            f"{len(signals)} signals processed, "
+            f"{len(groups)} signal groups created"
+        )
+
+    except Exception as e:
+        # Sin la marca la próxima señal vuelve a programar la evaluación
+        cache.delete(consensus.pending_key(ticker))
+        logger.error(f"Error evaluating consensus of {ticker}: {str(e)}")
+        return f"Error evaluating consensus: {str(e)}"
+
+
+@shared_task
+def process_signals(signal_ids):
+    """
+    Procesa en bloque las señales de una ejecución: las marca como
+    procesadas con un único UPDATE y las aplica al detector de consenso de
+    cada ticker, en lugar de una tarea por señal.
+    """
+    try:
+        tickers = (
+            models.Signal.objects.filter(id__in=signal_ids, processed=False)
+            .order_by()
+            .values_list("ticker", flat=True)
+            .distinct()
+        )
+        claimed, groups = 0, []
+        for ticker in sorted(tickers):
+            signals, events = _apply_consensus(ticker, signal_ids)
+            claimed += len(signals)
+            groups += _create_signal_groups(ticker, events)
+        if not claimed:
+            return f"Signals {signal_ids} already processed"
+
+        return (
+            f"{claimed} signals processed, "
+            f"{len(groups)} signal groups created"
+        )
+
+    except Exception as e:
+        logger.error(f"Error processing signals {signal_ids}: {str(e)}")
+        return f"Error processing signals: {str(e)}"
+
+
+def _apply_consensus(ticker, signal_ids):
+    """
+    Marca como procesadas las señales de `signal_ids` del ticker que aún no
+    lo están y las aplica a su detector de consenso, con el estado bloqueado
+    de principio a fin. Devuelve las señales y los consensos que completan.
+    """
+    with consensus.ConsensusEngine(ticker).locked() as engine:
+        signals = _claim_signals(ticker, signal_ids)
+        return signals, engine.apply(signals)
+
+
+def _claim_signals(ticker, signal_ids=None):
+    """
+    Marca como procesadas las señales del ticker que aún no lo están (solo
+    las de `signal_ids` si se indican) y las devuelve en orden de creación.
+    Debe llamarse con el estado del consenso bloqueado.
+    """
+    pending = models.Signal.objects.filter(ticker=ticker, processed=False)
+    if signal_ids is not None:
+        pending = pending.filter(id__in=signal_ids)
+    # Solo se aplican las señales que marca esta tarea, aunque otra
+    # procese a la vez algunas de las mismas
+    with transaction.atomic():
+        claimed = list(pending.select_for_update().values_list("id", flat=True))
+        models.Signal.objects.filter(id__in=claimed).update(processed=True)
+    return list(
+        models.Signal.objects.filter(id__in=claimed).order_by("created", "id")
+    )
+
+
+def _create_signal_groups(ticker, events):
+    """Crea y notifica un grupo de señales por cada consenso del ticker"""
+    groups = []
+    for event in events:
+        signal_group = _create_signal_group(
+            ticker, event.direction, event.signal_ids
+        )
+        groups.append(signal_group)
+        logger.info(
+            f"{event.direction} signal group created for {ticker}: "
+            f"{signal_group.id}"
+        )
+    return groups
+
+
+def _create_signal_group(ticker, direction, signals):
+    """Crea el grupo de señales y lo notifica a los usuarios del símbolo"""
+    signal_group = models.SignalGroup.objects.create(direction=direction)
+    signal_group.signals.add(*signals)
+
+    # Notificar a todos los usuarios con este símbolo configurado
+    users = User.objects.filter(trading_settings__symbol__iexact=ticker)
+    for user in users:
+        handle_signal_confirmation.delay(
+            user_id=user.id,
+            signal_group_id=signal_group.id,
+            direction=direction,
+        )
+    return signal_group
+
+
 @shared_task
 def check_consecutive_signals(ticker):
-    """Verifica si hay 5 señales consecutivas del mismo tipo con estrategias diferentes"""
+    """
+    Reconstruye el estado del detector de consenso del ticker desde las
+    señales procesadas de la ventana, p. ej. tras perder el cache. No crea
+    grupos: los consensos de esas señales ya se emitieron.
+    """
     try:
-        # Obtener señales en los últimos 60 minutos
-        one_hour_ago = timezone.now() - timedelta(minutes=60)
-        recent_signals = models.Signal.objects.filter(
-            ticker=ticker, timestamp__gte=one_hour_ago
-        ).order_by("-created")
-
-        if recent_signals.count() < 5:
-            return "Not enough signals to check"
-
-        # Detectar secuencias de buy o sell consecutivas
-        buy_signals = []
-        sell_signals = []
-
-        for signal in recent_signals:
-            if signal.signal_type == choices.OrderSide.BUY:
-                buy_signals.append(signal)
-                sell_signals = []
-            elif signal.signal_type == choices.OrderSide.SELL:
-                sell_signals.append(signal)
-                buy_signals = []
-
-            # Verificar si tenemos 5 señales del mismo tipo
-            if len(buy_signals) >= 5:
-                # Verificar que sean estrategias diferentes
-                strategies = set([s.strategy for s in buy_signals[:5]])
-                if len(strategies) == 5:
-                    # Crear grupo de señales
-                    signal_group = models.SignalGroup.objects.create(
-                        direction=choices.OrderSide.BUY
-                    )
-                    signal_group.signals.add(*buy_signals[:5])
-
-                    # Notificar a todos los usuarios con este símbolo configurado
-                    users = User.objects.filter(trading_settings__symbol=ticker)
-                    for user in users:
-                        handle_signal_confirmation.delay(
-                            user_id=user.id,
-                            signal_group_id=signal_group.id,
-                            direction=choices.OrderSide.BUY,
-                        )
-
-                    return f"Buy signal group created: {signal_group.id}"
-
-            elif len(sell_signals) >= 5:
-                # Verificar que sean estrategias diferentes
-                strategies = set([s.strategy for s in sell_signals[:5]])
-                if len(strategies) == 5:
-                    # Crear grupo de señales
-                    signal_group = models.SignalGroup.objects.create(
-                        direction=choices.OrderSide.SELL
-                    )
-                    signal_group.signals.add(*sell_signals[:5])
-
-                    # Notificar a todos los usuarios con este símbolo configurado
-                    users = User.objects.filter(trading_settings__symbol=ticker)
-                    for user in users:
-                        handle_signal_confirmation.delay(
-                            user_id=user.id,
-                            signal_group_id=signal_group.id,
-                            direction=choices.OrderSide.SELL,
-                        )
-
-                    return f"Sell signal group created: {signal_group.id}"
-
-        return "No consecutive signal patterns found"
+        engine = consensus.ConsensusEngine(ticker)
+        engine.refresh()
+        return (
+            f"Consensus state of {ticker} rebuilt: "
+            f"{len(engine.entries)} {engine.side} signals in the streak"
+        )
 
     except Exception as e:
         logger.error(
@@ -510,10 +565,13 @@ def check_positions_status():
 @shared_task
 def process_pending_signals():
     """Procesa señales pendientes"""
-    unprocessed_signals = models.Signal.objects.filter(processed=False)
-
-    for signal in unprocessed_signals:
-        process_signal.delay(signal_id=signal.id)
+    signal_ids = list(
+        models.Signal.objects.filter(processed=False).values_list(
+            "id", flat=True
+        )
+    )
+    if signal_ids:
+        process_signals.delay(signal_ids)
 
 
 @shared_task
@@ -563,55 +621,204 @@ def restart_bot(user_id):
         return f"Error restarting bot: {str(e)}"
 
 
+def configured_markets():
+    """Pares (símbolo, timeframe) configurados por los usuarios"""
+    pairs = models.TradingSettings.objects.values_list(
+        "symbol", "timeframe"
+    ).distinct()
+    return sorted({(symbol.upper(), timeframe) for symbol, timeframe in pairs})
+
+
 @shared_task
 def run_strategies():
-    """Ejecuta las estrategias de trading para todos los usuarios"""
-    symbol = "BTC/USDT"
-    timeframe = "15m"
-    fetcher = _market_fetcher.MarketDataFetcher(symbol, timeframe)
-    data = fetcher.fetch()
-
-    strategies_list = [
-        rsi_ma_crossover.RSIMACrossoverStrategy,
-        adxt_trending.ADXTrendStrategy,
-        bollinger_reversal.BollingerReversalStrategy,
-        ema9_21.EMA921Strategy,
-        triple_ema.TripleEMAStrategy,
-        fibonacci_retracement.FibonacciRetracementStrategy,
-        ichimoku.IchimokuStrategy,
-        macd_divergence.MACDDivergenceStrategy,
-        pivot_points.PivotPointsStrategy,
-        volume_profile.VolumeProfileStrategy,
-        dca_vwap_scalping.DCAVWAPScalpingStrategy,
-        mean_reversion_grid.MeanReversionGridStrategy,
-        obv_divergence.OBVDivergenceStrategy,
-        squeeze_momentum.SqueezeMomentumStrategy,
-        super_trend.SupertrendStrategy,
-        crypto_seasonality_momentum.CryptoSeasonalityMomentumStrategy,
-        market_profile_value_area.MarketProfileVAStrategy,
-        order_block.OrderBlockStrategy,
-        smart_money_concept.SmartMoneyConceptStrategy,
-        wyckoff_accumulation.WyckoffAccumulationStrategy,
-        momentum_scalping.MomentumScalpingStrategy,
-        volume_breakout.VolumeBreakoutStrategy,
-        price_action_pattern.PriceActionPatternStrategy,
-        aggregated_order_flow.AggregatedOrderFlowStrategy,
-        liquidity_hunter.LiquidityHunterStrategy,
-        short_term_trend_catcher.ShortTermTrendCatcherStrategy,
-        volatility_breakout.VolatilityBreakoutStrategy,
-        support_resistance_zone.SupportResistanceZoneStrategy,
-        vwap_scalping.VWAPScalpingStrategy,
-    ]
+    """Programa las estrategias de cada mercado configurado por los usuarios"""
+    markets = configured_markets()
+
+    for symbol, timeframe in markets:
+        run_pair_strategies.delay(symbol, timeframe)
 
-    for strategy_class in strategies_list:
-        strategy = strategy_class(data, symbol, timeframe)
-        signal_data = strategy.generate_signal()
-        signal = models.Signal.objects.create(
-            ticker=symbol,
-            signal_type=signal_data["signal"],
-            timeframe=timeframe,
-            strategy=strategy.__class__.__name__,
-            price_close=signal_data["price_close"],
+    logger.info(f"Scheduled strategies for {len(markets)} markets")
+    return markets
+
+
+def _strategies_lock(symbol, timeframe):
+    return f"run-strategies:{symbol}:{timeframe}"
+
+
+@shared_task
+def run_pair_strategies(symbol, timeframe, until=None):
+    """
+    Ejecuta las estrategias de trading para un par (símbolo, timeframe).
+    `until` es el timestamp (ms) de apertura de la vela recién cerrada: se
+    evalúan las velas hasta ella, sin la siguiente aún abierta.
+
+    Las velas se descargan una vez y las estrategias se reparten en
+    `STRATEGY_WORKERS` tareas (chord) que ejecutan los workers de Celery;
+    `collect_strategy_results` reúne sus resultados y libera el mercado.
+    Devuelve el número de tareas programadas.
+    """
+    # Una sola ejecución simultánea por mercado; si el chord falla el
+    # bloqueo expira tras STRATEGY_LOCK_TIMEOUT
+    lock = _strategies_lock(symbol, timeframe)
+    if not cache.add(lock, True, timeout=constants.STRATEGY_LOCK_TIMEOUT):
+        logger.info(
+            f"Strategies for {symbol} {timeframe} already running, skipping"
+        )
+        return None
+
+    scheduled = None
+    try:
+        scheduled = _run_pair_strategies(symbol, timeframe, until)
+    except Exception as e:
+        logger.error(
+            f"Error running strategies for {symbol} {timeframe}: {str(e)}"
+        )
+    if scheduled is None:
+        cache.delete(lock)
+    return scheduled
+
+
+def _run_pair_strategies(symbol, timeframe, until=None):
+    # Importación diferida: el proceso web importa este módulo para llamar a
+    # `.delay()` y no necesita pandas, numpy, ta ni ccxt
+    from apps.trading.strategies import _candles, _market_fetcher, _parallel
+
+    names = _registry.enabled(config.DISABLED_STRATEGIES)
+    if not names:
+        logger.info(f"No enabled strategies for {symbol} {timeframe}")
+        return None
+
+    started = time.perf_counter()
+    fetcher = _market_fetcher.MarketDataFetcher(
+        utils.to_market_symbol(symbol), timeframe
+    )
+    data = fetcher.fetch(until)
+    stats = {
+        "fetch": time.perf_counter() - started,
+        "dispatched": time.time(),
+        "candles": _candles.Candles.of(data).nbytes,
+    }
+
+    # Un bloque de estrategias por tarea: las de un mismo bloque comparten
+    # velas e indicadores
+    chunks = _parallel.split(
+        names, config.STRATEGY_WORKERS or os.cpu_count() or 1
+    )
+    ohlcv = _market_fetcher.to_ohlcv(data)
+    chord(
+        evaluate_strategies.s(chunk, ohlcv, symbol, timeframe)
+        for chunk in chunks
+    )(collect_strategy_results.s(symbol, timeframe, stats))
+    return len(chunks)
+
+
+@shared_task
+def evaluate_strategies(names, ohlcv, symbol, timeframe):
+    """
+    Evalúa un bloque de estrategias sobre las velas `ohlcv` (filas de ccxt)
+    y devuelve sus `StrategyResult` como diccionarios.
+    """
+    from apps.trading.strategies import _candles, _market_fetcher, _parallel
+
+    # Velas de solo lectura compartidas por todas las estrategias del bloque
+    data = _candles.Candles.of(_market_fetcher.to_frame(ohlcv))
+    results = _parallel.run_parallel(
+        [_registry.load(name) for name in names], data, symbol, timeframe
+    )
+    return [result._asdict() for result in results]
+
+
+@shared_task
+def collect_strategy_results(chunks, symbol, timeframe, stats):
+    """
+    Reúne los resultados de los bloques de una ejecución por par: guarda
+    sus señales, las procesa en una sola tarea y reporta indicadores y
+    tiempos. Libera el bloqueo del mercado.
+    """
+    try:
+        return _collect_strategy_results(chunks, symbol, timeframe, stats)
+    except Exception as e:
+        logger.error(
+            f"Error collecting strategies for {symbol} {timeframe}: {str(e)}"
         )
+        return None
+    finally:
+        cache.delete(_strategies_lock(symbol, timeframe))
+
+
+def save_strategy_signals(symbol, timeframe, results):
+    """
+    Guarda las señales de los `StrategyResult` de una evaluación del
+    mercado con un solo INSERT y las procesa en una sola tarea. Devuelve
+    las señales guardadas.
+    """
+    signals = []
+    for result in results:
+        if result.error is not None:
+            logger.error(
+                f"Error running strategy {result.strategy}: {result.error}"
+            )
+            continue
+
+        signals.append(
+            models.Signal(
+                ticker=symbol,
+                signal_type=result.signal["signal"],
+                timeframe=timeframe,
+                strategy=result.strategy,
+                price_close=result.signal["price_close"],
+            )
+        )
+
+    with transaction.atomic():
+        signals = models.Signal.objects.bulk_create(signals)
+        signal_ids = [signal.id for signal in signals]
+        if signal_ids:
+            transaction.on_commit(lambda: process_signals.delay(signal_ids))
+    return signals
+
 
-        process_signal.delay(signal_id=signal.id)
+def _collect_strategy_results(chunks, symbol, timeframe, stats):
+    from apps.trading.strategies import _cache, _parallel
+
+    results = [
+        _parallel.StrategyResult(**result)
+        for chunk in chunks
+        for result in chunk
+    ]
+    evaluation = time.time() - stats["dispatched"]
+    slowest = max(results, key=lambda result: result.elapsed)
+
+    hits, misses = Counter(), Counter()
+    for result in results:
+        hits.update(result.hits)
+        misses.update(result.misses)
+    save_strategy_signals(symbol, timeframe, results)
+
+    report = _cache.IndicatorCache.summarize(hits, misses)
+    # La evaluación incluye la espera en la cola de los bloques
+    report["timings"] = {
+        "fetch": stats["fetch"],
+        "evaluation": evaluation,
+        "total": stats["fetch"] + evaluation,
+    }
+    # Memoria de las velas y de los indicadores que retienen las estrategias
+    report["memory"] = {
+        "candles": stats["candles"],
+        "retained": sum(result.memory for result in results),
+    }
+    logger.info(
+        f"Ran {len(results)} strategies for {symbol} {timeframe} in "
+        f"{len(chunks)} tasks in {report['timings']['total']:.3f}s (fetch "
+        f"{report['timings']['fetch']:.3f}s, evaluation "
+        f"{report['timings']['evaluation']:.3f}s, slowest: "
+        f"{slowest.strategy} {slowest.elapsed:.3f}s)"
+    )
+    logger.info(
+        f"Indicator cache for {symbol} {timeframe}: "
+        f"{report['hits']} hits, {report['misses']} misses "
+        f"({report['hit_ratio']:.0%} shared), "
+        f"{report['memory']['retained'] / 1024:.0f} KiB retained over "
+        f"{report['memory']['candles'] / 1024:.0f} KiB of candles"
+    )
+    return report
@@ -1,3 +1,2225 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import ccxt
+import numpy as np
+import pandas as pd
+import ta
+from constance.test import override_config
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.trading import choices, consensus, models, tasks, utils
+from apps.trading.constants import (
+    CONSENSUS_DEBOUNCE_SECONDS,
+    EXCHANGE_MARKETS_TTL,
+)
+from apps.trading.management.commands import stream_klines
+from apps.trading.strategies import (
+    _async_fetcher,
+    _backtest,
+    _benchmark,
+    _candle_store,
+    _candles,
+    _consensus,
+    _exchanges,
+    _indicators,
+    _kline_stream,
+    _live,
+    _market_fetcher,
+    _money_flow,
+    _optimizer,
+    _parallel,
+    _params,
+    _profile,
+    _registry,
+    _resample,
+    _streaming,
+    _swings,
+    _synthetic,
+)
+from apps.trading.strategies._cache import IndicatorCache
+from apps.trading.strategies.bollinger_reversal import BollingerReversalStrategy
+from apps.trading.strategies.ema9_21 import EMA921Strategy
+from apps.trading.strategies.order_block import OrderBlockStrategy
+from apps.trading.strategies.rsi_ma_crossover import RSIMACrossoverStrategy
+from apps.trading.strategies.super_trend import SupertrendStrategy
+from apps.trading.strategies.triple_ema import TripleEMAStrategy
+from config import celery_app
+
+User = get_user_model()
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@contextlib.contextmanager
+def eager_tasks():
+    """Ejecuta las tareas de Celery en el proceso, propagando sus errores"""
+    conf = celery_app.conf
+    previous = {
+        "task_always_eager": conf.task_always_eager,
+        "task_eager_propagates": conf.task_eager_propagates,
+    }
+    conf.update(task_always_eager=True, task_eager_propagates=True)
+    try:
+        yield
+    finally:
+        conf.update(previous)
+
+
+class TestIndicatorCache(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(100, seed=7)
+
+    def test_cache_is_attached_to_frame(self):
+        """El cache se comparte entre estrategias del mismo DataFrame"""
+        first = EMA921Strategy(self.df, "BTC/USDT", "15m")
+        second = RSIMACrossoverStrategy(self.df, "BTC/USDT", "15m")
+        self.assertIs(first.indicators, second.indicators)
+        self.assertIsNot(first.indicators, IndicatorCache.of(self.df.copy()))
+
+    def test_indicator_computed_once(self):
+        """Un mismo indicador se calcula una sola vez"""
+        cache = IndicatorCache.of(self.df)
+        atr = cache.atr(14)
+        self.assertIs(cache.atr(14), atr)
+        self.assertIsNot(cache.atr(10), atr)
+        report = cache.report()
+        self.assertEqual(report["hits"], 1)
+        self.assertEqual(report["misses"], 2)
+        self.assertEqual(report["indicators"]["atr"], {"hits": 1, "misses": 2})
+
+    def test_new_data_invalidates_entries(self):
+        """Una nueva versión de los datos recalcula el indicador"""
+        cache = IndicatorCache.of(self.df)
+        rsi = cache.rsi(14)
+        self.df.loc[len(self.df) - 1, "close"] *= 1.01
+        self.assertIsNot(cache.rsi(14), rsi)
+
+    def test_matches_direct_computation(self):
+        """Los valores cacheados coinciden con el cálculo directo"""
+        cache = IndicatorCache.of(self.df)
+        pd.testing.assert_series_equal(
+            cache.ema(21), self.df["close"].ewm(span=21).mean()
+        )
+        typical_price = (
+            self.df["high"] + self.df["low"] + self.df["close"]
+        ) / 3
+        pd.testing.assert_series_equal(cache.typical_price(), typical_price)
+
+
+class TestStreamingIndicators(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(300, seed=7)
+        self.cache = IndicatorCache.of(self.df)
+
+    def assertStreamMatches(self, indicator, expected):
+        """Compara el indicador incremental vela a vela con el cálculo batch"""
+        values = [indicator.update(bar) for bar in self.df.to_dict("records")]
+        np.testing.assert_allclose(values, expected, rtol=1e-9, equal_nan=True)
+
+    def test_moving_averages(self):
+        """EMA y VWAP incrementales coinciden con pandas"""
+        self.assertStreamMatches(_streaming.EMA(21), self.cache.ema(21))
+        self.assertStreamMatches(
+            _streaming.EMA(12, adjust=False), self.cache.ema(12, adjust=False)
+        )
+        self.assertStreamMatches(_streaming.VWAP(), self.cache.vwap())
+
+    def test_wilder_indicators(self):
+        """RSI, ATR y OBV incrementales coinciden con ta"""
+        self.assertStreamMatches(_streaming.RSI(14), self.cache.rsi(14))
+        self.assertStreamMatches(_streaming.ATR(14), self.cache.atr(14))
+        self.assertStreamMatches(_streaming.OBV(), self.cache.obv())
+
+    def test_rolling_windows(self):
+        """Suma, mínimo y máximo móviles coinciden con pandas"""
+        self.assertStreamMatches(
+            _streaming.RollingSum(20, "volume"),
+            self.df["volume"].rolling(20).sum(),
+        )
+        self.assertStreamMatches(
+            _streaming.RollingMax(10), self.df["high"].rolling(10).max()
+        )
+        self.assertStreamMatches(
+            _streaming.RollingMin(10), self.df["low"].rolling(10).min()
+        )
+
+
+class TestOnCandle(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(400, seed=3)
+
+    def test_on_candle_matches_generate_signal(self):
+        """La señal incremental coincide con recalcular el histórico"""
+        strategies = [
+            EMA921Strategy,
+            TripleEMAStrategy,
+            RSIMACrossoverStrategy,
+            BollingerReversalStrategy,
+        ]
+        for strategy_class in strategies:
+            live = strategy_class(self.df.iloc[:100].copy(), "BTCUSDT", "15m")
+            for position in range(100, len(self.df)):
+                bar = self.df.iloc[position].to_dict()
+                batch = strategy_class(
+                    self.df.iloc[: position + 1].copy(), "BTCUSDT", "15m"
+                )
+                self.assertEqual(live.on_candle(bar), batch.generate_signal())
+            self.assertEqual(len(live.df), len(self.df))
+
+    def test_on_candle_without_streams_uses_signal_window(self):
+        """Sin indicadores incrementales se evalúan las últimas velas"""
+        live = OrderBlockStrategy(self.df.iloc[:100].copy(), "BTCUSDT", "15m")
+        window = live.signal_window
+        for position in range(100, 160):
+            bar = self.df.iloc[position].to_dict()
+            batch = OrderBlockStrategy(
+                self.df.iloc[position + 1 - window : position + 1].copy(),
+                "BTCUSDT",
+                "15m",
+            )
+            self.assertEqual(live.on_candle(bar), batch.generate_signal())
+
+
+class TestParallelStrategies(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(100, seed=7)
+        self.strategies = [
+            EMA921Strategy,
+            TripleEMAStrategy,
+            RSIMACrossoverStrategy,
+            BollingerReversalStrategy,
+        ]
+
+    def test_shared_candles_round_trip(self):
+        """Las velas se reconstruyen igual desde la memoria compartida"""
+        with _parallel.SharedCandles(self.df) as candles:
+            data = _parallel.SharedCandles.load(candles.descriptor)
+        pd.testing.assert_frame_equal(data, self.df)
+
+    def test_parallel_matches_sequential(self):
+        """El pool de procesos devuelve las mismas señales en el mismo orden"""
+        sequential = _parallel.run_parallel(
+            self.strategies, self.df.copy(), "BTCUSDT", "15m", workers=1
+        )
+        parallel = _parallel.run_parallel(
+            self.strategies, self.df.copy(), "BTCUSDT", "15m", workers=2
+        )
+        self.assertEqual(
+            [(r.strategy, r.signal, r.error) for r in parallel],
+            [(r.strategy, r.signal, r.error) for r in sequential],
+        )
+
+    @mock.patch("apps.trading.strategies._parallel.ProcessPoolExecutor")
+    @mock.patch("billiard.current_process")
+    def test_celery_worker_runs_in_process(self, current_process, executor):
+        """En un proceso daemon de Celery no se crea un pool de procesos"""
+        current_process.return_value.daemon = True
+        self.assertEqual(_parallel.default_workers(), 1)
+        results = _parallel.run_parallel(
+            self.strategies, self.df.copy(), "BTCUSDT", "15m", workers=2
+        )
+        executor.assert_not_called()
+        self.assertEqual(len(results), len(self.strategies))
+
+    def test_split_keeps_order(self):
+        """Los bloques son consecutivos, equilibrados y conservan el orden"""
+        self.assertEqual(
+            _parallel.split(list("abcdefg"), 3),
+            [list("abc"), list("de"), list("fg")],
+        )
+        self.assertEqual(_parallel.split(list("ab"), 5), [["a"], ["b"]])
+        self.assertEqual(_parallel.split(list("ab"), 0), [["a", "b"]])
+
+
+class TestCandles(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(200, seed=7)
+        self.candles = _candles.Candles.of(self.df)
+
+    def test_columns_are_read_only_views(self):
+        """Las columnas son vistas sin copia de un bloque de solo lectura"""
+        candles = self.candles
+        self.assertIs(_candles.Candles.of(self.df), candles)
+        self.assertIs(_candles.Candles.of(candles), candles)
+        self.assertTrue(candles.close.flags.c_contiguous)
+        self.assertTrue(
+            np.shares_memory(candles["close"].values, candles.prices)
+        )
+        pd.testing.assert_frame_equal(candles.to_frame(), self.df)
+
+        with self.assertRaises(ValueError):
+            candles["close"].iloc[-1] = 0.0
+        with self.assertRaises(ValueError):
+            candles.high[0] = 0.0
+        with self.assertRaises(TypeError):
+            candles["signal"] = 1
+
+        recent = candles.iloc[-30:]
+        self.assertEqual(len(recent), 30)
+        self.assertTrue(np.shares_memory(recent.low, candles.prices))
+        self.assertEqual(
+            recent["timestamp"].iat[-1], self.df["timestamp"].iat[-1]
+        )
+
+        # Si el DataFrame cambia se crea un contenedor nuevo
+        self.df.loc[len(self.df) - 1, "close"] *= 1.01
+        self.assertIsNot(_candles.Candles.of(self.df), candles)
+
+    def test_append_reuses_block(self):
+        """Añadir velas no copia las anteriores hasta llenar el bloque"""
+        df = self.df.copy()
+        df["timestamp"] = df["timestamp"].dt.tz_localize("Europe/Madrid")
+        bars = _synthetic.generate_candles(30, seed=8, start="2024-01-03")
+        bars["timestamp"] = bars["timestamp"].dt.tz_localize("Europe/Madrid")
+        candles = _candles.Candles.of(df.iloc[:100])
+
+        grown = [candles.append(bars.iloc[0].to_dict(), max_history=10)]
+        for position in range(1, len(bars)):
+            bar = bars.iloc[position].to_dict()
+            grown.append(grown[-1].append(bar, max_history=10))
+        # Bloques de 20 velas: se copian 9 al llenarse cada uno
+        self.assertFalse(np.shares_memory(grown[0].prices, candles.prices))
+        self.assertTrue(np.shares_memory(grown[10].prices, grown[5].prices))
+        self.assertFalse(np.shares_memory(grown[11].prices, grown[10].prices))
+        for position, candles in enumerate(grown):
+            expected = pd.concat([df.iloc[:100], bars.iloc[: position + 1]])
+            pd.testing.assert_frame_equal(
+                candles.to_frame(),
+                expected.iloc[-10:].reset_index(drop=True),
+            )
+        with self.assertRaises(ValueError):
+            grown[-1].close[0] = 0.0
+
+        # Añadir a un contenedor anterior no modifica los siguientes
+        branch = grown[-3].append(bars.iloc[0].to_dict(), max_history=10)
+        self.assertEqual(branch["timestamp"].iat[-1], bars["timestamp"].iat[0])
+        self.assertEqual(
+            grown[-2]["timestamp"].iat[-1], bars["timestamp"].iat[-2]
+        )
+
+        unbounded = _candles.Candles.of(df.iloc[:5])
+        for position in range(len(bars)):
+            unbounded = unbounded.append(bars.iloc[position].to_dict())
+        self.assertEqual(len(unbounded), 5 + len(bars))
+
+    def test_strategies_do_not_grow_shared_candles(self):
+        """Las estrategias no modifican las velas y la memoria no crece"""
+        strategies = [_registry.load(name) for name in _registry.STRATEGIES]
+        prices = self.candles.prices.copy()
+        first = _parallel.run_parallel(
+            strategies, self.df, "BTCUSDT", "15m", workers=1
+        )
+        second = _parallel.run_parallel(
+            strategies, self.df, "BTCUSDT", "15m", workers=1
+        )
+
+        self.assertEqual(list(self.df.columns), list(_candles.COLUMNS))
+        np.testing.assert_array_equal(self.candles.prices, prices)
+        self.assertEqual(
+            sum(result.memory for result in first),
+            IndicatorCache.of(self.candles).nbytes,
+        )
+        # Los indicadores ya calculados se reutilizan: nada nuevo retenido
+        self.assertEqual(sum(result.memory for result in second), 0)
+        self.assertEqual(
+            [result.signal for result in first],
+            [result.signal for result in second],
+        )
+
+
+def reference_supertrend_line(df, atr, multiplier):
+    """Bucle original de SupertrendStrategy"""
+    hl2 = (df["high"] + df["low"]) / 2
+    up = hl2 - (multiplier * atr)
+    dn = hl2 + (multiplier * atr)
+    supertrend = [0] * len(df)
+    direction = [1] * len(df)
+    for i in range(1, len(df)):
+        if not (
+            up.iloc[i] > supertrend[i - 1]
+            or df["close"].iloc[i - 1] <= supertrend[i - 1]
+        ):
+            up.iloc[i] = supertrend[i - 1]
+        if not (
+            dn.iloc[i] < supertrend[i - 1]
+            or df["close"].iloc[i - 1] >= supertrend[i - 1]
+        ):
+            dn.iloc[i] = supertrend[i - 1]
+        if df["close"].iloc[i] <= dn.iloc[i]:
+            direction[i] = -1
+        elif df["close"].iloc[i] >= up.iloc[i]:
+            direction[i] = 1
+        else:
+            direction[i] = direction[i - 1]
+        supertrend[i] = up.iloc[i] if direction[i] == 1 else dn.iloc[i]
+    return dn.to_numpy(), up.to_numpy(), np.array(supertrend), direction
+
+
+def reference_supertrend_bands(df, atr, factor):
+    """Bucle original de ShortTermTrendCatcherStrategy"""
+    close = df["close"]
+    basic_upper = ((df["high"] + df["low"]) / 2) + (factor * atr)
+    basic_lower = ((df["high"] + df["low"]) / 2) - (factor * atr)
+    upper = np.zeros(len(close))
+    lower = np.zeros(len(close))
+    supertrend = np.zeros(len(close))
+    trend = np.zeros(len(close))
+    for i in range(1, len(close)):
+        if (
+            basic_upper.iloc[i] < upper[i - 1]
+            or close.iloc[i - 1] > upper[i - 1]
+        ):
+            upper[i] = basic_upper.iloc[i]
+        else:
+            upper[i] = upper[i - 1]
+        if (
+            basic_lower.iloc[i] > lower[i - 1]
+            or close.iloc[i - 1] < lower[i - 1]
+        ):
+            lower[i] = basic_lower.iloc[i]
+        else:
+            lower[i] = lower[i - 1]
+        if supertrend[i - 1] == upper[i - 1] and close.iloc[i] <= upper[i]:
+            supertrend[i] = upper[i]
+        elif supertrend[i - 1] == upper[i - 1] and close.iloc[i] > upper[i]:
+            supertrend[i] = lower[i]
+        elif supertrend[i - 1] == lower[i - 1] and close.iloc[i] >= lower[i]:
+            supertrend[i] = lower[i]
+        elif supertrend[i - 1] == lower[i - 1] and close.iloc[i] < lower[i]:
+            supertrend[i] = upper[i]
+        trend[i] = 1 if supertrend[i] <= close.iloc[i] else -1
+    return upper, lower, supertrend, trend
+
+
+class TestSupertrendKernel(SimpleTestCase):
+    def test_matches_reference_loops(self):
+        """El kernel coincide con los bucles originales de ambas estrategias"""
+        references = [
+            ("line", 2.5, reference_supertrend_line),
+            ("bands", 2.0, reference_supertrend_bands),
+        ]
+        for seed in range(5):
+            df = _synthetic.generate_candles(300, seed=seed)
+            atr = IndicatorCache.of(df).atr(10)
+            for anchor, multiplier, reference in references:
+                result = _indicators.supertrend(
+                    df["high"],
+                    df["low"],
+                    df["close"],
+                    atr,
+                    multiplier,
+                    anchor=anchor,
+                )
+                for actual, expected in zip(
+                    result, reference(df, atr, multiplier)
+                ):
+                    np.testing.assert_array_equal(actual, expected)
+
+
+class TestRollingKernels(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.close = _synthetic.generate_candles(200, seed=7)["close"]
+        self.close.iloc[50] = np.nan
+
+    def test_rolling_linreg_matches_polyfit(self):
+        """Pendiente e intercepto coinciden con el ajuste por ventana"""
+        window = 20
+        result = _indicators.rolling_linreg(self.close, window)
+        for end in range(window - 1, len(self.close)):
+            y = self.close.iloc[end - window + 1 : end + 1].to_numpy()
+            if np.isnan(y).any():
+                self.assertTrue(np.isnan(result.slope[end]))
+                continue
+            slope, intercept = np.polyfit(np.arange(window), y, 1)
+            self.assertAlmostEqual(result.slope[end], slope, places=6)
+            self.assertAlmostEqual(result.intercept[end], intercept, places=4)
+        self.assertTrue(np.isnan(result.slope[: window - 1]).all())
+
+    def test_percentile_rank_matches_rolling_apply(self):
+        """El rango percentil coincide con el conteo por ventana"""
+        expected = self.close.rolling(window=20).apply(
+            lambda x: sum(1 for i in x if i < x.iloc[-1]) / len(x) * 100
+        )
+        np.testing.assert_array_equal(
+            _indicators.percentile_rank(self.close, 20), expected.to_numpy()
+        )
+
+    def test_windowed_kernels_match_each_window(self):
+        """EMA y RSI por ventana coinciden con calcularlos en cada ventana"""
+        close = self.close.iloc[60:].reset_index(drop=True)
+        window = 30
+        ema = _indicators.windowed_ema(close, 9, window)
+        previous = _indicators.windowed_ema(close, 9, window, lag=1)
+        rsi = _indicators.windowed_rsi(close, 14, window)
+        for end in range(window, len(close) + 1):
+            frame = close.iloc[end - window : end]
+            expected = frame.ewm(span=9).mean()
+            self.assertAlmostEqual(ema[end - 1], expected.iloc[-1])
+            self.assertAlmostEqual(previous[end - 1], expected.iloc[-2])
+            self.assertAlmostEqual(
+                rsi[end - 1], ta.momentum.rsi(frame, window=14).iloc[-1]
+            )
+        self.assertTrue(np.isnan(ema[: window - 1]).all())
+        self.assertTrue(np.isnan(rsi[: window - 1]).all())
+
+
+class TestSwings(SimpleTestCase):
+    def reference_mask(self, values, left, right, tail, kind):
+        """Bucle original con slices de pandas"""
+        mask = np.zeros(len(values), dtype=bool)
+        for i in range(left, len(values) - tail):
+            window = values.iloc[i - left : i + right + 1]
+            extreme = window.max() if kind == "high" else window.min()
+            mask[i] = values.iloc[i] == extreme
+        return mask
+
+    def test_matches_reference_loops(self):
+        """Las máscaras coinciden con los bucles de las estrategias"""
+        df = _synthetic.generate_candles(500, seed=7)
+        # Precios redondeados para forzar empates entre velas
+        df["high"] = df["high"].round(-2)
+        df.loc[[10, 200], "high"] = np.nan
+        for left, right, tail in [(2, 2, 2), (3, 3, 3), (4, 4, 4), (5, 4, 5)]:
+            for kind, column in [("high", "high"), ("low", "low")]:
+                np.testing.assert_array_equal(
+                    _swings.swing_mask(
+                        df[column], left, right=right, tail=tail, kind=kind
+                    ),
+                    self.reference_mask(df[column], left, right, tail, kind),
+                )
+
+    def test_swing_arrays(self):
+        """Se devuelven índice, precio y volumen de cada punto de giro"""
+        df = _synthetic.generate_candles(100, seed=7)
+        swings = _swings.swings(df["low"], 3, kind="low", volume=df["volume"])
+        np.testing.assert_array_equal(swings.index, np.flatnonzero(swings.mask))
+        np.testing.assert_array_equal(
+            swings.price, df["low"].to_numpy()[swings.index]
+        )
+        np.testing.assert_array_equal(
+            swings.volume, df["volume"].to_numpy()[swings.index]
+        )
+        self.assertFalse(_swings.swing_mask(df["low"][:5], 3).any())
+
+
+class TestOrderBlocks(SimpleTestCase):
+    def reference_order_blocks(self, df, change, bullish, bearish):
+        """Detección y validación originales, O(n²)"""
+        valid = {"bullish": [], "bearish": []}
+        for i in range(1, len(df)):
+            previous = df.iloc[i - 1]
+            if bullish.iloc[i] and previous["close"] < previous["open"]:
+                kind, strength = "bullish", change.iloc[i]
+            elif bearish.iloc[i] and previous["close"] > previous["open"]:
+                kind, strength = "bearish", abs(change.iloc[i])
+            else:
+                continue
+            later = df["close"].iloc[i:]
+            if kind == "bullish":
+                violated = (later < previous["low"]).any()
+                respected = df["close"].iloc[-1] > previous["low"]
+            else:
+                violated = (later > previous["high"]).any()
+                respected = df["close"].iloc[-1] < previous["high"]
+            if not violated and respected:
+                valid[kind].append(
+                    {
+                        "type": kind,
+                        "high": previous["high"],
+                        "low": previous["low"],
+                        "index": i - 1,
+                        "strength": strength,
+                    }
+                )
+        return valid["bullish"], valid["bearish"]
+
+    def test_matches_reference(self):
+        """Los OB válidos coinciden con la validación barra a barra"""
+        found = 0
+        for seed in range(10):
+            df = _synthetic.generate_candles(400, seed=seed, volatility=0.02)
+            change = df["close"].pct_change()
+            bullish = change > 0.02
+            bearish = change < -0.02
+            strategy = OrderBlockStrategy(df, "BTCUSDT", "15m")
+            actual = strategy._valid_order_blocks(
+                change, bullish, bearish, df["close"].iloc[-1]
+            )
+            expected = self.reference_order_blocks(df, change, bullish, bearish)
+            self.assertEqual(actual, expected)
+            found += len(actual[0]) + len(actual[1])
+        self.assertGreater(found, 0)
+
+
+def loop_mfi(typical_price, volume, window=14):
+    """MFI con el bucle por vela que usaba AggregatedOrderFlow"""
+    raw_money_flow = typical_price * volume
+    positive_flow = raw_money_flow.copy()
+    negative_flow = raw_money_flow.copy()
+    for i in range(1, len(typical_price)):
+        if typical_price.iloc[i] > typical_price.iloc[i - 1]:
+            negative_flow.iloc[i] = 0
+        elif typical_price.iloc[i] < typical_price.iloc[i - 1]:
+            positive_flow.iloc[i] = 0
+        else:
+            positive_flow.iloc[i] = 0
+            negative_flow.iloc[i] = 0
+    return 100 - (
+        100
+        / (
+            1
+            + positive_flow.rolling(window).sum()
+            / negative_flow.rolling(window).sum()
+        )
+    )
+
+
+class TestMoneyFlow(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(300, seed=7)
+        # Vela sin rango para cubrir la división por cero
+        self.df.loc[50, ["open", "high", "low", "close"]] = 30000.0
+        self.cache = IndicatorCache.of(self.df)
+
+    def test_mfi_matches_loop(self):
+        """El MFI vectorizado coincide con el bucle de AggregatedOrderFlow"""
+        expected = loop_mfi(self.cache.typical_price(), self.df["volume"])
+        # El bucle contaba la primera vela como flujo positivo y negativo
+        pd.testing.assert_series_equal(
+            self.cache.mfi(14).iloc[14:], expected.iloc[14:]
+        )
+
+    def test_mfi_is_faster_than_loop(self):
+        """Benchmark del MFI vectorizado frente al bucle por vela"""
+        data = _synthetic.generate_candles(5000, seed=4)
+        typical_price = (data["high"] + data["low"] + data["close"]) / 3
+
+        started = time.perf_counter()
+        expected = loop_mfi(typical_price, data["volume"])
+        loop_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        mfi = _money_flow.money_flow_index(typical_price, data["volume"], 14)
+        vectorized_seconds = time.perf_counter() - started
+
+        pd.testing.assert_series_equal(mfi.iloc[14:], expected.iloc[14:])
+        # Unas 150 veces más rápido; margen para máquinas cargadas
+        self.assertLess(vectorized_seconds * 10, loop_seconds)
+
+    def test_acc_dist_matches_ta(self):
+        """La línea A/D coincide con ta"""
+        expected = ta.volume.AccDistIndexIndicator(
+            high=self.df["high"],
+            low=self.df["low"],
+            close=self.df["close"],
+            volume=self.df["volume"],
+        ).acc_dist_index()
+        np.testing.assert_allclose(self.cache.acc_dist(), expected)
+
+    def test_cumulative_delta(self):
+        """El delta acumulado reutiliza la presión compradora/vendedora"""
+        buy, sell = self.cache.pressure()
+        delta = self.cache.cumulative_delta(10)
+        np.testing.assert_allclose(
+            delta.iloc[9:], (buy - sell).rolling(10).sum().iloc[9:]
+        )
+        self.assertIs(self.cache.pressure(), self.cache.pressure())
+
+
+class TestSessionVWAP(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(
+            300, start="2024-01-01 05:00", seed=7
+        )
+        self.cache = IndicatorCache.of(self.df)
+
+    def test_matches_per_session_computation(self):
+        """VWAP y desviación coinciden con el cálculo por día UTC"""
+        result = self.cache.session_vwap("1D")
+        typical_price = self.cache.typical_price()
+        for _, day in self.df.groupby(self.df["timestamp"].dt.date):
+            price = typical_price.loc[day.index]
+            volume = day["volume"]
+            vwap = (price * volume).cumsum() / volume.cumsum()
+            variance = (price**2 * volume).cumsum() / volume.cumsum() - vwap**2
+            np.testing.assert_allclose(result.vwap.loc[day.index], vwap)
+            np.testing.assert_allclose(
+                result.std.loc[day.index],
+                np.sqrt(variance.clip(lower=0)),
+                atol=1e-6,
+            )
+        upper, lower = result.bands(2)
+        np.testing.assert_allclose(upper - lower, 4 * result.std)
+
+    def test_sessions_do_not_move_with_window(self):
+        """Los límites de sesión no dependen de la ventana descargada"""
+        full = self.cache.session_vwap("8h").vwap
+        window = self.df.iloc[-100:].reset_index(drop=True)
+        partial = IndicatorCache.of(window).session_vwap("8h")
+        # Las sesiones completas dentro de la ventana coinciden
+        complete = partial.session > partial.session.iloc[0]
+        np.testing.assert_allclose(
+            partial.vwap[complete], full.iloc[-100:][complete.to_numpy()]
+        )
+
+    def test_timezone_aware_timestamps(self):
+        """Las sesiones se anclan a UTC aunque el timestamp tenga zona"""
+        local = self.df.copy()
+        local["timestamp"] = local["timestamp"].dt.tz_localize("UTC")
+        local["timestamp"] = local["timestamp"].dt.tz_convert("America/Lima")
+        np.testing.assert_allclose(
+            IndicatorCache.of(local).session_vwap().vwap,
+            self.cache.session_vwap().vwap,
+        )
+
+
+def reference_value_area(profile, fraction):
+    """Expansión del Value Area vecino a vecino desde el POC"""
+    poc = int(np.argmax(profile))
+    low, high, current = poc, poc, profile[poc]
+    while current < np.sum(profile) * fraction:
+        left = profile[low - 1] if low > 0 else 0
+        right = profile[high + 1] if high < len(profile) - 1 else 0
+        if left >= right and low > 0:
+            low -= 1
+            current += left
+        elif high < len(profile) - 1:
+            high += 1
+            current += right
+        else:
+            break
+    return poc, low, high
+
+
+class TestProfile(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(300, seed=7)
+        self.edges = np.linspace(
+            self.df["low"].min(), self.df["high"].max(), 30
+        )
+
+    def test_tpo_profile_matches_range_overlap(self):
+        """Cada nivel cuenta las velas cuyo rango lo toca"""
+        low, high = self.df["low"].to_numpy(), self.df["high"].to_numpy()
+        expected = [
+            np.sum((low <= self.edges[j + 1]) & (high >= self.edges[j]))
+            for j in range(len(self.edges) - 1)
+        ]
+        np.testing.assert_array_equal(
+            _profile.tpo_profile(low, high, self.edges), expected
+        )
+
+    def test_volume_profile_matches_digitize(self):
+        """El volumen se asigna a la división de cada cierre"""
+        expected = np.zeros(len(self.edges) - 1)
+        for price, volume in zip(self.df["close"], self.df["volume"]):
+            index = int(np.digitize(price, self.edges)) - 1
+            if 0 <= index < len(expected):
+                expected[index] += volume
+        np.testing.assert_allclose(
+            _profile.volume_profile(
+                self.df["close"], self.df["volume"], self.edges
+            ),
+            expected,
+        )
+
+    def test_value_area_with_ties(self):
+        """El Value Area coincide con la expansión iterativa con empates"""
+        rng = np.random.default_rng(3)
+        for _ in range(500):
+            profile = rng.integers(0, 3, rng.integers(1, 12)).astype(float)
+            for fraction in (0.0, 0.7, 1.0):
+                self.assertEqual(
+                    tuple(_profile.value_area(profile, fraction)),
+                    reference_value_area(profile, fraction),
+                )
+
+    def test_incremental_updates(self):
+        """Añadir y descartar velas equivale a reconstruir el perfil"""
+        low, high = self.df["low"].to_numpy(), self.df["high"].to_numpy()
+        profile = _profile.Profile(self.edges)
+        for bar_low, bar_high in zip(low, high):
+            profile.add(bar_low, bar_high)
+        for bar_low, bar_high in zip(low[:100], high[:100]):
+            profile.drop(bar_low, bar_high)
+        np.testing.assert_array_equal(
+            profile.counts,
+            _profile.tpo_profile(low[100:], high[100:], self.edges),
+        )
+
+
+class TestBenchmark(SimpleTestCase):
+    def test_synthetic_candles(self):
+        """Las velas sintéticas son reproducibles y coherentes por régimen"""
+        for regime in _synthetic.REGIMES:
+            df = _synthetic.generate_candles(500, regime=regime, seed=1)
+            pd.testing.assert_frame_equal(
+                df, _synthetic.generate_candles(500, regime=regime, seed=1)
+            )
+            self.assertTrue((df["high"] >= df[["open", "close"]].max(1)).all())
+            self.assertTrue((df["low"] <= df[["open", "close"]].min(1)).all())
+        trending = _synthetic.generate_candles(5000, regime="trending")
+        self.assertGreater(trending["close"].iloc[-1], trending["open"].iloc[0])
+
+    def test_compare_flags_regressions(self):
+        """Solo se marcan los empeoramientos por encima de la tolerancia"""
+        baseline = {
+            "A/ranging/100": {
+                "seconds": 0.01,
+                "peak_memory": 1000,
+                "error": None,
+            },
+            "B/ranging/100": {
+                "seconds": 0.01,
+                "peak_memory": 1000,
+                "error": None,
+            },
+        }
+        results = [
+            _benchmark.BenchmarkResult("A", "ranging", 100, 0.011, 1000, None),
+            _benchmark.BenchmarkResult("B", "ranging", 100, 0.02, 2000, None),
+        ]
+        regressions = _benchmark.compare(results, baseline, tolerance=0.25)
+        self.assertEqual(
+            [(r.key, r.metric) for r in regressions],
+            [("B/ranging/100", "seconds"), ("B/ranging/100", "peak_memory")],
+        )
+
+    def test_command_saves_and_compares_baseline(self):
+        """El comando guarda la referencia y falla ante una regresión"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "baseline.json"
+            options = {
+                "strategies": ["EMA921Strategy"],
+                "sizes": [100],
+                "regimes": ["ranging"],
+                "repeat": 1,
+                "baseline": path,
+                "stdout": StringIO(),
+            }
+            call_command("benchmark_strategies", save=True, **options)
+            self.assertIn(
+                "EMA921Strategy/ranging/100", _benchmark.load_baseline(path)
+            )
+
+            with mock.patch.object(
+                _benchmark, "measure", return_value=(10.0, 10**9)
+            ):
+                with self.assertRaises(CommandError):
+                    call_command("benchmark_strategies", **options)
+
+
+class TestBacktest(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.df = _synthetic.generate_candles(300, seed=7)
+
+    def test_simulate_take_profit_and_stop_loss(self):
+        """Las salidas siguen las reglas de take profit y stop loss"""
+        close = [100.0, 100.0, 100.5, 101.2, 100.0, 99.8, 100.0, 100.0]
+        data = pd.DataFrame(
+            {
+                "high": [
+                    100.0,
+                    100.0,
+                    100.6,
+                    101.5,
+                    100.0,
+                    100.0,
+                    101.0,
+                    100.0,
+                ],
+                "low": [100.0, 100.0, 100.0, 101.0, 100.0, 99.5, 99.0, 100.0],
+                "close": close,
+            }
+        )
+        # La vela 6 toca ambos niveles: se asume el stop loss
+        signals = [1, 0, 1, 0, -1, 0, 0, -1]
+        # 25% de take profit y stop loss con x25: variación de ±1%
+        trades = _backtest.simulate(data, signals, 25, 25, 25)
+
+        self.assertEqual(
+            [(t.entry_index, t.exit_index, t.reason) for t in trades],
+            [(0, 3, "take_profit"), (4, 6, "stop_loss"), (7, 7, "end")],
+        )
+        self.assertAlmostEqual(trades[0].exit_price, 101.0)
+        self.assertAlmostEqual(trades[0].profit, 25)
+        self.assertAlmostEqual(trades[1].profit, -25)
+        self.assertAlmostEqual(trades[2].profit, 0)
+
+    def test_vectorized_signals_match_replay(self):
+        """Las señales vectorizadas coinciden con reproducir cada ventana"""
+        window = _backtest.REPLAY_WINDOW
+        vectorized = set()
+        for regime in _synthetic.REGIMES:
+            df = _synthetic.generate_candles(600, regime=regime, seed=1)
+            for name in _registry.STRATEGIES:
+                cls = _registry.load(name)
+                signals = cls(df, "BTC/USDT", "15m").generate_signals(window)
+                if signals is None:
+                    continue
+                vectorized.add(name)
+                replayed, errors, _ = _backtest.replay(
+                    [cls], df, "BTC/USDT", "15m"
+                )[name]
+                self.assertEqual(errors, 0)
+                np.testing.assert_array_equal(
+                    signals.to_numpy()[window - 1 :],
+                    replayed[window - 1 :],
+                    err_msg=f"{name} ({regime})",
+                )
+        self.assertEqual(
+            vectorized,
+            {
+                "RSIMACrossoverStrategy",
+                "BollingerReversalStrategy",
+                "EMA921Strategy",
+                "TripleEMAStrategy",
+            },
+        )
+
+    def test_backtest_falls_back_to_replay(self):
+        """Las estrategias sin generate_signals se reproducen por ventanas"""
+        data = self.df.iloc[:130].reset_index(drop=True)
+        results = _backtest.backtest([EMA921Strategy, OrderBlockStrategy], data)
+        self.assertEqual(
+            list(results), ["EMA921Strategy", "OrderBlockStrategy"]
+        )
+        for result in results.values():
+            self.assertEqual(len(result.signals), len(data))
+            self.assertFalse(result.signals[:99].any())
+            self.assertEqual(result.summary()["trades"], len(result.trades))
+        self.assertTrue(results["EMA921Strategy"].vectorized)
+        self.assertFalse(results["OrderBlockStrategy"].summary()["vectorized"])
+
+    def test_replay_cost_per_window_is_constant(self):
+        """Reproducir cuesta lo mismo por ventana sea cual sea el histórico"""
+        strategies = [
+            _registry.load("PivotPointsStrategy"),
+            _registry.load("MeanReversionGridStrategy"),
+        ]
+        per_window = []
+        for bars in (200, 500):
+            data = _synthetic.generate_candles(bars, seed=2)
+            started = time.perf_counter()
+            _backtest.replay(strategies, data, "BTC/USDT", "15m")
+            windows = bars - _backtest.REPLAY_WINDOW + 1
+            per_window.append((time.perf_counter() - started) / windows)
+        # Un histórico mayor no encarece cada ventana
+        self.assertLess(per_window[1], per_window[0] * 2)
+        self.assertLess(per_window[1], 0.05)
+
+
+def engine_consensus(matrix, timestamp, rule):
+    """Dirección del consenso en cada vela según el detector en vivo"""
+    engine = consensus.ConsensusEngine(
+        "BTCUSDT",
+        window=pd.Timedelta(rule.window).to_pytimedelta(),
+        count=rule.count,
+        distinct=rule.distinct,
+    )
+    sides = {
+        1: choices.OrderSide.BUY,
+        -1: choices.OrderSide.SELL,
+        0: choices.OrderSide.HOLD,
+    }
+    directions = []
+    for bar, row in enumerate(matrix):
+        direction = 0
+        for strategy, signal in enumerate(row):
+            event = engine.update(
+                SimpleNamespace(
+                    id=(bar, strategy),
+                    signal_type=sides[signal],
+                    strategy=f"strategy{strategy}",
+                    timestamp=timestamp[bar],
+                )
+            )
+            if event is not None:
+                direction = (
+                    1 if event.direction == choices.OrderSide.BUY else -1
+                )
+        directions.append(direction)
+    return directions
+
+
+class TestConsensus(SimpleTestCase):
+    def test_matches_live_engine(self):
+        """La simulación coincide con el detector de consenso en vivo"""
+        rng = np.random.default_rng(5)
+        rules = (
+            _consensus.LIVE_RULE,
+            _consensus.Rule("30min", 3, 2),
+            _consensus.Rule("2h", 4, 4),
+            _consensus.Rule("15min", 8, 3),
+        )
+        fired = 0
+        for _ in range(100):
+            matrix = rng.choice([-1, 0, 1], size=(40, 6), p=[0.3, 0.4, 0.3])
+            timestamp = pd.date_range("2024-01-01", periods=40, freq="15min")
+            simulator = _consensus.ConsensusSimulator(
+                {f"strategy{i}": matrix[:, i] for i in range(6)}, timestamp
+            )
+            for rule in rules:
+                signals = simulator.signals(rule)
+                np.testing.assert_array_equal(
+                    signals, engine_consensus(matrix.tolist(), timestamp, rule)
+                )
+                fired += np.count_nonzero(signals)
+        self.assertGreater(fired, 0)
+
+    def test_simulate_rule_variants(self):
+        """Cada variante de la regla produce su propio resultado"""
+        df = _synthetic.generate_candles(300, seed=7)
+        results = _backtest.backtest(
+            [EMA921Strategy, TripleEMAStrategy, BollingerReversalStrategy], df
+        )
+        simulator = _consensus.ConsensusSimulator(
+            {name: result.signals for name, result in results.items()},
+            df["timestamp"],
+        )
+        rules = [_consensus.LIVE_RULE, _consensus.Rule("2h", 2, 2)]
+        simulated = simulator.simulate(df, rules)
+        self.assertEqual(list(simulated), rules)
+        # Con tres estrategias nunca hay cinco estrategias diferentes
+        self.assertEqual(simulated[rules[0]].summary()["trades"], 0)
+        self.assertEqual(simulated[rules[1]].strategy, "2h/2/2")
+
+
+class TestParameters(SimpleTestCase):
+    def test_schema_grid_and_validation(self):
+        """La rejilla recorre los rangos y los ajustes se validan"""
+        schema = SupertrendStrategy.parameters
+        grid = list(_params.grid(schema))
+        self.assertEqual(len(grid), 26 * 9)
+        self.assertIn({"atr_window": 10, "multiplier": 2.5}, grid)
+
+        df = _synthetic.generate_candles(100, seed=7)
+        strategy = SupertrendStrategy(
+            df, "BTC/USDT", "15m", params={"multiplier": 3}
+        )
+        self.assertEqual(strategy.params, {"atr_window": 10, "multiplier": 3.0})
+        with self.assertRaises(ValueError):
+            SupertrendStrategy(df, "BTC/USDT", "15m", params={"multiplier": 9})
+        with self.assertRaises(ValueError):
+            SupertrendStrategy(df, "BTC/USDT", "15m", params={"period": 9})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestOptimizer(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.df = _synthetic.generate_candles(600, seed=4)
+        self.candidates = [{"fast": fast} for fast in (5, 9, 13)]
+
+    def test_sweep_is_sorted_and_cached(self):
+        """Los resultados se ordenan por el objetivo y se reutilizan"""
+        optimizer = _optimizer.Optimizer("EMA921Strategy", self.df, workers=1)
+        first = optimizer.sweep(self.candidates)
+        profits = [evaluation.summary["total_profit"] for evaluation in first]
+        self.assertEqual(profits, sorted(profits, reverse=True))
+        self.assertFalse(any(evaluation.cached for evaluation in first))
+
+        with mock.patch.object(_optimizer, "evaluate") as evaluate:
+            second = optimizer.sweep(self.candidates)
+        evaluate.assert_not_called()
+        self.assertTrue(all(evaluation.cached for evaluation in second))
+        self.assertEqual(
+            [evaluation.summary for evaluation in second],
+            [evaluation.summary for evaluation in first],
+        )
+
+    def test_walk_forward_folds(self):
+        """Cada tramo se prueba sobre velas posteriores a su entrenamiento"""
+        optimizer = _optimizer.Optimizer("EMA921Strategy", self.df, workers=1)
+        folds = optimizer.walk_forward(300, 100, candidates=self.candidates)
+        self.assertEqual(
+            [(fold.train, fold.test) for fold in folds],
+            [
+                ((0, 300), (300, 400)),
+                ((100, 400), (400, 500)),
+                ((200, 500), (500, 600)),
+            ],
+        )
+        for fold in folds:
+            self.assertIn({"fast": fold.params["fast"]}, self.candidates)
+
+
+def ohlcv_rows(start, size, close=100.0, step=900_000):
+    """Filas OHLCV de ccxt cada `step` ms (15 minutos) desde `start` (ms)"""
+    return [
+        [start + i * step, close, close + 1, close - 1, close, 10.0]
+        for i in range(size)
+    ]
+
+
+class TestCandleStore(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = _candle_store.CandleStore(
+            self.directory.name, "binanceus", "BTC/USDT", "15m"
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append_deduplicates_and_updates_last_candle(self):
+        """Solo se añaden velas nuevas y la última se actualiza"""
+        self.assertEqual(self.store.append(ohlcv_rows(0, 5)), 5)
+        # Repetidas, la última con otro cierre y dos nuevas
+        rows = ohlcv_rows(0, 4) + ohlcv_rows(4 * 900_000, 3, close=105.0)
+        self.assertEqual(self.store.append(rows), 2)
+
+        data = self.store.read()
+        self.assertEqual(len(data), 7)
+        self.assertTrue(data["timestamp"].is_monotonic_increasing)
+        self.assertEqual(
+            data["close"].tolist()[3:], [100.0, 105.0, 105.0, 105.0]
+        )
+        self.assertEqual(len(self.store.read(limit=3)), 3)
+
+    def test_append_inserts_missing_candles(self):
+        """Las velas de un hueco se insertan en su sitio"""
+        self.store.append(ohlcv_rows(0, 3) + ohlcv_rows(6 * 900_000, 2))
+        rows = ohlcv_rows(0, 8, close=105.0)
+        self.assertEqual(self.store.append(rows), 3)
+
+        data = self.store.read()
+        self.assertEqual(
+            data["timestamp"].tolist(),
+            [pd.Timestamp(i * 900_000, unit="ms") for i in range(8)],
+        )
+        # Las guardadas no cambian salvo la última
+        self.assertEqual(
+            data["close"].tolist(), [100.0] * 3 + [105.0] * 3 + [100.0, 105.0]
+        )
+
+    def test_fetcher_requests_only_new_candles(self):
+        """El fetcher pide las velas desde la última guardada"""
+        exchange = mock.Mock(id="binanceus")
+        exchange.parse_timeframe.return_value = 900
+        exchange.milliseconds.return_value = 101 * 900_000
+        exchange.fetch_ohlcv.side_effect = [
+            ohlcv_rows(0, 100),
+            ohlcv_rows(99 * 900_000, 3, close=101.0),
+        ]
+        with override_settings(
+            CANDLE_STORE_DIR=self.directory.name, CANDLE_BASE_TIMEFRAME=""
+        ):
+            with mock.patch.object(
+                _market_fetcher._exchanges, "client", return_value=exchange
+            ):
+                fetcher = _market_fetcher.MarketDataFetcher(
+                    "BTC/USDT", "15m", limit=100
+                )
+                fetcher.fetch()
+                data = fetcher.fetch()
+
+        self.assertEqual(
+            exchange.fetch_ohlcv.call_args.kwargs,
+            {"timeframe": "15m", "since": 99 * 900_000, "limit": 3},
+        )
+        self.assertEqual(len(data), 100)
+        self.assertEqual(data["close"].iloc[-3:].tolist(), [101.0] * 3)
+        self.assertEqual(
+            data["timestamp"].iloc[-1], pd.Timestamp(101 * 900_000, unit="ms")
+        )
+
+    def test_concurrent_fetches_share_the_store_safely(self):
+        """Las actualizaciones del almacén base no se intercalan"""
+        exchange = mock.Mock(id="binanceus")
+        exchange.parse_timeframe.return_value = 60
+        exchange.milliseconds.return_value = 120 * 60_000
+        running, overlaps = [], []
+
+        def fetch_ohlcv(*args, **kwargs):
+            overlaps.append(bool(running))
+            running.append(True)
+            time.sleep(0.05)
+            running.pop()
+            return ohlcv_rows(0, 121, step=60_000)
+
+        exchange.fetch_ohlcv.side_effect = fetch_ohlcv
+        with override_settings(
+            CANDLE_STORE_DIR=self.directory.name, CANDLE_BASE_TIMEFRAME="1m"
+        ):
+            with mock.patch.object(
+                _market_fetcher._exchanges, "client", return_value=exchange
+            ):
+                fetchers = [
+                    _market_fetcher.MarketDataFetcher("BTC/USDT", tf, limit=2)
+                    for tf in ("15m", "1h")
+                ]
+                threads = [
+                    threading.Thread(target=fetcher.fetch)
+                    for fetcher in fetchers
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        self.assertEqual(overlaps, [False, False])
+        timestamps = fetchers[0].store.read()["timestamp"]
+        self.assertEqual(len(timestamps), 121)
+        self.assertTrue(timestamps.is_monotonic_increasing)
+
+    def test_fetch_until_closed_candle_uses_store(self):
+        """Con la vela cerrada ya guardada no se consulta el exchange"""
+        self.store.append(ohlcv_rows(0, 10))
+        exchange = mock.Mock(id="binanceus")
+        with override_settings(
+            CANDLE_STORE_DIR=self.directory.name, CANDLE_BASE_TIMEFRAME=""
+        ):
+            with mock.patch.object(
+                _market_fetcher._exchanges, "client", return_value=exchange
+            ):
+                fetcher = _market_fetcher.MarketDataFetcher(
+                    "BTC/USDT", "15m", limit=5
+                )
+                # La última vela guardada sigue abierta
+                data = fetcher.fetch(until=8 * 900_000)
+
+        exchange.fetch_ohlcv.assert_not_called()
+        self.assertEqual(len(data), 5)
+        self.assertEqual(
+            data["timestamp"].iloc[-1], pd.Timestamp(8 * 900_000, unit="ms")
+        )
+
+
+class TestResample(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = _candle_store.CandleStore(
+            self.directory.name, "binanceus", "BTC/USDT", "1m"
+        )
+        data = _synthetic.generate_candles(600, seed=3)
+        data["timestamp"] = pd.date_range(
+            "2024-01-01 00:07", periods=len(data), freq="1min"
+        )
+        # Falta una vela base: el agregado usa las disponibles
+        self.data = data.drop(index=100).reset_index(drop=True)
+        self.rows = self.data.assign(
+            timestamp=self.data["timestamp"].astype("int64") // 1_000_000
+        ).to_numpy()
+
+    def reference(self, timeframe, data=None):
+        data = self.data if data is None else data
+        bars = (
+            data.set_index("timestamp")
+            .resample(timeframe.replace("m", "min"))
+            .agg(
+                {
+                    "open": "first",
+                    "high": "max",
+                    "low": "min",
+                    "close": "last",
+                    "volume": "sum",
+                }
+            )
+            .dropna()
+            .reset_index()
+        )
+        return bars[_market_fetcher.COLUMNS]
+
+    def test_feed_recomputes_after_backfill(self):
+        """Las velas base insertadas en un hueco se agregan de nuevo"""
+        gap = np.r_[0:150, 170 : len(self.rows)]
+        self.store.append(self.rows[gap])
+        feed = _resample.ResampledFeed(self.store, "1m")
+        feed.read("15m")
+
+        self.store.append(self.rows[150:170])
+        pd.testing.assert_frame_equal(feed.read("15m"), self.reference("15m"))
+
+    def test_incremental_feed_matches_resample(self):
+        """Las velas derivadas coinciden con resample de pandas"""
+        self.store.append(self.rows[:300])
+        feed = _resample.ResampledFeed(self.store, "1m")
+        for timeframe in ("5m", "15m", "1h"):
+            pd.testing.assert_frame_equal(
+                feed.read(timeframe), self.reference(timeframe, self.data[:300])
+            )
+
+        # La vela abierta se actualiza y las nuevas se agregan sin recalcular
+        # las completas
+        self.store.append(self.rows[299:])
+        with mock.patch.object(
+            _resample, "aggregate", wraps=_resample.aggregate
+        ) as aggregate:
+            for timeframe in ("5m", "15m", "1h"):
+                pd.testing.assert_frame_equal(
+                    feed.read(timeframe), self.reference(timeframe)
+                )
+        # Solo las velas base nuevas y las de la vela que estaba abierta
+        self.assertTrue(
+            all(len(args[0]) < 300 + 60 for args, _ in aggregate.call_args_list)
+        )
+
+        until = pd.Timestamp("2024-01-01 03:00").value // 1_000_000
+        data = feed.read("15m", limit=4, until=until)
+        self.assertEqual(
+            data["timestamp"].tolist(),
+            list(pd.date_range("2024-01-01 02:15", periods=4, freq="15min")),
+        )
+
+    def test_fetcher_derives_timeframes_from_base(self):
+        """El fetcher guarda velas de 1m y deriva los timeframes superiores"""
+        now = 7 * 24 * 60 * 60_000
+        exchange = mock.Mock(id="binanceus")
+        exchange.parse_timeframe.return_value = 60
+        exchange.milliseconds.return_value = now + 30_000
+        exchange.fetch_ohlcv.side_effect = lambda symbol, **kwargs: (
+            ohlcv_rows(kwargs["since"], kwargs["limit"], step=60_000)
+        )
+        with override_settings(CANDLE_STORE_DIR=self.directory.name):
+            with mock.patch.object(
+                _market_fetcher._exchanges, "client", return_value=exchange
+            ):
+                hourly = _market_fetcher.MarketDataFetcher(
+                    "BTC/USDT", "1h", limit=20
+                ).fetch()
+                calls = exchange.fetch_ohlcv.call_count
+                quarter = _market_fetcher.MarketDataFetcher(
+                    "BTC/USDT", "15m", limit=20
+                ).fetch(until=now - 15 * 60_000)
+
+        # 1200 velas de 1m en dos peticiones y ninguna para el cierre de 15m
+        self.assertEqual(calls, 2)
+        self.assertEqual(exchange.fetch_ohlcv.call_count, 2)
+        self.assertEqual(len(self.store), 1200)
+        self.assertEqual(len(hourly), 20)
+        self.assertEqual(hourly["volume"].iloc[0], 600.0)
+        self.assertEqual(len(quarter), 20)
+        self.assertEqual(
+            quarter["timestamp"].iloc[-1],
+            pd.Timestamp(now - 15 * 60_000, unit="ms"),
+        )
+        self.assertFalse(
+            _resample.derivable("1d", "1m")
+            or _resample.derivable("7m", "5m")
+            or _resample.derivable("4h", "")
+        )
+
+
+class TestExchangeClients(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        _exchanges._reset()
+        self.loads = []
+
+        def load_markets(exchange, reload=False):
+            self.loads.append(exchange)
+            exchange.markets = {"BTC/USDT": {"symbol": "BTC/USDT"}}
+            exchange.currencies = {}
+
+        patcher = mock.patch.object(
+            ccxt.binanceus, "load_markets", load_markets
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(_exchanges._reset)
+
+    def test_clients_are_reused_and_share_markets(self):
+        """Cada hilo reutiliza su cliente y los mercados se cargan una vez"""
+        exchange = _exchanges.client()
+        self.assertIs(_exchanges.client(), exchange)
+
+        other = []
+        with mock.patch.object(ccxt.binanceus, "set_markets") as set_markets:
+            thread = threading.Thread(
+                target=lambda: other.append(_exchanges.client())
+            )
+            thread.start()
+            thread.join()
+        self.assertIsNot(other[0], exchange)
+        set_markets.assert_called_once_with(exchange.markets, {})
+        self.assertEqual(len(self.loads), 1)
+
+    def test_markets_reload_after_ttl(self):
+        """Los mercados se recargan al superar el TTL"""
+        _exchanges.client()
+        with mock.patch.object(
+            _exchanges.time,
+            "monotonic",
+            return_value=time.monotonic() + EXCHANGE_MARKETS_TTL + 1,
+        ):
+            _exchanges.client()
+        self.assertEqual(len(self.loads), 2)
+
+
+class FakeAsyncExchange:
+    """Exchange asíncrono local: responde tras `delay` segundos"""
+
+    def __init__(self, delay=0.05, failures=None, hang=(), errors=None):
+        self.delay = delay
+        # Errores de red pendientes por símbolo antes de responder
+        self.failures = dict(failures or {})
+        self.hang = set(hang)
+        self.errors = errors or {}
+        self.calls = []
+        self.active = self.peak = 0
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", limit=100):
+        self.calls.append((symbol, timeframe))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(60 if symbol in self.hang else self.delay)
+            if symbol in self.errors:
+                raise self.errors[symbol]
+            if self.failures.get(symbol):
+                self.failures[symbol] -= 1
+                raise ccxt.NetworkError("connection reset")
+            return [
+                [1_700_000_000_000 + i * 60_000, 1, 2, 0.5, 1.5, 10]
+                for i in range(limit)
+            ]
+        finally:
+            self.active -= 1
+
+
+class TestAsyncFetcher(SimpleTestCase):
+    def fetch(self, exchange, pairs, **kwargs):
+        kwargs.setdefault("backoff", 0)
+        return asyncio.run(
+            _async_fetcher.fetch_many(pairs, exchange=exchange, **kwargs)
+        )
+
+    def test_pairs_are_fetched_concurrently(self):
+        """Los pares se descargan a la vez y se devuelven como DataFrame"""
+        exchange = FakeAsyncExchange(delay=0.1)
+        pairs = [
+            (symbol, timeframe)
+            for symbol in ("BTC/USDT", "ETH/USDT", "SOL/USDT")
+            for timeframe in ("15m", "1h")
+        ]
+        started = time.perf_counter()
+        frames = self.fetch(exchange, pairs + pairs[:2], limit=50)
+        self.assertLess(time.perf_counter() - started, 0.4)
+
+        self.assertEqual(list(frames), pairs)
+        self.assertEqual(exchange.peak, len(pairs))
+        data = frames[("ETH/USDT", "1h")]
+        self.assertEqual(list(data.columns), _market_fetcher.COLUMNS)
+        self.assertEqual(len(data), 50)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(data["timestamp"]))
+
+    def test_retries_and_timeouts(self):
+        """Los errores de red se reintentan y los fallos se omiten"""
+        exchange = FakeAsyncExchange(
+            delay=0,
+            failures={"BTC/USDT": 2, "ETH/USDT": 5},
+            hang={"SOL/USDT"},
+            errors={"XRP/USDT": ccxt.BadSymbol("unknown symbol")},
+        )
+        pairs = [
+            (symbol, "1h")
+            for symbol in ("BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT")
+        ]
+        with self.assertLogs(_async_fetcher.logger, "ERROR") as logs:
+            frames = self.fetch(exchange, pairs, timeout=0.05, retries=2)
+
+        self.assertEqual(list(frames), [("BTC/USDT", "1h")])
+        self.assertEqual(exchange.calls.count(("BTC/USDT", "1h")), 3)
+        self.assertEqual(exchange.calls.count(("ETH/USDT", "1h")), 3)
+        self.assertEqual(exchange.calls.count(("SOL/USDT", "1h")), 3)
+        # Los errores del exchange no se reintentan
+        self.assertEqual(exchange.calls.count(("XRP/USDT", "1h")), 1)
+        self.assertEqual(len(logs.records), 3)
+
+    def test_weight_budget_limits_requests(self):
+        """Las peticiones esperan a que el presupuesto recupere peso"""
+        self.assertEqual(_async_fetcher.kline_weight(99), 1)
+        self.assertEqual(_async_fetcher.kline_weight(100), 2)
+        self.assertEqual(_async_fetcher.kline_weight(1000), 5)
+        self.assertEqual(_async_fetcher.kline_weight(1500), 10)
+
+        # 4 peticiones de peso 2 con capacidad 4 que se recupera en 0.2s:
+        # la tercera espera 0.1s y la cuarta 0.2s
+        exchange = FakeAsyncExchange(delay=0)
+        budget = _async_fetcher.WeightBudget(capacity=4, period=0.2)
+        pairs = [(f"COIN{i}/USDT", "1h") for i in range(4)]
+        started = time.perf_counter()
+        frames = self.fetch(exchange, pairs, limit=100, budget=budget)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.19)
+        self.assertEqual(len(frames), 4)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(budget.acquire(5))
+
+
+def kline_message(symbol, timeframe, start, close, closed=True):
+    kline = {
+        "t": start,
+        "s": symbol,
+        "i": timeframe,
+        "o": "100.0",
+        "h": "110.0",
+        "l": "90.0",
+        "c": str(close),
+        "v": "12.5",
+        "x": closed,
+    }
+    stream = f"{symbol.lower()}@kline_{timeframe}"
+    return json.dumps({"stream": stream, "data": {"e": "kline", "k": kline}})
+
+
+class FakeKlineSocket:
+    """Sustituto local de `websockets.connect` con sesiones predefinidas"""
+
+    def __init__(self, sessions):
+        # Cada sesión es una lista de mensajes o la excepción al conectar
+        self.sessions = list(sessions)
+        self.urls = []
+
+    @contextlib.asynccontextmanager
+    async def __call__(self, url):
+        self.urls.append(url)
+        session = self.sessions.pop(0) if self.sessions else []
+        if isinstance(session, Exception):
+            raise session
+        yield self.messages(session)
+
+    async def messages(self, session):
+        for message in session:
+            await asyncio.sleep(0)
+            yield message
+
+
+class TestKlineStream(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.closed = []
+
+    def on_close(self, symbol, timeframe, timestamp):
+        self.closed.append((symbol, timeframe, timestamp))
+        if len(self.closed) == 3:
+            self.stream.stop()
+
+    def close_candle(self, stream, *args):
+        symbol, timeframe, row, _ = _kline_stream.parse_kline(
+            kline_message(*args)
+        )
+        stream.close_candle(symbol, timeframe, row)
+
+    def test_closed_candles_are_stored_and_notified(self):
+        """Las velas cerradas se guardan y notifican; las abiertas no"""
+        socket = FakeKlineSocket(
+            [
+                OSError("connection refused"),
+                [
+                    kline_message("BTCUSDT", "15m", 0, 101.0, closed=False),
+                    kline_message("BTCUSDT", "15m", 0, 102.0),
+                    "not json",
+                    kline_message("BTCUSDT", "15m", 900_000, 103.0, False),
+                    kline_message("ETHUSDT", "1h", 0, 104.0),
+                    kline_message("BTCUSDT", "15m", 900_000, 105.0),
+                ],
+            ]
+        )
+        self.stream = _kline_stream.KlineStream(
+            [("BTCUSDT", "15m"), ("ETHUSDT", "1h")],
+            self.on_close,
+            connect=socket,
+            store_dir=self.directory.name,
+            reconnect_delay=0,
+        )
+        with self.assertLogs(_kline_stream.logger, "ERROR"):
+            asyncio.run(asyncio.wait_for(self.stream.run(), 5))
+
+        # Reconecta tras el error y tras agotar los mensajes de la sesión
+        self.assertGreaterEqual(len(socket.urls), 2)
+        self.assertTrue(
+            socket.urls[0].endswith(
+                "?streams=btcusdt@kline_15m/ethusdt@kline_1h"
+            )
+        )
+        # Cada mercado se procesa en orden, pero en paralelo con el resto
+        self.assertEqual(
+            sorted(self.closed),
+            [
+                ("BTCUSDT", "15m", 0),
+                ("BTCUSDT", "15m", 900_000),
+                ("ETHUSDT", "1h", 0),
+            ],
+        )
+        store = _candle_store.CandleStore(
+            self.directory.name, "binanceus", "BTC/USDT", "15m"
+        )
+        self.assertEqual(store.read()["close"].tolist(), [102.0, 105.0])
+
+    def test_held_store_lock_does_not_block_messages(self):
+        """Un almacén bloqueado no detiene la lectura del resto de mercados"""
+        socket = FakeKlineSocket(
+            [
+                [
+                    kline_message("BTCUSDT", "15m", 0, 101.0),
+                    kline_message("ETHUSDT", "15m", 0, 102.0),
+                ]
+            ]
+        )
+        self.stream = _kline_stream.KlineStream(
+            [("BTCUSDT", "15m"), ("ETHUSDT", "15m")],
+            lambda *args: self.closed.append(args),
+            connect=socket,
+            store_dir=self.directory.name,
+            reconnect_delay=0,
+        )
+        store = self.stream.stores[("BTCUSDT", "15m")]
+        locked, release = threading.Event(), threading.Event()
+
+        def hold():
+            # Otro proceso guarda velas de BTCUSDT mientras llegan mensajes
+            with store.lock():
+                locked.set()
+                release.wait(2)
+
+        async def run():
+            task = asyncio.create_task(self.stream.run())
+            while not self.closed:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            self.assertEqual(self.closed, [("ETHUSDT", "15m", 0)])
+            self.assertIsNone(store.last_timestamp())
+            release.set()
+            self.stream.stop()
+            await task
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        locked.wait()
+        try:
+            asyncio.run(asyncio.wait_for(run(), 5))
+        finally:
+            release.set()
+            holder.join()
+        self.assertEqual(
+            self.closed, [("ETHUSDT", "15m", 0), ("BTCUSDT", "15m", 0)]
+        )
+        self.assertEqual(store.last_timestamp(), 0)
+
+    def test_gap_is_backfilled_before_storing(self):
+        """Las velas perdidas durante un corte se descargan por REST"""
+        exchange = mock.Mock()
+        exchange.fetch_ohlcv.return_value = ohlcv_rows(
+            60_000, 4, close=101.0, step=60_000
+        )
+        stream = _kline_stream.KlineStream(
+            [("BTCUSDT", "1m")],
+            lambda *args: None,
+            store_dir=self.directory.name,
+            exchange=exchange,
+        )
+        store = stream.stores[("BTCUSDT", "1m")]
+        self.close_candle(stream, "BTCUSDT", "1m", 0, 100.0)
+        self.close_candle(stream, "BTCUSDT", "1m", 5 * 60_000, 102.0)
+
+        exchange.fetch_ohlcv.assert_called_once_with(
+            "BTC/USDT", timeframe="1m", since=60_000, limit=4
+        )
+        self.assertEqual(
+            store.read()["close"].tolist(), [100.0] + [101.0] * 4 + [102.0]
+        )
+
+        # Si la descarga falla la vela no se guarda, pero se notifica
+        exchange.fetch_ohlcv.side_effect = ccxt.NetworkError("timeout")
+        closed = []
+        stream.on_close = lambda *args: closed.append(args)
+        with self.assertLogs(_kline_stream.logger, "ERROR"):
+            self.close_candle(stream, "BTCUSDT", "1m", 9 * 60_000, 103.0)
+        self.assertEqual(store.last_timestamp(), 5 * 60_000)
+        self.assertEqual(closed, [("BTCUSDT", "1m", 9 * 60_000)])
+
+    @mock.patch("apps.trading.tasks.run_pair_strategies.delay")
+    def test_command_runs_strategies_on_close(self, delay):
+        """El comando ejecuta las estrategias del mercado al cerrar la vela"""
+        # La vela de 1m de las 00:14 cierra la vela de 15m de las 00:00
+        socket = FakeKlineSocket(
+            [[kline_message("BTCUSDT", "1m", 14 * 60_000, 1.0)]]
+        )
+        streams = []
+        KlineStream = _kline_stream.KlineStream
+
+        def stream(markets, on_close):
+            streams.append(
+                KlineStream(
+                    markets,
+                    on_close,
+                    connect=socket,
+                    store_dir=self.directory.name,
+                )
+            )
+            return streams[0]
+
+        delay.side_effect = lambda *args, **kwargs: streams[0].stop()
+        with mock.patch.object(_kline_stream, "KlineStream", stream):
+            call_command(
+                "stream_klines", "--markets", "btcusdt:15m", stdout=StringIO()
+            )
+        delay.assert_called_once_with("BTCUSDT", "15m", until=0)
+        self.assertEqual(
+            _resample.closing(59 * 60_000, "1m", ["5m", "15m", "1h"]),
+            [("5m", 55 * 60_000), ("15m", 45 * 60_000), ("1h", 0)],
+        )
+        self.assertIn("btcusdt@kline_1m", socket.urls[0])
+
+        with self.assertRaises(CommandError):
+            call_command("stream_klines", "--markets", "BTCUSDT")
+
+    @mock.patch("apps.trading.tasks.save_strategy_signals")
+    @mock.patch("apps.trading.tasks.run_pair_strategies.delay")
+    @mock.patch.object(_live, "LiveMarket")
+    def test_incremental_command_evaluates_in_process(
+        self, live_market, delay, save
+    ):
+        """En modo incremental el comando actualiza las estrategias en vivo"""
+        socket = FakeKlineSocket(
+            [[kline_message("BTCUSDT", "15m", 900_000, 1.0)]]
+        )
+        streams = []
+        KlineStream = _kline_stream.KlineStream
+
+        def stream(markets, on_close):
+            streams.append(
+                KlineStream(
+                    markets,
+                    on_close,
+                    connect=socket,
+                    store_dir=self.directory.name,
+                )
+            )
+            return streams[0]
+
+        results = [mock.Mock()]
+        live_market.return_value.on_close.return_value = results
+        save.side_effect = lambda *args: streams[0].stop() or []
+        config = SimpleNamespace(DISABLED_STRATEGIES=["OrderBlockStrategy"])
+        with mock.patch.object(stream_klines, "config", config):
+            with mock.patch.object(_kline_stream, "KlineStream", stream):
+                call_command(
+                    "stream_klines",
+                    "--markets",
+                    "btcusdt:15m",
+                    "--incremental",
+                    stdout=StringIO(),
+                )
+
+        symbol, timeframe, strategies = live_market.call_args.args
+        self.assertEqual((symbol, timeframe), ("BTCUSDT", "15m"))
+        self.assertNotIn(OrderBlockStrategy, strategies)
+        self.assertEqual(len(strategies), len(_registry.STRATEGIES) - 1)
+        live_market.return_value.on_close.assert_called_once_with(900_000)
+        save.assert_called_once_with("BTCUSDT", "15m", results)
+        delay.assert_not_called()
+
+
+class TestLiveMarket(SimpleTestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = _candle_store.CandleStore(
+            self.directory.name, "binanceus", "BTC/USDT", "15m"
+        )
+        self.df = _synthetic.generate_candles(160, seed=3)
+        self.rows = _market_fetcher.to_ohlcv(self.df)
+        self.exchange = mock.Mock(id="binanceus")
+        self.exchange.parse_timeframe.return_value = 900
+        self.exchange.milliseconds.return_value = self.rows[-1][0]
+        self.exchange.fetch_ohlcv.return_value = []
+        self.strategies = [EMA921Strategy, OrderBlockStrategy]
+
+    def reference(self, start, end):
+        """Señales de estrategias alimentadas con `on_candle` vela a vela"""
+        strategies = [
+            cls(self.df.iloc[:start].copy(), "BTCUSDT", "15m")
+            for cls in self.strategies
+        ]
+        signals = []
+        for position in range(start, end):
+            bar = self.df.iloc[position].to_dict()
+            signals.append([s.on_candle(bar) for s in strategies])
+        return signals
+
+    def evaluate(self, market, start, end):
+        signals = []
+        for position in range(start, end):
+            results = market.on_close(self.rows[position][0])
+            self.assertEqual(
+                [result.strategy for result in results],
+                ["EMA921Strategy", "OrderBlockStrategy"],
+            )
+            self.assertEqual([result.error for result in results], [None] * 2)
+            signals.append([result.signal for result in results])
+        return signals
+
+    def test_strategies_are_updated_with_each_candle(self):
+        """Las estrategias se inicializan una vez y se actualizan por vela"""
+        self.store.append(self.rows[:130])
+        with override_settings(
+            CANDLE_STORE_DIR=self.directory.name, CANDLE_BASE_TIMEFRAME=""
+        ):
+            with mock.patch.object(
+                _market_fetcher._exchanges, "client", return_value=self.exchange
+            ):
+                market = _live.LiveMarket("BTCUSDT", "15m", self.strategies)
+                first = self.evaluate(market, 120, 121)
+                strategies = market.strategies
+                rest = self.evaluate(market, 121, 130)
+                self.assertIs(market.strategies, strategies)
+
+                # Tras un corte se vuelven a inicializar
+                self.store.append(self.rows[130:])
+                after_gap = self.evaluate(market, 150, 160)
+                self.assertIsNot(market.strategies, strategies)
+
+                # Sin la vela en el almacén ni en el exchange no hay señales
+                with self.assertLogs(_live.logger, "ERROR"):
+                    missing = market.on_close(self.rows[-1][0] + 900_000)
+                self.assertEqual(missing, [])
+                self.assertIsNone(market.strategies)
+
+        self.assertEqual(first + rest, self.reference(120, 130))
+        self.assertEqual(after_gap, self.reference(150, 160))
+        # Solo se consulta el exchange por la vela que falta
+        self.assertEqual(self.exchange.fetch_ohlcv.call_count, 1)
+
+
+class TestStrategyRegistry(SimpleTestCase):
+    def test_registry_loads_strategies(self):
+        """Cada entrada del registro apunta a su clase de estrategia"""
+        for name in _registry.STRATEGIES:
+            self.assertEqual(_registry.load(name).__name__, name)
+
+    def test_disabled_strategies_are_skipped(self):
+        """Las estrategias deshabilitadas no se cargan"""
+        enabled = _registry.enabled(["EMA921Strategy", "Unknown"])
+        self.assertNotIn("EMA921Strategy", enabled)
+        self.assertEqual(len(enabled), len(_registry.STRATEGIES) - 1)
+
+    def test_tasks_do_not_import_numeric_stack(self):
+        """Importar las tareas no carga pandas, numpy, ta ni ccxt"""
+        code = (
+            "import sys, django; django.setup(); "
+            "import apps.trading.views; "
+            "print([m for m in ('pandas', 'numpy', 'ta', 'ccxt') "
+            "if m in sys.modules])"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            check=True,
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": "config.settings.development",
+            },
+            text=True,
+        ).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestRunStrategies(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        for email, symbol, timeframe in [
+            ("first@example.com", "BTCUSDT", "15m"),
+            ("second@example.com", "btcusdt", "15m"),
+            ("third@example.com", "BTCUSDT", "1h"),
+            ("fourth@example.com", "ETHUSDT", "15m"),
+        ]:
+            user = User.objects.create_user(email=email, password="secret")
+            models.TradingSettings.objects.create(
+                user=user, symbol=symbol, timeframe=timeframe
+            )
+
+    @mock.patch("apps.trading.tasks.run_pair_strategies.delay")
+    def test_schedules_distinct_markets(self, delay):
+        """Se programa una ejecución por mercado, no por usuario"""
+        markets = tasks.run_strategies()
+        self.assertEqual(
+            markets,
+            [("BTCUSDT", "15m"), ("BTCUSDT", "1h"), ("ETHUSDT", "15m")],
+        )
+        delay.assert_has_calls([mock.call(*market) for market in markets])
+        self.assertEqual(delay.call_count, 3)
+
+    @override_config(STRATEGY_WORKERS=3)
+    @mock.patch("apps.trading.tasks.process_signals.delay")
+    @mock.patch(
+        "apps.trading.strategies._market_fetcher.MarketDataFetcher.__init__",
+        return_value=None,
+    )
+    @mock.patch(
+        "apps.trading.strategies._market_fetcher.MarketDataFetcher.fetch"
+    )
+    def test_run_pair_reports_shared_indicators(self, fetch, init, delay):
+        """La ejecución por par se reparte en tareas y reporta indicadores"""
+        fetch.return_value = _synthetic.generate_candles(100, seed=7)
+        evaluate = tasks.evaluate_strategies
+        collect, reports = tasks.collect_strategy_results, []
+        with (
+            eager_tasks(),
+            mock.patch.object(evaluate, "run", wraps=evaluate.run) as chunks,
+            mock.patch.object(
+                collect,
+                "run",
+                side_effect=lambda *args, run=collect.run: reports.append(
+                    run(*args)
+                ),
+            ) as callback,
+            self.captureOnCommitCallbacks(execute=True),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            result = tasks.run_pair_strategies.delay("ETHUSDT", "1h")
+        self.assertEqual(result.get(), 3)
+        init.assert_called_once_with("ETH/USDT", "1h")
+        # Todas las estrategias, repartidas en bloques y reunidas una vez
+        self.assertEqual(
+            [name for call in chunks.call_args_list for name in call.args[0]],
+            _registry.enabled(),
+        )
+        self.assertEqual(chunks.call_count, 3)
+        callback.assert_called_once()
+        (report,) = reports
+        self.assertFalse(cache.get("run-strategies:ETHUSDT:1h"))
+        # Un único INSERT y una única tarea para todas las señales
+        inserts = [
+            query
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "trading_signal"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        delay.assert_called_once_with(
+            list(
+                models.Signal.objects.order_by("id").values_list(
+                    "id", flat=True
+                )
+            )
+        )
+        self.assertGreater(models.Signal.objects.count(), 0)
+        self.assertEqual(
+            set(models.Signal.objects.values_list("ticker", "timeframe")),
+            {("ETHUSDT", "1h")},
+        )
+        self.assertGreater(report["hits"], 0)
+        self.assertGreater(report["indicators"]["atr"]["hits"], 0)
+        self.assertIn("fetch", report["timings"])
+
+    @mock.patch(
+        "apps.trading.strategies._market_fetcher.MarketDataFetcher.fetch"
+    )
+    def test_running_pair_is_skipped(self, fetch):
+        """Un mercado en ejecución no se vuelve a ejecutar en paralelo"""
+        cache.add("run-strategies:BTCUSDT:15m", True)
+        self.assertIsNone(tasks.run_pair_strategies("BTCUSDT", "15m"))
+        fetch.assert_not_called()
+        cache.delete("run-strategies:BTCUSDT:15m")
+
+    @mock.patch(
+        "apps.trading.strategies._market_fetcher.MarketDataFetcher.fetch"
+    )
+    @mock.patch("apps.trading.tasks._registry.enabled", return_value=[])
+    def test_all_strategies_disabled(self, enabled, fetch):
+        """Sin estrategias habilitadas no se descargan velas ni se evalúa"""
+        self.assertIsNone(tasks.run_pair_strategies("BTCUSDT", "15m"))
+        fetch.assert_not_called()
+        self.assertFalse(models.Signal.objects.exists())
+
+    @mock.patch("apps.trading.tasks.handle_signal_confirmation.delay")
+    def test_process_signals_checks_consensus_once(self, confirm):
+        """Las señales se marcan en un UPDATE y el consenso se evalúa una vez"""
+        cache.clear()
+        signals = models.Signal.objects.bulk_create(
+            models.Signal(
+                ticker="BTCUSDT",
+                signal_type=choices.OrderSide.BUY,
+                timeframe="15m",
+                strategy=f"Strategy{i}",
+                price_close=100,
+            )
+            for i in range(5)
+        )
+        signal_ids = [signal.id for signal in signals]
+
+        with CaptureQueriesContext(connection) as queries:
+            result = tasks.process_signals(signal_ids)
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("1 signal groups created", result)
+        self.assertFalse(models.Signal.objects.filter(processed=False).exists())
+        self.assertEqual(models.SignalGroup.objects.count(), 1)
+        # Usuarios con BTCUSDT configurado
+        self.assertEqual(confirm.call_count, 3)
+
+        self.assertIn("already processed", tasks.process_signals(signal_ids))
+        self.assertEqual(models.SignalGroup.objects.count(), 1)
+
+    def test_market_symbol(self):
+        """Los símbolos de Binance se convierten al formato de ccxt"""
+        self.assertEqual(utils.to_market_symbol("BTCUSDT"), "BTC/USDT")
+        self.assertEqual(utils.to_market_symbol("ethbtc"), "ETH/BTC")
+        self.assertEqual(utils.to_market_symbol("SOL/USDC"), "SOL/USDC")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestConsensusEngine(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.start = timezone.now()
+        self.engine = consensus.ConsensusEngine("BTCUSDT")
+
+    def signal(self, id, side, strategy, minutes=0):
+        return SimpleNamespace(
+            id=id,
+            signal_type=side,
+            strategy=strategy,
+            timestamp=self.start + timedelta(minutes=minutes),
+        )
+
+    def create_signals(self, sides, processed=True, first=0):
+        signals = models.Signal.objects.bulk_create(
+            models.Signal(
+                ticker="BTCUSDT",
+                signal_type=side,
+                timeframe="15m",
+                strategy=f"Strategy{first + i}",
+                price_close=100,
+                processed=processed,
+            )
+            for i, side in enumerate(sides)
+        )
+        return list(
+            models.Signal.objects.filter(
+                id__in=[s.id for s in signals]
+            ).order_by("created", "id")
+        )
+
+    def test_incremental_consensus(self):
+        """El consenso se emite con la señal que completa la racha"""
+        buy, sell, hold = (
+            choices.OrderSide.BUY,
+            choices.OrderSide.SELL,
+            choices.OrderSide.HOLD,
+        )
+        signals = [
+            self.signal(1, buy, "A"),
+            self.signal(2, buy, "B"),
+            # Hold no corta la racha
+            self.signal(3, hold, "C"),
+            self.signal(4, buy, "C"),
+            self.signal(5, buy, "D"),
+            # Estrategia repetida: cinco señales pero cuatro estrategias
+            self.signal(6, buy, "A"),
+            self.signal(7, buy, "E"),
+        ]
+        events = [self.engine.update(signal) for signal in signals]
+        self.assertEqual(events[:-1], [None] * 6)
+        self.assertEqual(events[-1], (buy, [2, 4, 5, 6, 7]))
+
+        # Tras el consenso la racha vuelve a empezar
+        self.assertIsNone(self.engine.update(self.signal(8, buy, "F")))
+        self.assertEqual(len(self.engine.entries), 1)
+        # Una señal contraria la reinicia
+        self.engine.update(self.signal(9, sell, "A"))
+        self.assertEqual(self.engine.side, sell)
+        self.assertEqual([e.id for e in self.engine.entries], [9])
+
+    def test_window(self):
+        """Las cinco señales deben caer dentro de la ventana"""
+        buy = choices.OrderSide.BUY
+        events = [
+            self.engine.update(self.signal(i, buy, f"S{i}", minutes=i * 20))
+            for i in range(6)
+        ]
+        self.assertEqual(events[:5], [None] * 5)
+        self.assertIsNone(events[5])
+
+        self.engine.entries.clear()
+        events = [
+            self.engine.update(self.signal(i, buy, f"S{i}", minutes=i * 15))
+            for i in range(5)
+        ]
+        self.assertEqual(events[-1], (buy, [0, 1, 2, 3, 4]))
+
+    def test_rebuilds_from_database(self):
+        """Sin estado en cache la racha se reconstruye desde la base de datos"""
+        buy = choices.OrderSide.BUY
+        previous = self.create_signals([buy] * 4)
+        new = self.create_signals([buy], processed=False, first=4)
+
+        events = self.engine.process(new)
+        self.assertEqual(
+            events, [(buy, [signal.id for signal in previous + new])]
+        )
+
+        # Con estado en cache no se consulta la base de datos
+        follow = self.create_signals([buy], processed=False)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(
+                consensus.ConsensusEngine("BTCUSDT").process(follow), []
+            )
+        self.assertEqual(len(queries), 0)
+
+        # Las señales ya emitidas no vuelven a formar consenso
+        models.Signal.objects.update(processed=True)
+        cache.clear()
+        self.assertEqual(
+            consensus.ConsensusEngine("BTCUSDT").process(
+                self.create_signals([buy], processed=False, first=9)
+            ),
+            [],
+        )
+
+    def test_check_consecutive_signals_rebuilds_state(self):
+        """La verificación completa reconstruye el estado sin crear grupos"""
+        buy = choices.OrderSide.BUY
+        self.create_signals([buy] * 7)
+        self.engine.save()
+
+        result = tasks.check_consecutive_signals("BTCUSDT")
+        self.assertIn("2 buy signals in the streak", result)
+        self.assertFalse(models.SignalGroup.objects.exists())
+        self.assertTrue(self.engine.load())
+        self.assertEqual(len(self.engine.entries), 2)
+
+    @mock.patch("apps.trading.tasks.handle_signal_confirmation.delay")
+    def test_signals_are_claimed_with_the_state_locked(self, confirm):
+        """La reconstrucción no ve como procesadas señales sin aplicar"""
+        buy = choices.OrderSide.BUY
+        self.create_signals([buy] * 4)
+        new = self.create_signals([buy], processed=False, first=4)
+        rebuild = consensus.ConsensusEngine.rebuild
+        claimed = []
+
+        def check_rebuild(engine):
+            claimed.append(
+                models.Signal.objects.filter(
+                    id=new[0].id, processed=True
+                ).exists()
+            )
+            rebuild(engine)
+
+        with mock.patch.object(
+            consensus.ConsensusEngine, "rebuild", check_rebuild
+        ):
+            result = tasks.process_signals([new[0].id])
+        self.assertEqual(claimed, [False])
+        self.assertIn("1 signals processed, 1 signal groups created", result)
+        self.assertEqual(models.SignalGroup.objects.get().signals.count(), 5)
+
+    @mock.patch("apps.trading.tasks.evaluate_consensus.apply_async")
+    @mock.patch("apps.trading.tasks.handle_signal_confirmation.delay")
+    def test_webhook_burst_is_evaluated_once(self, confirm, apply_async):
+        """Una ráfaga de señales del webhook se evalúa una sola vez"""
+        buy = choices.OrderSide.BUY
+        signals = self.create_signals([buy] * 5, processed=False)
+        for signal in signals:
+            tasks.process_signal(signal.id)
+        apply_async.assert_called_once_with(
+            ("BTCUSDT",), countdown=CONSENSUS_DEBOUNCE_SECONDS
+        )
+        self.assertEqual(
+            consensus.counters("BTCUSDT"), {"evaluated": 0, "skipped": 4}
+        )
+
+        result = tasks.evaluate_consensus("BTCUSDT")
+        self.assertIn("5 signals processed, 1 signal groups created", result)
+        group = models.SignalGroup.objects.get()
+        self.assertEqual(group.direction, buy)
+        self.assertEqual(group.signals.count(), 5)
+        self.assertEqual(consensus.counters("BTCUSDT")["evaluated"], 1)
+
+        # Tras la evaluación una señal nueva programa otra
+        tasks.process_signal(self.create_signals([buy], processed=False)[0].id)
+        self.assertEqual(apply_async.call_count, 2)
+        # Señales ya procesadas por otra tarea no se aplican de nuevo
+        self.assertIn(
+            "already processed",
+            tasks.process_signals([signal.id for signal in signals]),
+        )
+        self.assertEqual(models.SignalGroup.objects.count(), 1)
+
+    @mock.patch("apps.trading.tasks.evaluate_consensus.apply_async")
+    @mock.patch("apps.trading.tasks.handle_signal_confirmation.delay")
+    def test_signal_during_evaluation_is_not_lost(self, confirm, apply_async):
+        """Una señal que llega mientras se evalúa entra en esa evaluación"""
+        buy = choices.OrderSide.BUY
+        signals = self.create_signals([buy] * 4, processed=False)
+        for signal in signals:
+            tasks.process_signal(signal.id)
+        claim = tasks._claim_signals
+        late = []
+
+        def claim_then_receive(*args, **kwargs):
+            claimed = claim(*args, **kwargs)
+            if not late:
+                # Llega tras reclamar, con la evaluación aún pendiente
+                late.extend(self.create_signals([buy], False, first=4))
+                tasks.process_signal(late[0].id)
+            return claimed
+
+        with mock.patch.object(tasks, "_claim_signals", claim_then_receive):
+            result = tasks.evaluate_consensus("BTCUSDT")
+        self.assertIn("5 signals processed, 1 signal groups created", result)
+        self.assertEqual(apply_async.call_count, 1)
+        self.assertEqual(
+            consensus.counters("BTCUSDT"), {"evaluated": 1, "skipped": 4}
+        )
+        self.assertFalse(models.Signal.objects.filter(processed=False).exists())
+        # La marca se borró con el estado aún bloqueado
+        self.assertIsNone(cache.get(consensus.pending_key("BTCUSDT")))
+        tasks.process_signal(self.create_signals([buy], processed=False)[0].id)
+        self.assertEqual(apply_async.call_count, 2)
+
+    def test_lock_is_only_released_by_its_owner(self):
+        """Un bloqueo expirado y tomado por otro worker no se libera"""
+        key = f"{self.engine.key}:lock"
+        with self.engine._lock():
+            token = cache.get(key)
+            self.assertTrue(token)
+            # Expira y lo toma otro worker
+            cache.set(key, "other")
+        self.assertEqual(cache.get(key), "other")
+
+        cache.delete(key)
+        with self.engine._lock():
+            self.assertNotEqual(cache.get(key), token)
+        self.assertIsNone(cache.get(key))
@@ -1,5 +1,7 @@
 from django.utils import timezone
 
+from apps.trading import constants
+
 
 # Funciones auxiliares
 def format_operation_info(operation):
@@ -54,3 +56,17 @@ def format_time_difference(start_time, end_time=None):
         return f"{hours}h {minutes}m"
     else:
         return f"{minutes}m"
+
+
+def to_market_symbol(symbol):
+    """
+    Convierte un símbolo de Binance ("BTCUSDT") al formato de ccxt
+    ("BTC/USDT")
+    """
+    symbol = symbol.upper()
+    if "/" in symbol:
+        return symbol
+    for quote in constants.QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return f"{symbol[: -len(quote)]}/{quote}"
+    return symbol
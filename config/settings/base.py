@@ -99,6 +99,15 @@ DATABASES = {
     )  # noqa
 }
 
+# Cache
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("REDIS_URL", default="redis://127.0.0.1:6379/"),
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -142,6 +151,14 @@ STATICFILES_DIRS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "apps/media"
 
+# Local OHLCV history, updated with incremental fetches (empty to disable)
+CANDLE_STORE_DIR = config(
+    "CANDLE_STORE_DIR", default=str(BASE_DIR / "data/candles")
+)
+# Base timeframe stored per symbol; higher timeframes are resampled from it
+# locally (empty to store every timeframe separately)
+CANDLE_BASE_TIMEFRAME = config("CANDLE_BASE_TIMEFRAME", default="1m")
+
 # Translation settings
 # https://docs.djangoproject.com/en/5.0/topics/i18n/translation/
 
@@ -213,10 +230,6 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.trading.tasks.check_positions_status",
         "schedule": 30.0,  # Every 30 seconds
     },
-    "run-strategies-every-15-minutes": {
-        "task": "apps.trading.tasks.run_strategies",
-        "schedule": 900.0,  # Every 15 minutes
-    },
 }
 
 # Custom Fields
@@ -19,6 +19,18 @@ CONSTANCE_CONFIG = {
     "WEBSITE_DOMAIN": ("https://knowinglabs.com/", _("Website domain.")),
     "ENABLE_TEST_MODE": (True, _("Enable test mode.")),
     "DUMMY_BALANCE_AMOUNT": (50000.00, _("Dummy balance amount.")),
+    "STRATEGY_WORKERS": (
+        0,
+        _(
+            "Celery tasks each market run is split into to evaluate its "
+            "strategies (0 uses one per CPU core)."
+        ),
+    ),
+    "DISABLED_STRATEGIES": (
+        [],
+        _("Strategy class names excluded from runs."),
+        "json_field",
+    ),
 }
 
 CONSTANCE_CONFIG_FIELDSETS = {
@@ -38,4 +50,11 @@ CONSTANCE_CONFIG_FIELDSETS = {
         ),
         "collapse": True,
     },
+    "3. Strategy Options": {
+        "fields": (
+            "STRATEGY_WORKERS",
+            "DISABLED_STRATEGIES",
+        ),
+        "collapse": True,
+    },
 }
@@ -40,6 +40,7 @@ def deploy(c):
         print("Reiniciando los servicios de Celery...")
         conn.run("sudo systemctl restart celery")
         conn.run("sudo systemctl restart celerybeat")
+        conn.run("sudo systemctl restart klinestream")
 
     print("¡Despliegue completado con éxito!")
 
@@ -50,7 +51,7 @@ def status(c):
     conn = Connection(host=REMOTE_HOST, user=REMOTE_USER)
 
     print("Verificando estado de los servicios...")
-    services = ["gunicorn", "nginx", "celery", "celerybeat"]
+    services = ["gunicorn", "nginx", "celery", "celerybeat", "klinestream"]
 
     for service in services:
         print(f"\nEstado de {service}:")
@@ -67,6 +68,7 @@ def logs(c, service="celery", lines=50):
         "nginx": "nginx",
         "celery": "celery",
         "beat": "celerybeat",
+        "klines": "klinestream",
     }
 
     if service not in valid_services: